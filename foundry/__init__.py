@@ -6,11 +6,10 @@ from http.client import IncompleteRead
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
-from PySide6.QtCore import QBuffer, QIODevice, QUrl
-from PySide6.QtGui import QDesktopServices, QIcon, QPixmap, Qt, QUndoCommand, QUndoStack
+from PySide6.QtCore import QUrl
+from PySide6.QtGui import QDesktopServices, QIcon, QImage, Qt, QUndoCommand, QUndoStack
 from PySide6.QtWidgets import QApplication, QMessageBox, QWidget
 
-from foundry.gui.settings import Settings
 from smb3parse.objects.object_set import DESERT_OBJECT_SET
 from smb3parse.util import apply
 
@@ -29,7 +28,13 @@ auto_save_path.mkdir(parents=True, exist_ok=True)
 
 auto_save_rom_path = auto_save_path / "auto_save.nes"
 auto_save_m3l_path = auto_save_path / "auto_save.m3l"
-auto_save_level_data_path = auto_save_path / "level_data.json"
+auto_save_journal_path = auto_save_path / "level_data.journal"
+
+found_levels_cache_path = home_dir / "found_levels"
+found_levels_cache_path.mkdir(parents=True, exist_ok=True)
+
+thumbnails_cache_path = home_dir / "thumbnails"
+thumbnails_cache_path.mkdir(parents=True, exist_ok=True)
 
 data_dir = root_dir.joinpath("data")
 doc_dir = root_dir.joinpath("doc")
@@ -125,30 +130,12 @@ def icon(icon_name: str):
         raise FileNotFoundError(icon_path)
 
 
-def get_level_thumbnail(object_set, layout_address: "LevelAddress", enemy_address: "EnemyItemAddress"):
-    from foundry.game.level.LevelRef import LevelRef
-    from foundry.gui.visualization.level.LevelView import LevelView
-
-    level_ref = LevelRef()
-    level_ref.load_level("", layout_address, enemy_address, object_set)
-
-    view = LevelView(None, level_ref, Settings("mchlnix", "throwaway"), None)
-
-    view.settings.setValue("level view/block_transparency", object_set != DESERT_OBJECT_SET)
-
-    view.zoom_out()
-    view.zoom_out()
-
-    return view.grab()
-
-
-def pixmap_to_base64(pixmap: QPixmap) -> str:
-    buffer = QBuffer()
-    buffer.open(QIODevice.WriteOnly)
-    pixmap.save(buffer, "PNG", quality=100)
-    image_data = bytes(buffer.data().toBase64()).decode()
+def get_level_thumbnail(object_set, layout_address: "LevelAddress", enemy_address: "EnemyItemAddress") -> QImage:
+    from foundry.gui.visualization.level.offscreen import render_level_at
 
-    return image_data
+    return render_level_at(
+        object_set, layout_address, enemy_address, zoom=1 / 4, transparent=object_set != DESERT_OBJECT_SET
+    )
 
 
 def make_macro(undo_stack: QUndoStack, title: str, *commands: QUndoCommand):
@@ -3,7 +3,8 @@ from pathlib import Path
 from typing import Optional
 
 from foundry.game.additional_data import AdditionalData
-from smb3parse.util.rom import PRG_BANK_SIZE, INESHeader, Rom
+from smb3parse.types import NormalizedAddress
+from smb3parse.util.rom import PRG_BANK_SIZE, TSA_TABLE_SIZE, INESHeader, Rom
 
 
 class ROM(Rom):
@@ -23,6 +24,12 @@ class ROM(Rom):
 
     W_INIT_OS_LIST: list[int] = []
 
+    write_generation = 0
+    """Increased with every write to the ROM data, so that data read from it knows, when it has to be checked again."""
+
+    _tsa_tables: dict[int, tuple[int, bytes]] = {}
+    """The TSA table of each object set, together with the write generation it was last checked in."""
+
     def __init__(self, path: Path | str | None = None):
         if not ROM.rom_data:
             if path is None:
@@ -34,10 +41,23 @@ class ROM(Rom):
 
     @staticmethod
     def get_tsa_data(object_set: int) -> bytes:
-        """Returns bytes, instead of bytearray, because bytes is hashable. FIXME?"""
-        rom = ROM()
+        """
+        Returns the TSA table of the given object set. Every caller gets the same bytes object, until the table is
+        actually changed in the ROM, so that it can be shared by all Blocks and used in cache keys cheaply.
+        """
+        checked_generation, tsa_data = ROM._tsa_tables.get(object_set, (-1, b""))
 
-        return bytes(rom.tsa_data_for_object_set(object_set))
+        if checked_generation != ROM.write_generation:
+            rom = ROM()
+
+            with rom.view(rom.tsa_address_for_object_set(object_set), TSA_TABLE_SIZE) as current_tsa_data:
+                # most writes are level data, so only copy the table, if the write actually touched it
+                if current_tsa_data != tsa_data:
+                    tsa_data = bytes(current_tsa_data)
+
+            ROM._tsa_tables[object_set] = ROM.write_generation, tsa_data
+
+        return tsa_data
 
     @staticmethod
     def load_from_file(path: Path | str):
@@ -45,6 +65,7 @@ class ROM(Rom):
             data = bytearray(rom.read())
 
         ROM.header = INESHeader.from_buffer_copy(data)
+        ROM._tsa_tables.clear()
         ROM.path = str(path)
         ROM.name = basename(path)
 
@@ -85,17 +106,27 @@ class ROM(Rom):
 
     @staticmethod
     def save_to_file(path: Path | str, set_new_path=True):
-        Path(path).open("wb").write(bytearray(ROM.rom_data))
-
-        if ROM.additional_data:
-            with open(path, "ab") as f:
-                f.write(ROM.MARKER_VALUE)
-                f.write(str(ROM.additional_data).encode("utf-8"))
+        Path(path).write_bytes(ROM.file_data())
 
         if set_new_path:
             ROM.path = str(path)
             ROM.name = basename(path)
 
+    @staticmethod
+    def file_data() -> bytes:
+        """Returns what save_to_file writes, the ROM data followed by the additional data, if there is any."""
+        data = bytes(ROM.rom_data)
+
+        if ROM.additional_data:
+            data += ROM.MARKER_VALUE + str(ROM.additional_data).encode("utf-8")
+
+        return data
+
+    def _write(self, offset: NormalizedAddress, data: bytes):
+        super(ROM, self)._write(offset, data)
+
+        ROM.write_generation += 1
+
     @staticmethod
     def is_loaded() -> bool:
         return bool(ROM.path)
@@ -3,6 +3,7 @@ from collections import defaultdict
 from operator import attrgetter
 from typing import TYPE_CHECKING
 
+from foundry.game.free_space import BankSpace
 from foundry.game.level import (
     EMPTY_ENEMY_DATA,
     EMPTY_OBJECT_DATA,
@@ -32,6 +33,24 @@ LEVEL_DATA_DELIMITER_COUNT = 1
 ENEMY_DATA_DELIMITER_COUNT = 2
 
 
+def level_bank_space(bank_index: int, levels_in_bank: list[FoundLevel]) -> BankSpace:
+    """Returns the used and free space of the PRG bank, that the given Levels have their object data in."""
+    blocks = {level.level_offset: level.object_data_length + LEVEL_DATA_DELIMITER_COUNT for level in levels_in_bank}
+
+    return BankSpace(blocks, (bank_index + 1) * PRG_BANK_SIZE)
+
+
+def enemy_bank_space(levels: list[FoundLevel]) -> BankSpace:
+    """Returns the used and free space of the enemy data bank. Levels can share their enemy data."""
+    blocks = {
+        level.enemy_offset: level.enemy_data_length + ENEMY_DATA_DELIMITER_COUNT
+        for level in levels
+        if level.enemy_offset >= _ENEMY_BANK_START
+    }
+
+    return BankSpace(blocks, (ENEMY_DATA_BANK_INDEX + 1) * PRG_BANK_SIZE)
+
+
 class AdditionalData:
     """
     Set of additional, foundry specific data, meant to persist between invocations of the editor. Can be used to keep
@@ -48,10 +67,13 @@ class AdditionalData:
         work with this.
         """
 
-        self.found_levels: list[FoundLevel] = []
+        self._found_levels: list[FoundLevel] = []
 
         self.needs_refresh = False
 
+        self._level_bank_spaces: dict[int, BankSpace] = {}
+        self._enemy_bank_space: BankSpace | None = None
+
     def __str__(self) -> str:
         return json.dumps(
             {
@@ -76,39 +98,74 @@ class AdditionalData:
     def __bool__(self):
         return bool(self.managed_level_positions is not None or self.found_levels)
 
-    def free_space_for_object_set(self, object_set_number: int):
+    @property
+    def found_levels(self) -> list[FoundLevel]:
+        return self._found_levels
+
+    @found_levels.setter
+    def found_levels(self, found_levels: list[FoundLevel]):
+        self._found_levels = found_levels
+
+        self.invalidate_free_space()
+
+    def level_bank_space(self, object_set_number: int) -> BankSpace:
+        """Returns the used and free space of the PRG bank, that Levels of the given object set are saved in."""
         prg_banks_by_object_set = self.rom.read(PAGE_A000_ByTileset, 16)
 
-        levels_by_bank: dict[int, list[FoundLevel]] = defaultdict(list)
+        bank_index = prg_banks_by_object_set[object_set_number]
 
-        for level in self.found_levels:
-            levels_by_bank[prg_banks_by_object_set[level.object_set_number]].append(
-                MovableLevel.from_found_level(level)
-            )
+        if bank_index not in self._level_bank_spaces:
+            levels_in_bank = [
+                level for level in self.found_levels if prg_banks_by_object_set[level.object_set_number] == bank_index
+            ]
 
-        last_level = levels_by_bank[prg_banks_by_object_set[object_set_number]][-1]
+            self._level_bank_spaces[bank_index] = level_bank_space(bank_index, levels_in_bank)
 
-        free_space_start = last_level.level_offset + last_level.object_data_length + LEVEL_DATA_DELIMITER_COUNT
+        return self._level_bank_spaces[bank_index]
 
-        free_space_left = PRG_BANK_SIZE - (free_space_start % PRG_BANK_SIZE)
+    def enemy_bank_space(self) -> BankSpace:
+        """Returns the used and free space of the bank, that the enemy data of all Levels is saved in."""
+        if self._enemy_bank_space is None:
+            self._enemy_bank_space = enemy_bank_space(self.found_levels)
 
-        return free_space_left
+        return self._enemy_bank_space
 
-    def free_space_for_enemies(self):
-        level_with_last_enemy_data = max(self.found_levels, key=attrgetter("enemy_offset"))
+    def free_space_for_object_set(self, object_set_number: int, level_address: int | None = None) -> int:
+        """
+        Returns how many bytes the object data of the Level at the given address can grow. Without an address, or if
+        there is no Level at it, returns the free space at the end of the bank.
+        """
+        bank_space = self.level_bank_space(object_set_number)
 
-        end_of_enemy_data = (
-            level_with_last_enemy_data.enemy_offset
-            + level_with_last_enemy_data.enemy_data_length
-            + ENEMY_DATA_DELIMITER_COUNT
-        )
+        if level_address is not None and level_address in bank_space:
+            return bank_space.free_space_after(level_address)
+
+        return bank_space.free_space_at_end()
+
+    def free_space_for_enemies(self, enemy_address: int | None = None) -> int:
+        """
+        Returns how many bytes the enemy data at the given address can grow. Without an address, or if there is no
+        enemy data at it, returns the free space at the end of the bank.
+        """
+        bank_space = self.enemy_bank_space()
 
         # FIXME: when the level is not attached to the ROM yet, we have to reserve space for the delimiters, too
-        return PRG_BANK_SIZE - (end_of_enemy_data % PRG_BANK_SIZE)
+        if enemy_address is not None and enemy_address in bank_space:
+            return bank_space.free_space_after(enemy_address)
+
+        return bank_space.free_space_at_end()
+
+    def invalidate_free_space(self):
+        """
+        Has to be called, whenever Levels were moved or changed size without a LevelOrganizer keeping the free space up
+        to date, like after rearranging all Levels.
+        """
+        self._level_bank_spaces.clear()
+        self._enemy_bank_space = None
 
     def clear(self):
         self.managed_level_positions = None
-        self.found_levels.clear()
+        self.found_levels = []
 
 
 class MovableLevel(FoundLevel):
@@ -141,10 +198,15 @@ class LevelOrganizer:
         levels: list[FoundLevel],
         level_to_save: ObjectData = EMPTY_OBJECT_DATA,
         enemies_to_save: EnemyItemData = EMPTY_ENEMY_DATA,
+        additional_data: AdditionalData | None = None,
     ):
         self.rom = rom
 
         self.levels = levels
+
+        self.additional_data = additional_data
+        """If given, its cached free space is updated along with the levels, instead of being worked out anew."""
+
         self.levels_by_bank: dict[int, list[MovableLevel]] = {}
 
         self.level_to_save = level_to_save
@@ -153,24 +215,153 @@ class LevelOrganizer:
         self.old_level_address_to_new: dict[LevelAddress, LevelAddress] = {}
         self.old_enemy_address_to_new: dict[EnemyItemAddress, EnemyItemAddress] = {}
 
+        self._levels_by_address: dict[LevelAddress, FoundLevel] = {}
+        self._levels_by_enemy_address: dict[EnemyItemAddress, list[FoundLevel]] = {}
+
+        self._index_levels()
+
     def update_level_info(self, level: "Level"):
         """
-        Syncs changes made to a 'normal' Level to its Found Level and back, after rearranging Levels based on the
-        changes.
+        Syncs changes made to a 'normal' Level to its Found Level and back. Only the Levels and enemy data following
+        the Level, that no longer fit behind its new data, are moved.
         """
-        # 1. Update the level and enemy data sizes of the current level
-        self._update_level_sizes(level)
+        found_level = self._get_found_level(level)
 
-        # 2. Rearrange all levels based on new sizes
-        self.rearrange_levels()
-        self.rearrange_enemies()
+        # 1. Make room for the new level and enemy data sizes of the current level
+        self.relocate_level_data(found_level, HEADER_LENGTH + level.current_object_size())
+        self.relocate_enemy_data(found_level, level.current_enemies_size())
 
-        # 3. Update level and enemy addresses after rearranging
+        # 2. Update level and enemy addresses after relocating
         self._update_level_addresses(level)
 
-        # 4. Update jump destination addresses after rearranging
+        # 3. Update jump destination addresses after relocating
         self._update_jump_destination(level)
 
+    def relocate_level_data(self, found_level: FoundLevel, object_data_length: int):
+        """
+        Changes the object data length of the given Level. If its data doesn't fit in front of the next Level in the
+        bank anymore, the following Levels are moved back, until there is a gap big enough to absorb the difference.
+        Only the data and pointers of the moved Levels are written.
+        """
+        prg_banks_by_object_set = self.rom.read(PAGE_A000_ByTileset, 16)
+
+        bank_index = prg_banks_by_object_set[found_level.object_set_number]
+
+        if self.additional_data is not None:
+            bank_space = self.additional_data.level_bank_space(found_level.object_set_number)
+        else:
+            levels_in_bank = [
+                level for level in self.levels if prg_banks_by_object_set[level.object_set_number] == bank_index
+            ]
+
+            bank_space = level_bank_space(bank_index, levels_in_bank)
+
+        self.old_level_address_to_new = bank_space.resize(
+            found_level.level_offset, object_data_length + LEVEL_DATA_DELIMITER_COUNT
+        )
+
+        found_level.object_data_length = object_data_length
+
+        levels_to_move = [self._levels_by_address[address] for address in self.old_level_address_to_new]
+
+        if not levels_to_move:
+            return
+
+        object_set_offset = BASE_OFFSET + bank_index * PRG_BANK_SIZE - PAGE_A000_OFFSET
+
+        # write the new addresses in the old positions, before actually moving the levels to the new position
+        for level in levels_to_move:
+            for position in level.level_offset_positions:
+                self.rom.write_little_endian(
+                    position, self.old_level_address_to_new[level.level_offset] - object_set_offset
+                )
+
+        # read everything first, since moved levels can overlap the old position of the next one
+        level_data = [
+            bytes(self.rom.read(level.level_offset, level.object_data_length + LEVEL_DATA_DELIMITER_COUNT))
+            for level in levels_to_move
+        ]
+
+        for level, data in zip(levels_to_move, level_data):
+            level.level_offset = self.old_level_address_to_new[level.level_offset]
+
+            self.rom.write(level.level_offset, data)
+
+        # pointers in the headers of moved levels moved with them
+        for level in self.levels:
+            level.level_offset_positions = [
+                self.old_level_address_to_new.get(position, position) for position in level.level_offset_positions
+            ]
+            level.enemy_offset_positions = [
+                self.old_level_address_to_new.get(position - OFFSET_SIZE, position - OFFSET_SIZE) + OFFSET_SIZE
+                for position in level.enemy_offset_positions
+            ]
+
+        self._index_levels()
+
+    def relocate_enemy_data(self, found_level: FoundLevel, enemy_data_length: int):
+        """
+        Changes the enemy data length of the given Level and every other Level using the same enemy data. If the data
+        doesn't fit in front of the next enemy data anymore, the following enemy data is moved back, until there is a
+        gap big enough to absorb the difference. Only the data and pointers of the moved enemy data are written.
+        """
+        enemy_address = found_level.enemy_offset
+
+        self.old_enemy_address_to_new.clear()
+
+        # addresses in front of the enemy bank are not real enemy data, so there is nothing to move
+        if enemy_address >= _ENEMY_BANK_START:
+            if self.additional_data is not None:
+                bank_space = self.additional_data.enemy_bank_space()
+            else:
+                bank_space = enemy_bank_space(self.levels)
+
+            self.old_enemy_address_to_new = bank_space.resize(
+                enemy_address, enemy_data_length + ENEMY_DATA_DELIMITER_COUNT
+            )
+
+        for level in self._levels_by_enemy_address.get(enemy_address, [found_level]):
+            level.enemy_data_length = enemy_data_length
+
+        addresses_to_move = list(self.old_enemy_address_to_new)
+
+        if not addresses_to_move:
+            return
+
+        # read everything first, since moved enemy data can overlap the old position of the next one
+        enemy_data = [
+            bytes(
+                self.rom.read(
+                    address,
+                    self._levels_by_enemy_address[address][0].enemy_data_length + ENEMY_DATA_DELIMITER_COUNT,
+                )
+            )
+            for address in addresses_to_move
+        ]
+
+        for address, data in zip(addresses_to_move, enemy_data):
+            new_address = self.old_enemy_address_to_new[address]
+
+            for level in self._levels_by_enemy_address[address]:
+                level.enemy_offset = new_address
+
+                for position in level.enemy_offset_positions:
+                    self.rom.write_little_endian(position, new_address - BASE_OFFSET)
+
+            self.rom.write(new_address, data)
+
+        self._index_levels()
+
+    def _index_levels(self):
+        self._levels_by_address = {level.level_offset: level for level in self.levels}
+
+        self._levels_by_enemy_address = defaultdict(list)
+
+        for level in self.levels:
+            self._levels_by_enemy_address[level.enemy_offset].append(level)
+
+        self._levels_by_enemy_address = dict(self._levels_by_enemy_address)
+
     def _get_found_level(self, level: "Level"):
         if not level.attached_to_rom:
             raise ValueError("This level is not attached to the ROM. Please place it somewhere on a world map.")
@@ -182,37 +373,14 @@ class LevelOrganizer:
 
         return current_level
 
-    def _found_level_from_address(self, level_address: int):
-        try:
-            return next(filter(lambda lvl: lvl.level_offset == level_address, self.levels))
-
-        except StopIteration:
-            return None
-
-    def _update_level_sizes(self, level: "Level"):
-        """
-        Given Level might have changed in size, so this needs to be synced with its Found Level, before rearranging.
-        """
-
-        found_level = self._get_found_level(level)
-
-        found_level.object_data_length = HEADER_LENGTH + level.current_object_size()
-        found_level.enemy_data_length = level.current_enemies_size()
+    def _found_level_from_address(self, level_address: int) -> FoundLevel | None:
+        return self._levels_by_address.get(level_address)
 
     def _update_level_addresses(self, level: "Level"):
-        """After rearranging levels, the addresses for this normal Level might have changed, so update them."""
+        """After relocating levels, the addresses for this normal Level might have changed, so update them."""
 
         found_level = self._get_found_level(level)
 
-        assert found_level.level_offset in self.old_level_address_to_new, (
-            hex(found_level.level_offset),
-            self.old_level_address_to_new,
-        )
-        assert found_level.enemy_offset in self.old_enemy_address_to_new
-
-        found_level.level_offset = self.old_level_address_to_new[found_level.level_offset]
-        found_level.enemy_offset = self.old_enemy_address_to_new[found_level.enemy_offset]
-
         level.set_addresses(found_level.level_offset, found_level.enemy_offset)
 
     def _update_jump_destination(self, level: "Level"):
@@ -235,18 +403,26 @@ class LevelOrganizer:
     def _connect_new_jump_destination_to_level(self, level: "Level"):
         """Find the Found Level for the given Levels Jump Destination and connect them together."""
 
-        if level.header.jump_level_offset and level.header.jump_level_address not in self.old_level_address_to_new:
+        # the header still has the addresses from before relocating
+        jump_level_address = self.old_level_address_to_new.get(
+            level.header.jump_level_address, level.header.jump_level_address
+        )
+        jump_enemy_address = self.old_enemy_address_to_new.get(
+            level.header.jump_enemy_address, level.header.jump_enemy_address
+        )
+
+        if level.header.jump_level_offset and jump_level_address not in self._levels_by_address:
             raise LookupError(
                 f"Jump Destination Level Address in Header '0x{level.header.jump_level_address:X}' does not point to"
                 " any known level"
             )
-        if level.header.jump_enemy_offset and level.header.jump_enemy_address not in self.old_enemy_address_to_new:
+        if level.header.jump_enemy_offset and jump_enemy_address not in self._levels_by_enemy_address:
             raise LookupError(
                 f"Jump Destination Enemy Address in Header '0x{level.header.jump_enemy_address:X}' does not point to"
                 " any known enemy data group"
             )
 
-        jump_destination_found_level = self._found_level_from_address(level.header.jump_level_address)
+        jump_destination_found_level = self._found_level_from_address(jump_level_address)
 
         if jump_destination_found_level is None:
             raise LookupError(f"Jump Level Destination {level.header.jump_level_address:x} could not be found in ROM.")
@@ -255,10 +431,10 @@ class LevelOrganizer:
         jump_destination_found_level.enemy_offset_positions.append(level.header_offset + OFFSET_SIZE)
 
         if level.header.jump_level_offset != 0x0:
-            self.next_area_objects = self.old_level_address_to_new[level.header.jump_level_address]
+            self.next_area_objects = jump_level_address
 
         if level.header.jump_enemy_offset != 0x0:
-            self.next_area_enemies = self.old_enemy_address_to_new[level.header.jump_enemy_address]
+            self.next_area_enemies = jump_enemy_address
 
     def rearrange_levels(self):
         # 0.1 Sort Levels by bank
@@ -283,6 +459,8 @@ class LevelOrganizer:
         # 4. Write level data to new position in bank
         self._copy_level_data_to_new_addresses()
 
+        self._index_levels()
+
     def _copy_level_data_to_new_addresses(self):
         for levels in self.levels_by_bank.values():
             # 4.1 Get level data from old position
@@ -412,6 +590,8 @@ class LevelOrganizer:
         # 3.2 Save enemy data to new position
         self._update_enemy_address_and_copy_data(old_enemy_data_sets, sorted_levels)
 
+        self._index_levels()
+
     def _update_enemy_address_and_copy_data(self, old_enemy_data_sets, sorted_levels):
         already_copied = []
 
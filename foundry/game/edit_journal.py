@@ -0,0 +1,228 @@
+"""
+Keeps a journal of the edits made to a Level, so that they can be recovered, if the editor crashes.
+
+Instead of saving the whole Level after every change, only the bytes that changed since the last change are appended to
+the journal. Every now and then the journal is compacted into a single snapshot of the Level again. All writing happens
+on a worker thread, so that editing doesn't have to wait on the disk.
+"""
+import base64
+import json
+import os
+import queue
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+COMPACT_AFTER = 256
+"""After how many changes the journal is replaced by a snapshot of the Level."""
+
+
+@dataclass
+class JournaledLevel:
+    object_set_number: int
+    object_address: int
+    object_data: bytes
+    enemy_address: int
+    enemy_data: bytes
+
+    def is_same_level(self, other: "JournaledLevel") -> bool:
+        return (self.object_set_number, self.object_address, self.enemy_address) == (
+            other.object_set_number,
+            other.object_address,
+            other.enemy_address,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "object_set_number": self.object_set_number,
+            "object_address": self.object_address,
+            "object_data": _encode(self.object_data),
+            "enemy_address": self.enemy_address,
+            "enemy_data": _encode(self.enemy_data),
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "JournaledLevel":
+        return JournaledLevel(
+            data["object_set_number"],
+            data["object_address"],
+            _decode(data["object_data"]),
+            data["enemy_address"],
+            _decode(data["enemy_data"]),
+        )
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode(data: str) -> bytes:
+    return base64.b64decode(data)
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    low, high = 0, min(len(a), len(b))
+
+    # comparing slices is done in one go, so this is faster than comparing byte by byte
+    while low < high:
+        middle = (low + high + 1) // 2
+
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+
+    return low
+
+
+def changed_range(old: bytes, new: bytes) -> Optional[tuple[int, int, bytes]]:
+    """
+    Finds the part of old, that has to be replaced, to get new.
+
+    :return: The start and end of the part of old, as well as what to replace it with. None if nothing changed.
+    """
+    if old == new:
+        return None
+
+    start = _common_prefix_length(old, new)
+
+    max_suffix_length = min(len(old), len(new)) - start
+    suffix_length = min(_common_prefix_length(old[::-1], new[::-1]), max_suffix_length)
+
+    return start, len(old) - suffix_length, new[start : len(new) - suffix_length]
+
+
+def _apply_change(data: bytes, change: list) -> bytes:
+    start, end, replacement = change
+
+    return data[:start] + _decode(replacement) + data[end:]
+
+
+def load_journal(path: Path) -> Optional[JournaledLevel]:
+    """
+    Replays the journal and returns the Level, as it was after the last change, that made it to disk. Returns None, if
+    there is no journal.
+    """
+    if not path.exists():
+        return None
+
+    level: Optional[JournaledLevel] = None
+
+    for line in path.read_text().splitlines():
+        try:
+            entry = json.loads(line)
+
+            if "object_set_number" in entry:
+                level = JournaledLevel.from_dict(entry)
+            elif level is not None:
+                if "objects" in entry:
+                    level.object_data = _apply_change(level.object_data, entry["objects"])
+
+                if "enemies" in entry:
+                    level.enemy_data = _apply_change(level.enemy_data, entry["enemies"])
+
+        except (ValueError, KeyError, TypeError):
+            # the editor crashed while writing this change; everything up to here is still good
+            break
+
+    return level
+
+
+class EditJournal:
+    """
+    Writes the journal of a Level on a worker thread. Changes are written in the order they were recorded in.
+
+    :param path: Where to keep the journal.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        self._tasks: queue.Queue[Optional[Callable[[], object]]] = queue.Queue()
+
+        # only used by the worker thread
+        self._level: Optional[JournaledLevel] = None
+        self._changes_since_snapshot = 0
+
+        self._worker = threading.Thread(target=self._work, name="edit journal", daemon=True)
+        self._worker.start()
+
+    def record(self, object_set_number: int, object_data: tuple[int, bytes], enemy_data: tuple[int, bytes]):
+        """Records the current state of the Level, as returned by Level.to_bytes."""
+        (object_address, object_bytes), (enemy_address, enemy_bytes) = object_data, enemy_data
+
+        level = JournaledLevel(
+            object_set_number, object_address, bytes(object_bytes), enemy_address, bytes(enemy_bytes)
+        )
+
+        self._tasks.put(lambda: self._write_level(level))
+
+    def save_file(self, path: Path, data: bytes):
+        """Writes the data to the given path, in order with the changes recorded so far."""
+        self._tasks.put(lambda: path.write_bytes(data))
+
+    def discard(self):
+        """Removes the journal, once the changes recorded so far are written."""
+        self._tasks.put(self._discard)
+
+    def flush(self):
+        """Waits until everything recorded so far is written to disk."""
+        self._tasks.join()
+
+    def close(self):
+        """Writes everything recorded so far and stops the worker thread."""
+        self._tasks.put(None)
+        self._worker.join()
+
+    def _work(self):
+        while (task := self._tasks.get()) is not None:
+            try:
+                task()
+            except OSError:
+                # not being able to write the journal should not stop the editor; the next snapshot might work again
+                self._level = None
+            finally:
+                self._tasks.task_done()
+
+        self._tasks.task_done()
+
+    def _write_level(self, level: JournaledLevel):
+        if self._level is None or not self._level.is_same_level(level) or self._changes_since_snapshot >= COMPACT_AFTER:
+            self._write_snapshot(level)
+            return
+
+        entry = {}
+
+        if (object_change := changed_range(self._level.object_data, level.object_data)) is not None:
+            start, end, replacement = object_change
+            entry["objects"] = [start, end, _encode(replacement)]
+
+        if (enemy_change := changed_range(self._level.enemy_data, level.enemy_data)) is not None:
+            start, end, replacement = enemy_change
+            entry["enemies"] = [start, end, _encode(replacement)]
+
+        self._level = level
+
+        if not entry:
+            return
+
+        with self.path.open("a") as journal:
+            journal.write(json.dumps(entry) + "\n")
+
+        self._changes_since_snapshot += 1
+
+    def _write_snapshot(self, level: JournaledLevel):
+        # replace the journal in one go, so that a crash leaves either the old or the new journal
+        temporary_path = self.path.with_suffix(".tmp")
+        temporary_path.write_text(json.dumps(level.to_dict()) + "\n")
+
+        os.replace(temporary_path, self.path)
+
+        self._level = level
+        self._changes_since_snapshot = 0
+
+    def _discard(self):
+        self.path.unlink(missing_ok=True)
+
+        self._level = None
@@ -0,0 +1,69 @@
+"""
+Remembers the Levels found in a ROM between invocations of the editor, so that they only have to be searched for, when
+the ROM actually changed in a way, that could affect them.
+"""
+import hashlib
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+from foundry import found_levels_cache_path
+from smb3parse.constants import BASE_OFFSET
+from smb3parse.util.parser import FoundLevel
+from smb3parse.util.rom import PRG_BANK_SIZE, Rom
+
+CACHE_VERSION = 1
+"""Increase this, whenever the way Levels are searched for changes, so that old results are not used anymore."""
+
+
+def level_data_hash(rom: Rom) -> str:
+    """
+    Hashes the part of the ROM, that decides which Levels are found and how long they are.
+
+    That is the whole PRG ROM, since besides the World Map pointer tables and the Level data banks, the emulated Level
+    loading also runs code from the fixed and object set specific banks. The CHR ROM and the INES header don't matter.
+    """
+    content_hash = hashlib.sha256(CACHE_VERSION.to_bytes(4, "little"))
+
+    with rom.view(BASE_OFFSET, rom.prg_banks * PRG_BANK_SIZE) as prg_data:
+        content_hash.update(prg_data)
+
+    return content_hash.hexdigest()
+
+
+def _cache_file(rom: Rom, cache_dir: Path) -> Path:
+    return cache_dir / f"{level_data_hash(rom)}.json"
+
+
+def load_found_levels(
+    rom: Rom, cache_dir: Path = found_levels_cache_path
+) -> Optional[tuple[dict, dict[int, FoundLevel]]]:
+    """
+    Returns the Levels found in the ROM the same way gen_levels_in_rom does, if they were saved for a ROM with the same
+    level data before. Returns None otherwise.
+    """
+    cache_file = _cache_file(rom, cache_dir)
+
+    if not cache_file.exists():
+        return None
+
+    try:
+        found_levels = [FoundLevel.from_dict(data) for data in json.loads(cache_file.read_text())]
+    except (ValueError, KeyError, TypeError):
+        # cache file is broken; just search the ROM again
+        return None
+
+    levels_by_address = {found_level.level_offset: found_level for found_level in found_levels}
+    levels_per_object_set: dict[int, list[int]] = defaultdict(list)
+
+    for level_address in sorted(levels_by_address.keys()):
+        levels_per_object_set[levels_by_address[level_address].object_set_number].append(level_address)
+
+    return levels_per_object_set, levels_by_address
+
+
+def save_found_levels(rom: Rom, levels_by_address: dict[int, FoundLevel], cache_dir: Path = found_levels_cache_path):
+    found_levels = [levels_by_address[key].to_dict() for key in sorted(levels_by_address.keys())]
+
+    _cache_file(rom, cache_dir).write_text(json.dumps(found_levels))
@@ -0,0 +1,210 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class FragmentationReport:
+    used: int
+    """How many bytes of the bank are taken up by data blocks."""
+    free: int
+    """How many bytes behind the data blocks are free."""
+    free_blocks: int
+    """Over how many gaps the free bytes are spread out."""
+    largest_free_block: int
+    """The size of the biggest gap, i.e. the biggest block of data, that can be placed without moving anything."""
+
+
+class _GapTree:
+    """
+    A segment tree over the free bytes behind each data block of a bank. Every node knows the sum and the maximum of the
+    gaps below it, as well as how many of them are not empty, so updates and queries only touch one path of the tree.
+    """
+
+    def __init__(self, gaps: list[int]):
+        self._leaf_count = 1
+
+        while self._leaf_count < len(gaps):
+            self._leaf_count *= 2
+
+        self._sum = [0] * (2 * self._leaf_count)
+        self._max = [0] * (2 * self._leaf_count)
+        self._non_empty = [0] * (2 * self._leaf_count)
+
+        for index, gap in enumerate(gaps):
+            self._set_leaf(index, gap)
+
+        for node in reversed(range(1, self._leaf_count)):
+            self._combine(node)
+
+    @property
+    def total(self) -> int:
+        return self._sum[1]
+
+    @property
+    def largest(self) -> int:
+        return self._max[1]
+
+    @property
+    def non_empty(self) -> int:
+        return self._non_empty[1]
+
+    def update(self, index: int, gap: int):
+        self._set_leaf(index, gap)
+
+        node = (index + self._leaf_count) // 2
+
+        while node:
+            self._combine(node)
+            node //= 2
+
+    def sum_from(self, index: int) -> int:
+        """Sums up the gaps from the given index to the end of the bank."""
+        total = 0
+
+        low, high = index + self._leaf_count, 2 * self._leaf_count
+
+        while low < high:
+            if low & 1:
+                total += self._sum[low]
+                low += 1
+
+            if high & 1:
+                high -= 1
+                total += self._sum[high]
+
+            low //= 2
+            high //= 2
+
+        return total
+
+    def first_at_least(self, size: int) -> Optional[int]:
+        """Returns the index of the first gap, that is at least as big as the given size, or None, if there is none."""
+        if self._max[1] < size:
+            return None
+
+        node = 1
+
+        while node < self._leaf_count:
+            node *= 2
+
+            if self._max[node] < size:
+                node += 1
+
+        return node - self._leaf_count
+
+    def _set_leaf(self, index: int, gap: int):
+        leaf = index + self._leaf_count
+
+        self._sum[leaf] = gap
+        self._max[leaf] = gap
+        self._non_empty[leaf] = int(gap > 0)
+
+    def _combine(self, node: int):
+        left, right = 2 * node, 2 * node + 1
+
+        self._sum[node] = self._sum[left] + self._sum[right]
+        self._max[node] = max(self._max[left], self._max[right])
+        self._non_empty[node] = self._non_empty[left] + self._non_empty[right]
+
+
+class BankSpace:
+    """
+    Keeps track of the used and free parts of a bank of level or enemy data.
+
+    The data blocks are kept sorted by address, together with the free bytes behind each of them. A block can grow into
+    the gaps behind it, by moving the blocks following it back, until a gap is big enough to take up the difference.
+    So how much room a block has to grow, is the sum of the gaps behind it. Space in front of the first block is never
+    used, since the start of the bank is not always known.
+
+    :param blocks: The size of the data block at each address, including delimiters.
+    :param bank_end: The first address after the bank.
+    """
+
+    def __init__(self, blocks: dict[int, int], bank_end: int):
+        self.bank_end = bank_end
+
+        self._addresses = sorted(blocks.keys())
+        self._sizes = [blocks[address] for address in self._addresses]
+
+        self._gaps = _GapTree([self._gap_behind(index) for index in range(len(self._addresses))])
+
+    def __contains__(self, address: int) -> bool:
+        index = bisect_left(self._addresses, address)
+
+        return index < len(self._addresses) and self._addresses[index] == address
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def free_space_after(self, address: int) -> int:
+        """
+        How many bytes the data block at the given address can grow, by moving the blocks following it back.
+
+        :raises KeyError: If no block starts at the address.
+        """
+        return self._gaps.sum_from(self._index_of(address))
+
+    def free_space_at_end(self) -> int:
+        """How many bytes are free behind the last data block of the bank."""
+        if not self._addresses:
+            return 0
+
+        return self._gaps.sum_from(len(self._addresses) - 1)
+
+    def find_free(self, size: int) -> Optional[int]:
+        """Returns the first address, where a data block of the given size fits without moving anything, if any."""
+        if (index := self._gaps.first_at_least(size)) is None:
+            return None
+
+        return self._addresses[index] + self._sizes[index]
+
+    def resize(self, address: int, size: int) -> dict[int, int]:
+        """
+        Changes the size of the data block at the given address. If it doesn't fit in front of the next block anymore,
+        the following blocks are moved back, until there is a gap big enough to take up the difference.
+
+        :raises KeyError: If no block starts at the address.
+        :return: The new addresses of the moved blocks, by their old addresses.
+        """
+        index = self._index_of(address)
+
+        self._sizes[index] = size
+
+        moved_blocks: dict[int, int] = {}
+
+        data_end = address + size
+
+        for following_index in range(index + 1, len(self._addresses)):
+            if self._addresses[following_index] >= data_end:
+                break
+
+            moved_blocks[self._addresses[following_index]] = data_end
+            self._addresses[following_index] = data_end
+
+            data_end += self._sizes[following_index]
+
+        # only the gaps of the resized block, the moved blocks and the one taking up the difference changed
+        for changed_index in range(index, min(index + len(moved_blocks) + 1, len(self._addresses))):
+            self._gaps.update(changed_index, self._gap_behind(changed_index))
+
+        return moved_blocks
+
+    def fragmentation(self) -> FragmentationReport:
+        return FragmentationReport(sum(self._sizes), self._gaps.total, self._gaps.non_empty, self._gaps.largest)
+
+    def _index_of(self, address: int) -> int:
+        index = bisect_left(self._addresses, address)
+
+        if index == len(self._addresses) or self._addresses[index] != address:
+            raise KeyError(f"No data block starts at {address:#x}.")
+
+        return index
+
+    def _gap_behind(self, index: int) -> int:
+        if index + 1 < len(self._addresses):
+            next_start = self._addresses[index + 1]
+        else:
+            next_start = self.bank_end
+
+        return max(0, next_start - self._addresses[index] - self._sizes[index])
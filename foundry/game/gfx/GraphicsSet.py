@@ -1,6 +1,8 @@
 from functools import lru_cache
+from typing import Optional
 
 from foundry.game.File import ROM
+from foundry.game.gfx.drawable import CHR_TILE_SIZE, decode_2bpp
 from smb3parse.constants import (
     STOCK_LEVEL_BG_PAGES1_BYTES,
     STOCK_LEVEL_BG_PAGES2_BYTES,
@@ -18,6 +20,14 @@ VS_2P = 18
 
 BG_PAGE_COUNT = Level_BG_Pages2 - Level_BG_Pages1  # 23 in stock rom
 
+ANIMATION_FRAME_COUNT = 4
+
+ANIMATED_TILE_COUNT = 2 * CHR_ROM_SEGMENT_SIZE // CHR_TILE_SIZE
+"""
+How many tiles change between animation frames. On the world map these are the first tiles, in levels the tiles right
+after them.
+"""
+
 GRAPHIC_SET_NAMES = [
     "Mario graphics (1)",
     "Plain",
@@ -65,6 +75,7 @@ class GraphicsSet:
 
         self._data = bytearray()
         self._anim_data = []
+        self._tile_atlases: dict[bool, tuple[bytes, ...]] = {}
         self.anim_frame = 0
         self.number = graphic_set_number
 
@@ -107,19 +118,48 @@ class GraphicsSet:
 
     @property
     def data(self):
+        return self.frame_data(self.anim_frame)
+
+    def frame_data(self, anim_frame: int) -> bytearray:
         if self.number == WORLD_MAP:
-            return self._anim_data[self.anim_frame] + self._data
+            return self._anim_data[anim_frame] + self._data
         else:
             # cycle through the second page containing the animated tiles for level objects
             page_1 = self._data[0 : 2 * CHR_ROM_SEGMENT_SIZE]
 
-            start = 2 * CHR_ROM_SEGMENT_SIZE + self.anim_frame * 2 * CHR_ROM_SEGMENT_SIZE
+            start = 2 * CHR_ROM_SEGMENT_SIZE + anim_frame * 2 * CHR_ROM_SEGMENT_SIZE
             end = 2 * CHR_ROM_SEGMENT_SIZE + start + 2 * CHR_ROM_SEGMENT_SIZE
 
             page_2 = self._data[start:end]
 
             return page_1 + page_2
 
+    def is_animated_tile(self, tile_index: int) -> bool:
+        """Whether the tile at the given index changes between animation frames."""
+        if self.number == WORLD_MAP:
+            return tile_index < ANIMATED_TILE_COUNT
+        else:
+            return tile_index >= ANIMATED_TILE_COUNT
+
+    def tile_atlas(self, mirrored: bool = False, anim_frame: Optional[int] = None) -> bytes:
+        """
+        Returns the pixels of all tiles in an animation frame, decoded into one color index per pixel, as described in
+        decode_2bpp. The atlases of all animation frames are decoded at once, so that switching between frames later
+        costs nothing.
+
+        :param mirrored: Whether to return the atlas with all tiles mirrored horizontally.
+        :param anim_frame: The animation frame to return the atlas of. Defaults to the current animation frame.
+        """
+        if anim_frame is None:
+            anim_frame = self.anim_frame
+
+        if mirrored not in self._tile_atlases:
+            self._tile_atlases[mirrored] = tuple(
+                decode_2bpp(self.frame_data(frame), mirrored) for frame in range(ANIMATION_FRAME_COUNT)
+            )
+
+        return self._tile_atlases[mirrored][anim_frame]
+
     def _read_in(self, segments):
         for segment in segments:
             self._read_in_chr_rom_segment(segment, self._data)
@@ -144,9 +184,8 @@ class GraphicsSet:
     @staticmethod
     def _read_in_chr_rom_segment(index, data):
         offset = CHR_ROM_OFFSET + index * CHR_ROM_SEGMENT_SIZE
-        chr_rom_data = ROM().read(offset, 2 * CHR_ROM_SEGMENT_SIZE)
-
-        data.extend(chr_rom_data)
+        with ROM().view(offset, 2 * CHR_ROM_SEGMENT_SIZE) as chr_rom_data:
+            data.extend(chr_rom_data)
 
     @staticmethod
     @lru_cache(32)
@@ -1,4 +1,4 @@
-from foundry.game.gfx.drawable.Block import get_block, get_tile
+from foundry.game.gfx.drawable.Block import Block, get_block, get_tile
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import PaletteGroup, _palette_group_cache
 
@@ -9,11 +9,13 @@ def restore_all_palettes():
 
     get_tile.cache_clear()
     get_block.cache_clear()
+    Block.image_cache.clear()
     PaletteGroup.changed = False
 
 
 def restore_graphics():
     GraphicsSet.from_number.cache_clear()
+    Block.image_cache.clear()
 
 
 def change_color(
@@ -29,5 +31,5 @@ def change_color(
     else:
         palette_group[index_in_group][index_in_palette] = new_color_index
 
-    get_tile.cache_clear()
-    get_block.cache_clear()
+    # tiles and blocks look up their colors, when they are drawn, and the block images are cached by their colors, so
+    # nothing needs to be thrown away here
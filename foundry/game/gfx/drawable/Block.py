@@ -1,11 +1,12 @@
 from functools import lru_cache
+from typing import NamedTuple
 
-from PySide6.QtCore import QPoint
 from PySide6.QtGui import QColor, QImage, QPainter, Qt
 
 from foundry.game.File import ROM
 from foundry.game.gfx.drawable import MASK_COLOR, apply_selection_overlay
-from foundry.game.gfx.drawable.Tile import Tile
+from foundry.game.gfx.drawable.image_cache import ImageCache
+from foundry.game.gfx.drawable.Tile import Tile, color_table
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import NESPalette, PaletteGroup, load_palette_group
 from smb3parse.objects.object_set import CLOUDY_GRAPHICS_SET, WORLD_MAP_OBJECT_SET
@@ -15,6 +16,9 @@ TSA_BANK_1 = 1 * 256
 TSA_BANK_2 = 2 * 256
 TSA_BANK_3 = 3 * 256
 
+BLOCK_COUNT = 256
+"""How many Blocks the TSA data of an object set defines."""
+
 
 @lru_cache(2**10)
 def get_block(
@@ -32,9 +36,29 @@ def get_block(
     return block
 
 
+def tile_indexes(block_index: int, tsa_data: bytes) -> tuple[int, int, int, int]:
+    """Returns the indexes of the upper left, lower left, upper right and lower right tile of the Block."""
+    return (
+        tsa_data[TSA_BANK_0 + block_index],
+        tsa_data[TSA_BANK_1 + block_index],
+        tsa_data[TSA_BANK_2 + block_index],
+        tsa_data[TSA_BANK_3 + block_index],
+    )
+
+
+@lru_cache(2**4)
+def animated_block_indexes(graphics_set: GraphicsSet, tsa_data: bytes) -> frozenset[int]:
+    """Returns the indexes of all Blocks, that look different between animation frames, without creating them."""
+    return frozenset(
+        block_index
+        for block_index in range(BLOCK_COUNT)
+        if any(map(graphics_set.is_animated_tile, tile_indexes(block_index, tsa_data)))
+    )
+
+
 @lru_cache(2**10)
-def get_tile(index, palette_group, palette_index, graphics_set, mirrored=False):
-    return Tile(index, palette_group, palette_index, graphics_set, mirrored)
+def get_tile(index, palette_group, palette_index, graphics_set, mirrored=False, anim_frame=0):
+    return Tile(index, palette_group, palette_index, graphics_set, mirrored, anim_frame)
 
 
 def get_worldmap_tile(block_index: int, palette_index=0):
@@ -46,7 +70,19 @@ def get_worldmap_tile(block_index: int, palette_index=0):
     )
 
 
-BlockId = tuple[int, str, int]
+BlockId = tuple[int, int, bytes, bytes, int]
+
+
+class BlockImageKey(NamedTuple):
+    block_id: BlockId
+    block_length: int
+    selected: bool
+    transparent: bool
+    anim_frame: int
+
+
+BLOCK_IMAGE_CACHE_BUDGET = 64 * 1024 * 1024
+"""How many bytes the images of drawn Blocks may take up, before the least recently used ones are evicted."""
 
 
 class Block:
@@ -58,7 +94,9 @@ class Block:
 
     tsa_data = bytes()
 
-    _block_cache: dict[tuple[BlockId, int, bool, bool, int], QImage] = {}
+    image_cache = ImageCache[BlockImageKey](
+        BLOCK_IMAGE_CACHE_BUDGET, ("block_length", "selected", "transparent", "anim_frame")
+    )
 
     def __init__(
         self,
@@ -79,32 +117,53 @@ class Block:
         self.mirrored = mirrored
 
         self.images: dict[int, QImage] = {}
+        """The pixels of the Block by animation frame, as indexes into the palette of the Block."""
 
         if graphics_set.number == CLOUDY_GRAPHICS_SET:
-            self.bg_color = NESPalette[palette_group[self.palette_index][2]]
+            self.background_color_index = 2
         else:
-            self.bg_color = NESPalette[palette_group[self.palette_index][0]]
+            self.background_color_index = 0
+
+        self.is_animated = any(graphics_set.is_animated_tile(tile_index) for tile_index in self._tile_indexes())
+        """Whether the Block looks different between animation frames. If not, all frames share one image."""
 
         self._render()
 
+    @property
+    def palette(self) -> bytearray:
+        return self.palette_group[self.palette_index]
+
+    @property
+    def bg_color(self) -> QColor:
+        return NESPalette[self.palette[self.background_color_index]]
+
+    @property
+    def _block_id(self) -> BlockId:
+        # the TSA data decides the tiles, while the palette decides the colors. The TSA data is shared per object set,
+        # so comparing it is usually just an identity check and its hash is only calculated once
+        return self.index, self.palette_group.object_set, bytes(self.palette), self.tsa_data, self.graphics_set.number
+
+    @property
+    def _image_frame(self) -> int:
+        """The animation frame, whose image is used for the current animation frame."""
+        if self.is_animated:
+            return self.graphics_set.anim_frame
+        else:
+            return 0
+
+    def _tile_indexes(self) -> tuple[int, int, int, int]:
+        return tile_indexes(self.index, self.tsa_data)
+
     def _render(self):
-        if self.graphics_set.anim_frame in self.images:
-            return
+        anim_frame = self._image_frame
 
-        # can't hash list, so turn it into a string instead
-        self._block_id: BlockId = (
-            self.index,
-            str(self.palette_group),
-            self.graphics_set.number,
-        )
+        if anim_frame in self.images:
+            return
 
-        lu = self.tsa_data[TSA_BANK_0 + self.index]
-        ld = self.tsa_data[TSA_BANK_1 + self.index]
-        ru = self.tsa_data[TSA_BANK_2 + self.index]
-        rd = self.tsa_data[TSA_BANK_3 + self.index]
+        lu, ld, ru, rd = self._tile_indexes()
 
-        self.lu_tile = get_tile(lu, self.palette_group, self.palette_index, self.graphics_set)
-        self.ld_tile = get_tile(ld, self.palette_group, self.palette_index, self.graphics_set)
+        self.lu_tile = get_tile(lu, self.palette_group, self.palette_index, self.graphics_set, anim_frame=anim_frame)
+        self.ld_tile = get_tile(ld, self.palette_group, self.palette_index, self.graphics_set, anim_frame=anim_frame)
 
         if self.mirrored:
             self.ru_tile = get_tile(
@@ -113,6 +172,7 @@ class Block:
                 self.palette_index,
                 self.graphics_set,
                 mirrored=True,
+                anim_frame=anim_frame,
             )
             self.rd_tile = get_tile(
                 ld,
@@ -120,77 +180,77 @@ class Block:
                 self.palette_index,
                 self.graphics_set,
                 mirrored=True,
+                anim_frame=anim_frame,
             )
         else:
-            self.ru_tile = get_tile(ru, self.palette_group, self.palette_index, self.graphics_set)
-            self.rd_tile = get_tile(rd, self.palette_group, self.palette_index, self.graphics_set)
-
-        image = QImage(Block.WIDTH, Block.HEIGHT, QImage.Format_RGB888)
+            self.ru_tile = get_tile(
+                ru, self.palette_group, self.palette_index, self.graphics_set, anim_frame=anim_frame
+            )
+            self.rd_tile = get_tile(
+                rd, self.palette_group, self.palette_index, self.graphics_set, anim_frame=anim_frame
+            )
 
-        painter = QPainter(image)
+        pixels = bytearray()
 
-        painter.drawImage(QPoint(0, 0), self.lu_tile.as_image())
-        painter.drawImage(QPoint(Tile.WIDTH, 0), self.ru_tile.as_image())
-        painter.drawImage(QPoint(0, Tile.HEIGHT), self.ld_tile.as_image())
-        painter.drawImage(QPoint(Tile.WIDTH, Tile.HEIGHT), self.rd_tile.as_image())
+        for left_tile, right_tile in [(self.lu_tile, self.ru_tile), (self.ld_tile, self.rd_tile)]:
+            for row_start in range(0, Tile.PIXEL_COUNT, Tile.WIDTH):
+                pixels += left_tile.pixels[row_start : row_start + Tile.WIDTH]
+                pixels += right_tile.pixels[row_start : row_start + Tile.WIDTH]
 
-        painter.end()
+        self._whole_block_is_transparent = pixels.count(self.background_color_index) == Block.PIXEL_COUNT
 
-        if _image_only_one_color(image) and image.pixelColor(0, 0) == QColor(*MASK_COLOR):
-            self._whole_block_is_transparent = True
-        else:
-            self._whole_block_is_transparent = False
+        image = QImage(pixels, Block.WIDTH, Block.HEIGHT, Block.WIDTH, QImage.Format_Indexed8)
 
-        self.images[self.graphics_set.anim_frame] = image
+        # detach the image from the pixel buffer
+        self.images[anim_frame] = image.copy()
 
     def rerender(self):
         self._render()
 
     def draw(self, painter: QPainter, x, y, block_length, selected=False, transparent=False):
-        block_attributes = (
-            self._block_id,
-            block_length,
-            selected,
-            transparent,
-            self.graphics_set.anim_frame,
-        )
+        key = BlockImageKey(self._block_id, block_length, selected, transparent, self._image_frame)
 
-        if block_attributes not in Block._block_cache:
-            self.rerender()
-            image = self.images[self.graphics_set.anim_frame].copy()
+        image = Block.image_cache.get(key)
 
-            if block_length != Block.WIDTH:
-                image = image.scaled(block_length, block_length)
+        if image is None:
+            image = self._colored_image(block_length, selected, transparent)
 
-            # mask out the transparent pixels first
-            mask = image.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
-            image.setAlphaChannel(mask)
+            Block.image_cache.put(key, image)
 
-            if not transparent:  # or self._whole_block_is_transparent:
-                image = self._replace_transparent_with_background(image)
+        painter.drawImage(x, y, image)
 
-            if selected:
-                apply_selection_overlay(image, mask)
+    def _colored_image(self, block_length: int, selected: bool, transparent: bool) -> QImage:
+        """
+        Colors the pixels of the Block with its current palette. Since the pixels are only indexes into the palette,
+        this only needs a new color table and no repainting of any tiles.
+        """
+        self.rerender()
+        image = self.images[self._image_frame].copy()
 
-            Block._block_cache[block_attributes] = image
+        if transparent:
+            background_rgba = QColor(Qt.transparent).rgba()
+        else:
+            background_rgba = self.bg_color.rgb()
 
-        painter.drawImage(x, y, Block._block_cache[block_attributes])
+        image.setColorTable(color_table(self.palette, self.background_color_index, background_rgba))
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
 
-    def _replace_transparent_with_background(self, image):
-        # draw image on background layer, to fill transparent pixels
-        background = image.copy()
-        background.fill(self.bg_color)
+        if block_length != Block.WIDTH:
+            image = image.scaled(block_length, block_length)
 
-        _painter = QPainter(background)
-        _painter.drawImage(QPoint(), image)
-        _painter.end()
+        if selected:
+            apply_selection_overlay(image, self._background_mask(block_length))
 
-        return background
+        return image
 
+    def _background_mask(self, block_length: int) -> QImage:
+        """Returns a mask, that leaves out the pixels of the Block, that have the background color index."""
+        image = self.images[self._image_frame].copy()
 
-def _image_only_one_color(image):
-    copy = image.copy()
+        image.setColorTable(color_table(self.palette, self.background_color_index, QColor(*MASK_COLOR).rgb()))
+        image = image.convertToFormat(QImage.Format_RGB888)
 
-    copy.convertTo(QImage.Format_Indexed8)
+        if block_length != Block.WIDTH:
+            image = image.scaled(block_length, block_length)
 
-    return copy.colorCount() == 1
+        return image.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
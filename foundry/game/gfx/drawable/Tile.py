@@ -1,16 +1,19 @@
-from PySide6.QtGui import QImage
+from PySide6.QtGui import QColor, QImage
 
-from foundry.game.gfx.drawable import MASK_COLOR, bit_reverse
+from foundry.game.gfx.drawable import MASK_COLOR
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import NESPalette, PaletteGroup
 from smb3parse.objects.object_set import CLOUDY_GRAPHICS_SET
 
-PIXEL_OFFSET = 8  # both bits describing the color of a pixel are in separate 8 byte chunks at the same index
-
 BACKGROUND_COLOR_INDEX = 0
 
 
 class Tile:
+    """
+    A tile of 8x8 pixels out of a GraphicsSet. The pixels are indexes into the palette of the tile. The colors are only
+    looked up, when the tile is turned into an image, so changes to the palette don't need a new tile.
+    """
+
     SIDE_LENGTH = 8  # pixel
     WIDTH = SIDE_LENGTH
     HEIGHT = SIDE_LENGTH
@@ -25,65 +28,62 @@ class Tile:
         palette_index: int,
         graphics_set: GraphicsSet,
         mirrored=False,
+        anim_frame=0,
     ):
         self.tile_index = object_index
 
-        start = object_index * Tile.SIZE
+        start = object_index * Tile.PIXEL_COUNT
 
-        self.cached_tiles: dict[int, QImage] = dict()
+        self.cached_tiles: dict[tuple[int, bytes], QImage] = dict()
 
-        self.palette = palette_group[palette_index]
+        self.palette_group = palette_group
+        self.palette_index = palette_index
 
-        self.data = bytearray()
-        self.pixels = bytearray()
-        self.mask_pixels = bytearray()
+        # one color index per pixel
+        self.pixels = graphics_set.tile_atlas(mirrored, anim_frame)[start : start + Tile.PIXEL_COUNT]
 
-        self.data = graphics_set.data[start : start + Tile.SIZE]
+        assert len(self.pixels) == Tile.PIXEL_COUNT
 
         if graphics_set.number == CLOUDY_GRAPHICS_SET:
             self.background_color_index = 2
         else:
             self.background_color_index = 0
 
-        if mirrored:
-            self._mirror()
-
-        for i in range(Tile.PIXEL_COUNT):
-            byte_index = i // Tile.HEIGHT
-            bit_index = 2 ** (7 - (i % Tile.WIDTH))
-
-            left_bit = right_bit = 0
+    @property
+    def palette(self) -> bytearray:
+        return self.palette_group[self.palette_index]
 
-            if self.data[byte_index] & bit_index:
-                left_bit = 1
+    @property
+    def color_table(self) -> list[int]:
+        return color_table(self.palette, self.background_color_index, QColor(*MASK_COLOR).rgb())
 
-            if self.data[PIXEL_OFFSET + byte_index] & bit_index:
-                right_bit = 1
-
-            color_index = (right_bit << 1) | left_bit
-
-            color = self.palette[color_index]
+    def as_image(self, tile_length=8):
+        key = tile_length, bytes(self.palette)
 
-            # add alpha values
-            if color_index == self.background_color_index:
-                self.pixels.extend(MASK_COLOR)
-            else:
-                self.pixels.extend(NESPalette[color].toTuple()[:3])
+        if key not in self.cached_tiles:
+            image = QImage(self.pixels, self.WIDTH, self.HEIGHT, self.WIDTH, QImage.Format_Indexed8)
+            image.setColorTable(self.color_table)
 
-        assert len(self.pixels) == 3 * Tile.PIXEL_COUNT
+            # also detaches the image from the pixel buffer
+            image = image.convertToFormat(QImage.Format_RGB888)
 
-    def as_image(self, tile_length=8):
-        if True or tile_length not in self.cached_tiles.keys():
-            width = height = tile_length
+            if tile_length != self.WIDTH:
+                image = image.scaled(tile_length, tile_length)
 
-            image = QImage(self.pixels, self.WIDTH, self.HEIGHT, QImage.Format_RGB888)
+            self.cached_tiles[key] = image
 
-            image = image.scaled(width, height)
+        return self.cached_tiles[key]
 
-            self.cached_tiles[tile_length] = image
 
-        return self.cached_tiles[tile_length]
+def color_table(palette: bytearray, background_color_index: int, background_rgba: int) -> list[int]:
+    """
+    Returns the color table for indexed images, that use the given palette.
 
-    def _mirror(self):
-        for byte in range(len(self.data)):
-            self.data[byte] = bit_reverse[self.data[byte]]
+    :param palette: The indexes into the NESPalette of the colors to use.
+    :param background_color_index: Which of the colors is the background color.
+    :param background_rgba: What to use as the background color instead, e.g. the mask color.
+    """
+    return [
+        background_rgba if color_index == background_color_index else NESPalette[color].rgb()
+        for color_index, color in enumerate(palette)
+    ]
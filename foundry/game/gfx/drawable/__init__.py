@@ -263,6 +263,39 @@ bit_reverse = [
 ]
 MASK_COLOR = [0xFF, 0x00, 0xFF]
 
+CHR_TILE_SIZE = 16  # bytes, two bit planes of 8 bytes each
+CHR_PLANE_SIZE = CHR_TILE_SIZE // 2
+
+_BIT_REVERSE_TABLE = bytes(bit_reverse)
+
+# every bit of a plane byte spread out into its own byte, so that 8 pixels can be looked up at once
+_PLANE_BYTE_TO_PIXELS = [bytes((byte >> (7 - bit)) & 1 for bit in range(8)) for byte in range(256)]
+
+
+def decode_2bpp(chr_data: bytes | bytearray, mirrored: bool = False) -> bytes:
+    """
+    Decodes 2bpp tile data of the NES into one byte per pixel, holding the color index of that pixel in its palette.
+
+    The pixels of a tile are returned as 8 consecutive rows of 8 bytes, followed by the pixels of the next tile.
+
+    :param chr_data: The graphics data, made up of 16 byte tiles.
+    :param mirrored: Whether to mirror every tile horizontally.
+    """
+    if mirrored:
+        chr_data = bytes(chr_data).translate(_BIT_REVERSE_TABLE)
+
+    tile_starts = range(0, len(chr_data), CHR_TILE_SIZE)
+
+    low_plane = b"".join(chr_data[start : start + CHR_PLANE_SIZE] for start in tile_starts)
+    high_plane = b"".join(chr_data[start + CHR_PLANE_SIZE : start + CHR_TILE_SIZE] for start in tile_starts)
+
+    low_bits = int.from_bytes(b"".join(map(_PLANE_BYTE_TO_PIXELS.__getitem__, low_plane)), "big")
+    high_bits = int.from_bytes(b"".join(map(_PLANE_BYTE_TO_PIXELS.__getitem__, high_plane)), "big")
+
+    # every byte only holds a 0 or 1, so the shift never carries over into the neighboring pixel
+    return (low_bits | high_bits << 1).to_bytes(8 * len(low_plane), "big")
+
+
 SELECTION_OVERLAY_COLOR = QColor(20, 87, 159, 80)
 
 png = QImage(str(data_dir / "gfx.png"))
@@ -0,0 +1,126 @@
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Generic, Optional, TypeVar
+
+from PySide6.QtGui import QImage
+
+K = TypeVar("K", bound=tuple)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    images: int = 0
+    byte_size: int = 0
+
+
+class ImageCache(Generic[K]):
+    """
+    Keeps rendered images up to a byte budget. When the budget is exceeded, the least recently used images are evicted
+    first.
+
+    The keys are named tuples. For every field of the key, that is listed as a tracked dimension, the hits, misses and
+    evictions, as well as the amount and size of the cached images, are counted per value of that field. This shows, for
+    example, how much memory is taken up by images for a specific zoom level.
+
+    :param byte_budget: How many bytes the cached images may take up in total.
+    :param tracked_dimensions: The fields of the keys to keep statistics for.
+    """
+
+    def __init__(self, byte_budget: int, tracked_dimensions: tuple[str, ...] = ()):
+        self.byte_budget = byte_budget
+        self.tracked_dimensions = tracked_dimensions
+
+        self.byte_size = 0
+
+        self._images: OrderedDict[K, QImage] = OrderedDict()
+        self._stats: dict[str, dict[Any, CacheStats]] = {
+            dimension: defaultdict(CacheStats) for dimension in tracked_dimensions
+        }
+
+    def __len__(self):
+        return len(self._images)
+
+    def __contains__(self, key: K):
+        return key in self._images
+
+    def get(self, key: K) -> Optional[QImage]:
+        """Returns the image stored under the key and marks it as most recently used, or None if there is none."""
+        image = self._images.get(key)
+
+        if image is None:
+            for stats in self._stats_of(key):
+                stats.misses += 1
+
+            return None
+
+        self._images.move_to_end(key)
+
+        for stats in self._stats_of(key):
+            stats.hits += 1
+
+        return image
+
+    def put(self, key: K, image: QImage):
+        """Stores the image under the key and evicts the least recently used images, until the budget is met again."""
+        if key in self._images:
+            self._remove(key)
+
+        self._images[key] = image
+        self.byte_size += image.sizeInBytes()
+
+        for stats in self._stats_of(key):
+            stats.images += 1
+            stats.byte_size += image.sizeInBytes()
+
+        while self.byte_size > self.byte_budget and len(self._images) > 1:
+            oldest_key = next(iter(self._images))
+
+            self._remove(oldest_key)
+
+            for stats in self._stats_of(oldest_key):
+                stats.evictions += 1
+
+    def invalidate(self, **dimension_values):
+        """
+        Removes all images, whose keys have the given values for the named fields, e.g. invalidate(block_length=32).
+        Without any values given, all images are removed.
+        """
+        if not dimension_values:
+            self.clear()
+            return
+
+        for key in [key for key in self._images if _matches(key, dimension_values)]:
+            self._remove(key)
+
+    def clear(self):
+        """Removes all images, but keeps the statistics."""
+        self._images.clear()
+        self.byte_size = 0
+
+        for stats_by_value in self._stats.values():
+            for stats in stats_by_value.values():
+                stats.images = 0
+                stats.byte_size = 0
+
+    def stats(self, dimension: str) -> dict[Any, CacheStats]:
+        """Returns the statistics of the cache, by value of the given field of the keys."""
+        return dict(self._stats[dimension])
+
+    def _remove(self, key: K):
+        image = self._images.pop(key)
+
+        self.byte_size -= image.sizeInBytes()
+
+        for stats in self._stats_of(key):
+            stats.images -= 1
+            stats.byte_size -= image.sizeInBytes()
+
+    def _stats_of(self, key: K) -> list[CacheStats]:
+        return [self._stats[dimension][getattr(key, dimension)] for dimension in self.tracked_dimensions]
+
+
+def _matches(key: tuple, dimension_values: dict[str, Any]) -> bool:
+    return all(getattr(key, dimension) == value for dimension, value in dimension_values.items())
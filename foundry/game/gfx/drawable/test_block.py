@@ -0,0 +1,102 @@
+from typing import cast
+
+from PySide6.QtGui import QImage, QPainter
+
+from foundry.game.gfx import change_color
+from foundry.game.gfx.drawable import decode_2bpp
+from foundry.game.gfx.drawable.Block import TSA_BANK_0, TSA_BANK_1, TSA_BANK_2, TSA_BANK_3, Block
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import NESPalette, PaletteGroup
+
+# every pixel of the tile uses color index 1
+TILE_DATA = bytes([0xFF] * 8 + [0x00] * 8)
+
+# every pixel of the tile uses color index 2
+OTHER_TILE_DATA = bytes([0x00] * 8 + [0xFF] * 8)
+
+
+class _GraphicsSet:
+    number = 1
+    anim_frame = 0
+
+    def tile_atlas(self, mirrored=False, anim_frame=None):
+        if anim_frame is None:
+            anim_frame = self.anim_frame
+
+        # tile 0 and 2 stay the same, tile 1 alternates between the two
+        return decode_2bpp(TILE_DATA + (TILE_DATA, OTHER_TILE_DATA)[anim_frame % 2] + OTHER_TILE_DATA, mirrored)
+
+    def is_animated_tile(self, tile_index):
+        return tile_index == 1
+
+
+def _graphics_set() -> GraphicsSet:
+    return cast(GraphicsSet, _GraphicsSet())
+
+
+def _tsa_data(**tile_by_block: int) -> bytes:
+    """Returns TSA data, in which all Blocks consist of tile 0, besides the given ones, e.g. _tsa_data(block_1=2)."""
+    tsa_data = bytearray(4 * 256)
+
+    for block, tile_index in tile_by_block.items():
+        block_index = int(block.removeprefix("block_"))
+
+        for tsa_bank in (TSA_BANK_0, TSA_BANK_1, TSA_BANK_2, TSA_BANK_3):
+            tsa_data[tsa_bank + block_index] = tile_index
+
+    return bytes(tsa_data)
+
+
+def _draw(block: Block) -> QImage:
+    image = QImage(Block.WIDTH, Block.HEIGHT, QImage.Format_RGB888)
+
+    painter = QPainter(image)
+    block.draw(painter, 0, 0, Block.WIDTH)
+    painter.end()
+
+    return image
+
+
+def test_palette_change_recolors_block():
+    palette_group = PaletteGroup(1, 0, 0, [bytearray([0x0F, 0x16, 0x27, 0x30]) for _ in range(4)])
+    block = Block(0, palette_group, _graphics_set(), _tsa_data())
+
+    assert _draw(block).pixelColor(0, 0) == NESPalette[0x16]
+
+    change_color(palette_group, 0, 1, 0x2A)
+
+    # the same block is drawn with the new color, without being created again
+    assert _draw(block).pixelColor(0, 0) == NESPalette[0x2A]
+
+
+def test_animation_frames():
+    palette_group = PaletteGroup(1, 0, 0, [bytearray([0x0F, 0x16, 0x27, 0x30]) for _ in range(4)])
+    graphics_set = _graphics_set()
+    tsa_data = _tsa_data(block_1=1)
+
+    static_block = Block(0, palette_group, graphics_set, tsa_data)
+    animated_block = Block(1, palette_group, graphics_set, tsa_data)
+
+    assert not static_block.is_animated
+    assert animated_block.is_animated
+
+    for anim_frame, expected_color in [(0, 0x16), (1, 0x27), (2, 0x16), (3, 0x27)]:
+        graphics_set.anim_frame = anim_frame
+
+        assert _draw(static_block).pixelColor(0, 0) == NESPalette[0x16]
+        assert _draw(animated_block).pixelColor(0, 0) == NESPalette[expected_color]
+
+    # every animation frame is only rendered once and the static block only has one image for all of them
+    assert len(static_block.images) == 1
+    assert len(animated_block.images) == 4
+
+
+def test_same_block_index_in_different_tsa_data():
+    palette_group = PaletteGroup(1, 0, 0, [bytearray([0x0F, 0x16, 0x27, 0x30]) for _ in range(4)])
+    graphics_set = _graphics_set()
+
+    block = Block(0, palette_group, graphics_set, _tsa_data())
+    other_block = Block(0, palette_group, graphics_set, _tsa_data(block_0=2))
+
+    assert _draw(block).pixelColor(0, 0) == NESPalette[0x16]
+    assert _draw(other_block).pixelColor(0, 0) == NESPalette[0x27]
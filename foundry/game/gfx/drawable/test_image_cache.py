@@ -0,0 +1,78 @@
+from typing import NamedTuple
+
+from PySide6.QtGui import QImage
+
+from foundry.game.gfx.drawable.image_cache import ImageCache
+
+
+class Key(NamedTuple):
+    block_index: int
+    length: int
+
+
+def _image(length: int) -> QImage:
+    return QImage(length, length, QImage.Format_ARGB32)
+
+
+IMAGE_SIZE = _image(16).sizeInBytes()
+
+
+def test_least_recently_used_is_evicted():
+    cache = ImageCache[Key](2 * IMAGE_SIZE, ("length",))
+
+    cache.put(Key(0, 16), _image(16))
+    cache.put(Key(1, 16), _image(16))
+
+    # use the first image, so that the second one is the least recently used
+    assert cache.get(Key(0, 16)) is not None
+
+    cache.put(Key(2, 16), _image(16))
+
+    assert Key(0, 16) in cache
+    assert Key(1, 16) not in cache
+    assert Key(2, 16) in cache
+
+    assert cache.byte_size == 2 * IMAGE_SIZE
+
+    stats = cache.stats("length")[16]
+
+    assert (stats.hits, stats.evictions, stats.images, stats.byte_size) == (1, 1, 2, 2 * IMAGE_SIZE)
+
+
+def test_stats_per_dimension():
+    cache = ImageCache[Key](100 * IMAGE_SIZE, ("length",))
+
+    cache.put(Key(0, 16), _image(16))
+    cache.put(Key(0, 32), _image(32))
+
+    assert cache.get(Key(0, 32)) is not None
+    assert cache.get(Key(1, 32)) is None
+
+    small_stats, big_stats = cache.stats("length")[16], cache.stats("length")[32]
+
+    assert (small_stats.hits, small_stats.misses, small_stats.byte_size) == (0, 0, IMAGE_SIZE)
+    assert (big_stats.hits, big_stats.misses, big_stats.byte_size) == (1, 1, 4 * IMAGE_SIZE)
+
+
+def test_invalidate():
+    cache = ImageCache[Key](100 * IMAGE_SIZE, ("length",))
+
+    for index in range(3):
+        cache.put(Key(index, 16), _image(16))
+        cache.put(Key(index, 32), _image(32))
+
+    cache.invalidate(length=32)
+
+    assert len(cache) == 3
+    assert cache.byte_size == 3 * IMAGE_SIZE
+    assert cache.stats("length")[32].images == 0
+
+    cache.invalidate(block_index=1, length=16)
+
+    assert Key(1, 16) not in cache
+    assert len(cache) == 2
+
+    cache.invalidate()
+
+    assert len(cache) == 0
+    assert cache.byte_size == 0
@@ -0,0 +1,21 @@
+from foundry.game.gfx.drawable import decode_2bpp
+
+# first row of the low plane, then the high plane, all other rows are empty
+TILE_DATA = bytes([0b1000_0001] + 7 * [0] + [0b1100_0000] + 7 * [0])
+
+
+def test_decode_2bpp():
+    pixels = decode_2bpp(TILE_DATA + TILE_DATA)
+
+    assert len(pixels) == 2 * 64
+
+    assert pixels[0:8] == bytes([3, 2, 0, 0, 0, 0, 0, 1])
+    assert pixels[8:64] == bytes(56)
+    assert pixels[64:128] == pixels[0:64]
+
+
+def test_decode_2bpp_mirrored():
+    pixels = decode_2bpp(TILE_DATA, mirrored=True)
+
+    assert pixels[0:8] == bytes([1, 0, 0, 0, 0, 0, 2, 3])
+    assert pixels[8:64] == bytes(56)
@@ -1,8 +1,11 @@
+from typing import NamedTuple
+
 from PySide6.QtCore import QRect, QSize
 from PySide6.QtGui import QColor, QImage, QPainter, Qt
 
-from foundry.game.gfx.drawable import MASK_COLOR, apply_selection_overlay
+from foundry.game.gfx.drawable import MASK_COLOR, apply_selection_overlay, png
 from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.image_cache import ImageCache
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.objects.in_level.in_level_object import InLevelObject
 from foundry.game.gfx.Palette import PaletteGroup
@@ -15,9 +18,27 @@ from foundry.game.ObjectSet import ObjectSet
 from smb3parse.constants import OBJ_AUTOSCROLL, OBJ_BOOMBOOM, OBJ_FLYING_BOOMBOOM
 from smb3parse.objects.object_set import ENEMY_ITEM_GRAPHICS_SET, ENEMY_ITEM_OBJECT_SET
 
+ENEMY_ITEM_SPRITE_SHEET = png
+"""The sprites of all enemies and items, already in the colors they are drawn in. Shared with the other sprites."""
+
+ENEMY_ITEM_SPRITE_SHEET_OFFSET = 12 * (256 // 64) * Block.HEIGHT
+"""Where the enemy and item sprites start in the sprite sheet. The rows above are used by other object sets."""
+
+
+class EnemyImageKey(NamedTuple):
+    enemy_item_id: int
+    block_length: int
+    selected: bool
+
+
+ENEMY_IMAGE_CACHE_BUDGET = 16 * 1024 * 1024
+"""How many bytes the images of drawn enemies and items may take up, before the least recently used are evicted."""
+
 
 class EnemyItem(InLevelObject):
-    def __init__(self, data, png_data, palette_group: PaletteGroup):
+    image_cache = ImageCache[EnemyImageKey](ENEMY_IMAGE_CACHE_BUDGET, ("block_length", "selected"))
+
+    def __init__(self, data, palette_group: PaletteGroup):
         super(EnemyItem, self).__init__()
 
         self.data = data
@@ -53,12 +74,21 @@ class EnemyItem(InLevelObject):
 
         self.object_set = ObjectSet.from_number(ENEMY_ITEM_OBJECT_SET)
 
-        self.png_data = png_data
-
         self.selected = False
 
         self._setup()
 
+    @property
+    def auto_scroll_type(self) -> int:
+        return self._auto_scroll_type
+
+    @auto_scroll_type.setter
+    def auto_scroll_type(self, value: int):
+        self._auto_scroll_type = value
+
+        # the auto scroll path is drawn based on this
+        self._changed()
+
     @property
     def rect(self):
         return QRect(
@@ -76,21 +106,13 @@ class EnemyItem(InLevelObject):
         self.width = self.rendered_width = obj_def.bmp_width
         self.height = self.rendered_height = obj_def.bmp_height
 
-        self._render(obj_def)
-
-    def _render(self, obj_def):
-        self.blocks = []
-
-        block_ids = obj_def.object_design
+        self.blocks = list(obj_def.object_design)
+        """The indexes of the sprites, that make up the enemy or item, in the sprite sheet."""
 
-        for block_id in block_ids:
-            x = (block_id % 64) * Block.WIDTH
-            y = (block_id // 64) * Block.WIDTH
-
-            self.blocks.append(self.png_data.copy(QRect(x, y, Block.WIDTH, Block.HEIGHT)))
+        self._changed()
 
     def copy(self):
-        return EnemyItem(self.to_bytes(), self.png_data, self.palette_group)
+        return EnemyItem(self.to_bytes(), self.palette_group)
 
     def render(self):
         # nothing to re-render since enemies are just copied over
@@ -104,32 +126,55 @@ class EnemyItem(InLevelObject):
         :param bool use_offsets: Whether to use the additional offsets. Necessary when drawing in level, but not when
             rendering in the object toolbar, or in the object dropdown.
         """
-        for i, image in enumerate(self.blocks):
-            x = self.x_position + (i % self.width)
-            y = self.y_position + (i // self.width)
+        if use_offsets:
+            x_offset = enemy_handle_x[self.obj_index]
+            y_offset = enemy_handle_y[self.obj_index]
+        else:
+            x_offset = enemy_handle_x2[self.obj_index]
+            y_offset = 0
+
+        x = self.x_position + x_offset
+        y = self.y_position + y_offset
+
+        painter.drawImage(x * block_length, y * block_length, self._image(block_length))
+
+    def _image(self, block_length: int) -> QImage:
+        """Returns the enemy or item, with transparency and selection applied, scaled to the given block length."""
+        key = EnemyImageKey(self.obj_index, block_length, self.selected)
+
+        if (image := EnemyItem.image_cache.get(key)) is None:
+            image = self._render_image(block_length)
+
+            EnemyItem.image_cache.put(key, image)
 
-            if use_offsets:
-                x_offset = enemy_handle_x[self.obj_index]
-                y_offset = enemy_handle_y[self.obj_index]
-            else:
-                x_offset = enemy_handle_x2[self.obj_index]
-                y_offset = 0
+        return image
+
+    def _render_image(self, block_length: int) -> QImage:
+        image = QImage(QSize(self.width, self.height) * block_length, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(image)
 
-            x += x_offset
-            y += y_offset
+        for i, sprite_index in enumerate(self.blocks):
+            sprite_x = (sprite_index % 64) * Block.WIDTH
+            sprite_y = (sprite_index // 64) * Block.HEIGHT + ENEMY_ITEM_SPRITE_SHEET_OFFSET
 
-            block = image.copy()
+            sprite = ENEMY_ITEM_SPRITE_SHEET.copy(QRect(sprite_x, sprite_y, Block.WIDTH, Block.HEIGHT))
 
-            mask = block.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
-            block.setAlphaChannel(mask)
+            mask = sprite.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
+            sprite.setAlphaChannel(mask)
 
             if self.selected:
-                apply_selection_overlay(block, mask)
+                apply_selection_overlay(sprite, mask)
 
             if block_length != Block.SIDE_LENGTH:
-                block = block.scaled(block_length, block_length)
+                sprite = sprite.scaled(block_length, block_length)
 
-            painter.drawImage(x * block_length, y * block_length, block)
+            painter.drawImage((i % self.width) * block_length, (i // self.width) * block_length, sprite)
+
+        painter.end()
+
+        return image
 
     def get_status_info(self):
         return [("Name", self.name), ("X", self.x_position), ("Y", self.y_position)]
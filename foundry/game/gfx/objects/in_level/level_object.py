@@ -1,3 +1,4 @@
+from typing import Optional
 from warnings import warn
 
 from PySide6.QtCore import QRect, QSize
@@ -11,11 +12,14 @@ from foundry.game.gfx.objects.in_level.in_level_object import InLevelObject
 from foundry.game.gfx.objects.in_level.object_renderer import (
     LevelObjectRenderWarning,
     ObjectRenderer,
+    RenderInputs,
+    render_is_up_to_date,
 )
 from foundry.game.gfx.Palette import PaletteGroup, bg_color_for_object_set
 from foundry.game.ObjectDefinitions import EndType, GeneratorType
 from foundry.game.ObjectSet import ObjectSet
 from smb3parse.levels import LEVEL_SCREEN_HEIGHT, LEVEL_SCREEN_WIDTH
+from smb3parse.objects.level_object import object_definition_index
 
 ENDING_STR = {
     EndType.UNIFORM: "Uniform",
@@ -71,6 +75,9 @@ class LevelObject(InLevelObject):
 
         self.rendered_blocks: list[int] = []
 
+        self.render_inputs: Optional[RenderInputs] = None
+        """What the last rendering depended on. Repeating it is skipped, as long as none of that changed."""
+
         self.is_fixed = False
 
         self.palette_group = palette_group
@@ -151,6 +158,8 @@ class LevelObject(InLevelObject):
 
         self._render()
 
+        self._changed()
+
     @property
     def obj_index(self):
         return self._obj_index
@@ -161,12 +170,17 @@ class LevelObject(InLevelObject):
 
         self.is_fixed = self.obj_index <= 0x0F
 
-        domain_offset = self.domain * 0x1F
+        self.type = object_definition_index(self.domain, self.obj_index)
 
-        if self.is_fixed:
-            self.type = self.obj_index + domain_offset
-        else:
-            self.type = (self.obj_index >> 4) + domain_offset + 16 - 1
+    @property
+    def rect(self) -> QRect:
+        return self._rect
+
+    @rect.setter
+    def rect(self, value: QRect):
+        self._rect = value
+
+        self._geometry_changed()
 
     @property
     def object_info(self):
@@ -207,8 +221,18 @@ class LevelObject(InLevelObject):
             self.length = self.data[3]
 
     def render(self):
+        if render_is_up_to_date(self):
+            return
+
         self._render()
 
+    def set_graphics(self, graphics_set: GraphicsSet, palette_group: PaletteGroup):
+        """Changes the graphics and colors the object is drawn with. Which blocks it is made of stays the same."""
+        self.graphics_set = graphics_set
+        self.palette_group = palette_group
+
+        self.block_cache.clear()
+
     def _render(self):
         try:
             ObjectRenderer(self).render()
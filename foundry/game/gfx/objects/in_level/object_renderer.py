@@ -1,10 +1,12 @@
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
 from warnings import warn
 
 from PySide6.QtCore import QRect
 
 from foundry.game import GROUND, SKY
 from foundry.game.File import ROM
+from foundry.game.level.spatial_index import RectTuple, rect_tuple
 from foundry.game.ObjectDefinitions import EndType, GeneratorType
 from smb3parse.levels import LEVEL_SCREEN_HEIGHT, LEVEL_SCREEN_WIDTH
 from smb3parse.objects.object_set import PLAINS_OBJECT_SET
@@ -46,6 +48,66 @@ class LevelObjectRenderWarning(UserWarning):
     pass
 
 
+@dataclass(frozen=True)
+class RenderInputs:
+    """Everything the rendering of a LevelObject depended on, to know when it has to be redone."""
+
+    own_state: tuple
+    dependency_region: Optional[QRect]
+    """The region of the level, in which other objects can change the rendering, like stopping a pyramid early."""
+    dependencies: tuple[tuple[int, RectTuple], ...]
+    """Id and rect of the objects in the dependency region, at the time of rendering."""
+
+
+def _own_render_inputs(level_object: "LevelObject") -> tuple:
+    return (
+        level_object.x_position,
+        level_object.y_position,
+        level_object.domain,
+        level_object.obj_index,
+        level_object.length,
+        level_object.secondary_length,
+        level_object.ground_level,
+        level_object.vertical_level,
+        level_object.index_in_level,
+    )
+
+
+def _dependency_state(objects: list["LevelObject"]) -> tuple[tuple[int, RectTuple], ...]:
+    return tuple((id(obj), rect_tuple(obj.get_rect())) for obj in objects)
+
+
+def render_is_up_to_date(level_object: "LevelObject") -> bool:
+    """
+    Whether rendering the object again would give the same result, because neither the object itself, nor the objects
+    it depended on, changed since it was last rendered.
+
+    Objects, that are not part of a level, are always rendered again.
+    """
+    render_inputs = level_object.render_inputs
+    spatial_index = level_object.spatial_index
+
+    if render_inputs is None or spatial_index is None:
+        return False
+
+    spatial_index.sync(level_object.objects_ref)
+
+    position_in_level = spatial_index.position_of(level_object)
+
+    if position_in_level is None or position_in_level != level_object.index_in_level:
+        return False
+
+    if render_inputs.own_state != _own_render_inputs(level_object):
+        return False
+
+    if render_inputs.dependency_region is None:
+        return True
+
+    objects_in_region = spatial_index.objects_in(render_inputs.dependency_region, end=position_in_level)
+
+    return render_inputs.dependencies == _dependency_state(objects_in_region)
+
+
 class ObjectRenderer:
     def __init__(self, level_object: "LevelObject"):
         self._object = level_object
@@ -65,9 +127,13 @@ class ObjectRenderer:
         self._object.rendered_base_x = self.base_x
         self._object.rendered_base_y = self.base_y
 
-        # if the object has not been added yet, stick with the one given in the constructor
-        if self._object in self._object.objects_ref:
-            self._object.index_in_level = self._object.objects_ref.index(self._object)
+        position_in_level = self._position_in_level()
+
+        if position_in_level is not None:
+            self._object.index_in_level = position_in_level
+
+        self._dependency_region: Optional[QRect] = None
+        self._dependencies: list["LevelObject"] = []
 
         blocks_to_draw: list[int] = []
 
@@ -155,6 +221,54 @@ class ObjectRenderer:
             self._object.rendered_height,
         )
 
+        self._object.render_inputs = RenderInputs(
+            _own_render_inputs(self._object),
+            self._dependency_region,
+            _dependency_state(self._dependencies),
+        )
+
+    def _position_in_level(self) -> Optional[int]:
+        spatial_index = self._object.spatial_index
+
+        if spatial_index is not None:
+            spatial_index.sync(self._object.objects_ref)
+
+            return spatial_index.position_of(self._object)
+
+        # if the object has not been added yet, stick with the one given in the constructor
+        for position, obj in enumerate(self._object.objects_ref):
+            if obj is self._object:
+                return position
+
+        return None
+
+    def _objects_before_in(self, region: QRect) -> list["LevelObject"]:
+        """
+        Returns the objects, that come before the rendered object in the level and could overlap the region. The result
+        is remembered, so that the rendering is redone, once the objects in that region change.
+        """
+        # grow the region by a block in every direction, to also catch objects, that only intersect with the empty rects
+        # used when rendering, since Qt counts those as intersecting their neighbouring blocks
+        region = region.adjusted(-1, -1, 1, 1)
+
+        spatial_index = self._object.spatial_index
+
+        if region.isEmpty():
+            objects_before = []
+        elif spatial_index is None:
+            objects_before = [
+                obj
+                for obj in self._object.objects_ref[0 : self._object.index_in_level]
+                if region.intersects(obj.get_rect())
+            ]
+        else:
+            objects_before = spatial_index.objects_in(region, end=self._object.index_in_level)
+
+        self._dependency_region = region
+        self._dependencies = objects_before
+
+        return objects_before
+
     def _render_horizontal(self, blocks_to_draw):
         self._new_width = self._object.length + 1
         downwards_extending_vine = 1, 0, 0x06
@@ -290,16 +404,14 @@ class ObjectRenderer:
         self._new_width *= self._object.width
 
     def _sub_render_horizontal_to_ground(self):
+        way_to_ground = QRect(self.base_x, self.base_y, self._new_width, self._object.ground_level - self.base_y)
+        objects_in_the_way = self._objects_before_in(way_to_ground)
+
         # to the ground only, until it hits something
         for y in range(self.base_y, self._object.ground_level):
             bottom_row = QRect(self.base_x, y, self._new_width, 1)
 
-            if any(
-                [
-                    bottom_row.intersects(obj.get_rect()) and y == obj.get_rect().top()
-                    for obj in self._object.objects_ref[0 : self._object.index_in_level]
-                ]
-            ):
+            if any([bottom_row.intersects(obj.get_rect()) and y == obj.get_rect().top() for obj in objects_in_the_way]):
                 self._new_height = y - self.base_y
                 break
 
@@ -416,7 +528,8 @@ class ObjectRenderer:
         # since pyramids grow horizontally in both directions when extending
         # we need to check for new ground every time it grows
 
-        objects_before = self._object.objects_ref[0 : self._object.index_in_level]
+        max_height = self._object.ground_level - self.base_y
+        objects_before = self._objects_before_in(QRect(self.base_x, self.base_y, 2 * max_height, max_height))
 
         for y in range(self.base_y, self._object.ground_level):
             self._new_height = y - self.base_y
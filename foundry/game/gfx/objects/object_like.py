@@ -1,8 +1,12 @@
 import abc
+from typing import TYPE_CHECKING, Optional
 
 from PySide6.QtCore import QRect
 from PySide6.QtGui import QPainter
 
+if TYPE_CHECKING:
+    from foundry.game.level.spatial_index import SpatialIndex
+
 
 class ObjectLike(abc.ABC):
     # TODO too ambiguous to be part of an API?
@@ -11,6 +15,9 @@ class ObjectLike(abc.ABC):
 
     rect: QRect
 
+    spatial_index: Optional["SpatialIndex"] = None
+    """The index of the level this object is in, which needs to know, when the object changes."""
+
     def __init__(self):
         self.selected = False
         self._name = ""
@@ -35,6 +42,8 @@ class ObjectLike(abc.ABC):
     def x_position(self, value):
         self._x_position = value
 
+        self._geometry_changed()
+
     @property
     def y_position(self):
         return self._y_position
@@ -43,6 +52,17 @@ class ObjectLike(abc.ABC):
     def y_position(self, value):
         self._y_position = value
 
+        self._geometry_changed()
+
+    def _geometry_changed(self):
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
+    def _changed(self):
+        """Tells the index of the level, that the object looks different now, even if its rect stayed the same."""
+        if self.spatial_index is not None:
+            self.spatial_index.changed(self)
+
     @property
     def type(self):
         return self._type
@@ -0,0 +1,39 @@
+from PySide6.QtGui import QImage, QPainter, Qt
+
+from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.objects import EnemyItem, EnemyItemFactory
+from smb3parse.objects.object_set import PLAINS_OBJECT_SET
+
+GOOMBA = 0x72
+
+
+def _draw(enemy_item: EnemyItem, block_length: int) -> QImage:
+    image = QImage(4 * block_length, 4 * block_length, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(image)
+    enemy_item.draw(painter, block_length, True, use_offsets=False)
+    painter.end()
+
+    return image
+
+
+def test_enemy_images_are_shared(rom):
+    EnemyItem.image_cache.clear()
+
+    factory = EnemyItemFactory(PLAINS_OBJECT_SET)
+
+    first_goomba = factory.from_properties(GOOMBA)
+    second_goomba = factory.from_properties(GOOMBA)
+
+    assert _draw(first_goomba, Block.SIDE_LENGTH) == _draw(second_goomba, Block.SIDE_LENGTH)
+    assert len(EnemyItem.image_cache) == 1
+
+    second_goomba.selected = True
+
+    assert _draw(first_goomba, Block.SIDE_LENGTH) != _draw(second_goomba, Block.SIDE_LENGTH)
+    assert len(EnemyItem.image_cache) == 2
+
+    _draw(first_goomba, 2 * Block.SIDE_LENGTH)
+
+    assert EnemyItem.image_cache.stats("block_length")[2 * Block.SIDE_LENGTH].images == 1
@@ -33,8 +33,6 @@ class MapTile(MapObject):
     def draw(self, dc, block_length, _=None, anim_frame=0):
         self.block.graphics_set.anim_frame = anim_frame
 
-        self.block.rerender()
-
         self.block.draw(
             dc,
             self.x_position * block_length,
@@ -1,4 +1,4 @@
-from typing import Optional, cast
+from typing import Optional, TypeAlias, cast
 
 from PySide6.QtCore import QObject, QPoint, QRect, QSize, Signal, SignalInstance
 
@@ -20,12 +20,14 @@ from foundry.game.level import (
     _load_level_offsets,
 )
 from foundry.game.level.LevelLike import LevelLike
+from foundry.game.level.spatial_index import SpatialIndex, VersionedList
 from foundry.game.ObjectSet import ObjectSet
 from foundry.gui.asm import bytes_to_asm
 from smb3parse import OFFSET_BY_OBJECT_SET_A000
 from smb3parse.constants import BASE_OFFSET, ENEMY_SIZE, OFFSET_SIZE
 from smb3parse.data_points import Position
 from smb3parse.levels import ENEMY_BASE_OFFSET, HEADER_LENGTH
+from smb3parse.levels.level_data import iter_enemy_records, iter_object_records
 from smb3parse.levels.level_header import LevelHeader
 
 TIME_INF = -1
@@ -33,6 +35,8 @@ TIME_INF = -1
 LEVEL_DEFAULT_HEIGHT = 27
 LEVEL_DEFAULT_WIDTH = 16
 
+ByteData: TypeAlias = bytearray | memoryview
+
 
 def world_and_level_for_level_address(level_address: int):
     for level in Level.offsets[1:]:
@@ -77,12 +81,15 @@ class Level(LevelLike):
         self.object_offset = self.header_offset + HEADER_LENGTH
         self.enemy_offset = enemy_data_offset
 
-        self.objects: list[LevelObject] = []
+        self._objects: VersionedList[LevelObject] = VersionedList()
         self.header_bytes: bytearray = bytearray()
         self.jumps: list[Jump] = []
-        self.enemies: list[EnemyItem] = []
+        self._enemies: VersionedList[EnemyItem] = VersionedList()
         self.first_enemy_byte = 0x00
 
+        self._object_index: SpatialIndex[LevelObject] = SpatialIndex()
+        self._enemy_index: SpatialIndex[EnemyItem] = SpatialIndex()
+
         if self.layout_address == self.enemy_offset == 0:
             # probably loaded to become an m3l
             self.size = (0, 0)
@@ -97,16 +104,17 @@ class Level(LevelLike):
         self.header_bytes = rom.read(self.header_offset, HEADER_LENGTH)
         self._parse_header()
 
-        object_data = ROM.rom_data[self.object_offset :]
+        object_data = rom.view(self.object_offset)
 
         if self.enemy_offset == 0x0:
-            enemy_data = bytearray()
+            enemy_data = memoryview(b"")
         else:
-            enemy_data = ROM.rom_data[self.enemy_offset :]
+            enemy_data = rom.view(self.enemy_offset)
 
-        self._load_level_data(object_data, enemy_data)
+        with object_data, enemy_data:
+            self._load_level_data(object_data, enemy_data)
 
-    def _load_level_data(self, object_data: bytearray, enemy_data: bytearray, new_level: bool = True):
+    def _load_level_data(self, object_data: ByteData, enemy_data: ByteData, new_level: bool = True):
         self._load_objects(object_data)
         self._load_enemies(enemy_data)
 
@@ -154,6 +162,23 @@ class Level(LevelLike):
     def level_changed(self):
         return self._signal_emitter.level_changed
 
+    @property
+    def objects(self) -> VersionedList[LevelObject]:
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects: list[LevelObject]):
+        # replaced in place, since the level objects keep a reference to the list
+        self._objects[:] = objects
+
+    @property
+    def enemies(self) -> VersionedList[EnemyItem]:
+        return self._enemies
+
+    @enemies.setter
+    def enemies(self, enemies: list[EnemyItem]):
+        self._enemies[:] = enemies
+
     def reload(self):
         (_, header_and_object_data), (_, enemy_data) = self.to_bytes()
 
@@ -199,58 +224,54 @@ class Level(LevelLike):
         if should_emit:
             self.data_changed.emit()
 
-    def _load_enemies(self, data: bytearray):
-        if not data:
-            return
+    def _apply_graphics_of_header(self):
+        """
+        Hands the graphics set and palettes of a changed header to the objects and enemies already in the level. This
+        only changes how their blocks look, not which blocks they are made of, so they don't have to be loaded again.
+        """
+        self._parse_header(should_emit=False)
 
-        self.enemies.clear()
+        assert self.object_factory is not None and self.object_factory.graphics_set is not None
 
-        def data_left(_data: bytearray):
-            # the commented out code seems to hold for the stock ROM, but if the ROM was already edited with another
-            # editor, it might not, since they only wrote the 0xFF to end the enemy data
+        for level_object in self.objects:
+            level_object.set_graphics(self.object_factory.graphics_set, self.object_factory.palette_group)
 
-            return _data and not _data[0] == 0xFF  # and _data[1] in [0x00, 0x01]
+        for enemy in self.enemies:
+            enemy.palette_group = self.enemy_item_factory.palette_group
 
-        self.first_enemy_byte = data[0]
-        data = data[1:]
+        self.data_changed.emit()
 
-        enemy_data, data = data[0:ENEMY_SIZE], data[ENEMY_SIZE:]
+    def _load_enemies(self, data: ByteData):
+        if not data:
+            return
 
-        while data_left(enemy_data):
-            enemy = self.enemy_item_factory.from_data(enemy_data, 0)
+        self.enemies.clear()
 
-            self.enemies.append(enemy)
+        self.first_enemy_byte = data[0]
 
-            enemy_data, data = data[0:ENEMY_SIZE], data[ENEMY_SIZE:]
+        for enemy_data in iter_enemy_records(memoryview(data)[1:]):
+            self.enemies.append(self.enemy_item_factory.from_data(bytearray(enemy_data), 0))
 
-    def _load_objects(self, data: bytearray):
+    def _load_objects(self, data: ByteData):
         if self.object_factory is None:
             return
 
         self.objects.clear()
         self.jumps.clear()
 
-        if not data or data[0] == 0xFF:
-            return
-
-        while True:
-            potential_obj_data = data[0:4]
-
-            level_object = self.object_factory.from_data(potential_obj_data, len(self.objects))
+        object_set = ObjectSet.from_number(self.object_factory.object_set)
 
-            data = data[3:]
+        def is_4byte(definition_index: int) -> bool:
+            return object_set.get_definition_of(definition_index).is_4byte
 
-            if level_object.is_4byte:
-                data.pop(0)
+        for object_data in iter_object_records(data, is_4byte):
+            level_object = self.object_factory.from_data(bytearray(object_data), len(self.objects))
 
             if isinstance(level_object, LevelObject):
                 self.objects.append(level_object)
             elif isinstance(level_object, Jump):
                 self.jumps.append(level_object)
 
-            if data[0] == 0xFF:
-                break
-
     def _update_level_size(self):
         self.object_size_on_disk = self.current_object_size()
         self.enemy_size_on_disk = self.current_enemies_size()
@@ -381,7 +402,7 @@ class Level(LevelLike):
         self.header_bytes[5] &= 0b1110_0111
         self.header_bytes[5] |= index << 3
 
-        self._parse_header()
+        self._apply_graphics_of_header()
 
     @property
     def object_palette_index(self):
@@ -395,9 +416,7 @@ class Level(LevelLike):
         self.header_bytes[5] &= 0b1111_1000
         self.header_bytes[5] |= index
 
-        self._parse_header()
-
-        self.reload()
+        self._apply_graphics_of_header()
 
     @property
     def pipe_ends_level(self):
@@ -481,9 +500,7 @@ class Level(LevelLike):
         self.header_bytes[7] &= 0b1110_0000
         self.header_bytes[7] |= index
 
-        self._parse_header()
-
-        self.reload()
+        self._apply_graphics_of_header()
 
     @property
     def time_index(self):
@@ -527,13 +544,42 @@ class Level(LevelLike):
     def get_all_objects(self) -> list[InLevelObject]:
         return cast("list[InLevelObject]", self.objects) + cast("list[InLevelObject]", self.enemies)
 
+    def _sync_spatial_indexes(self):
+        # the object lists are changed in a lot of places, so pick up those changes before using the indexes
+        self._object_index.sync(self.objects)
+        self._enemy_index.sync(self.enemies)
+
+    def change_counts(self) -> tuple[int, int]:
+        """
+        Returns two counters, that go up with every change to the level objects and to the enemies respectively, like
+        moving, resizing, adding or reordering them. Comparing them is a cheap way to tell, whether anything changed.
+        Selecting objects doesn't count as a change.
+        """
+        self._sync_spatial_indexes()
+
+        return self._object_index.version, self._enemy_index.version
+
     def object_at(self, x: int, y: int) -> Optional[InLevelObject]:
-        for obj in reversed(self.get_all_objects()):
-            if obj.point_in(x, y):
-                return obj
+        self._sync_spatial_indexes()
+
+        # enemies are drawn on top of the level objects
+        for index in (self._enemy_index, self._object_index):
+            objects_at_point = index.objects_at(x, y)
+
+            if objects_at_point:
+                return objects_at_point[-1]
         else:
             return None
 
+    def get_objects_in(self, rect: QRect) -> list[InLevelObject]:
+        """Returns all objects and enemies, that overlap the given rect in block coordinates, back to front."""
+        self._sync_spatial_indexes()
+
+        objects = cast("list[InLevelObject]", self._object_index.objects_in(rect))
+        enemies = cast("list[InLevelObject]", self._enemy_index.objects_in(rect))
+
+        return objects + enemies
+
     def bring_to_foreground(self, objects: list[InLevelObject]):
         for obj in objects:
             intersecting_objects = self.get_intersecting_objects(obj)
@@ -589,18 +635,16 @@ class Level(LevelLike):
         :param obj: The object to check overlaps for.
         :return:
         """
+        self._sync_spatial_indexes()
+
         if isinstance(obj, LevelObject):
-            objects_to_check = cast("list[InLevelObject]", self.objects)
+            index = cast("SpatialIndex[InLevelObject]", self._object_index)
         elif isinstance(obj, EnemyItem):
-            objects_to_check = cast("list[InLevelObject]", self.enemies)
+            index = cast("SpatialIndex[InLevelObject]", self._enemy_index)
         else:
             raise TypeError()
 
-        intersecting_objects: list[InLevelObject] = [
-            other_object for other_object in objects_to_check if obj.get_rect().intersects(other_object.get_rect())
-        ]
-
-        return intersecting_objects
+        return index.objects_in(obj.get_rect())
 
     def draw(self, *_):
         pass
@@ -796,7 +840,7 @@ class Level(LevelLike):
 
     def save_to_rom(self) -> None:
         if ROM().additional_data.managed_level_positions:
-            lo = LevelOrganizer(ROM(), ROM().additional_data.found_levels)
+            lo = LevelOrganizer(ROM(), ROM().additional_data.found_levels, additional_data=ROM().additional_data)
             lo.update_level_info(self)
 
         self._write_to_rom()
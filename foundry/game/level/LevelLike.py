@@ -1,5 +1,7 @@
 import abc
 
+from PySide6.QtCore import QRect
+
 from foundry.game.ObjectSet import ObjectSet
 from smb3parse.levels import LevelBase
 
@@ -23,6 +25,10 @@ class LevelLike(LevelBase, abc.ABC):
     def get_all_objects(self):
         pass
 
+    def get_objects_in(self, rect: QRect) -> list:
+        """Returns all objects, that overlap the given rect in block coordinates, back to front."""
+        return [obj for obj in self.get_all_objects() if rect.intersects(obj.get_rect())]
+
     @abc.abstractmethod
     def draw(self, dc, block_length, transparency, show_expansion):
         pass
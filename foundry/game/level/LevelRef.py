@@ -75,8 +75,10 @@ class LevelRef(QObject):
         if self._internal_level is None:
             return
 
+        selected_ids = set(map(id, selected_objects))
+
         for obj in self._internal_level.get_all_objects():
-            obj.selected = obj in selected_objects
+            obj.selected = id(obj) in selected_ids
 
         self.data_changed.emit()
 
@@ -0,0 +1,212 @@
+from collections import defaultdict
+from functools import wraps
+from itertools import product
+from operator import is_
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, Optional, TypeVar
+
+from PySide6.QtCore import QRect
+
+if TYPE_CHECKING:
+    # the objects import their renderer, which uses this module
+    from foundry.game.gfx.objects.object_like import ObjectLike
+
+CELL_SIZE = 16
+"""Width and height of a grid cell in blocks. One screen of a horizontal level is 16 blocks wide."""
+
+Cell = tuple[int, int]
+RectTuple = tuple[int, int, int, int]
+
+T = TypeVar("T", bound="ObjectLike")
+E = TypeVar("E")
+
+
+def _changes_list(method: Callable) -> Any:
+    @wraps(method)
+    def changing_method(self: "VersionedList", *args, **kwargs):
+        self.version += 1
+
+        return method(self, *args, **kwargs)
+
+    return changing_method
+
+
+class VersionedList(list[E]):
+    """
+    A list, that counts how often it was changed. This lets a SpatialIndex tell, whether it is still in sync with the
+    list, without comparing every object in it.
+    """
+
+    def __init__(self, iterable: Iterable[E] = ()):
+        super(VersionedList, self).__init__(iterable)
+
+        self.version = 0
+
+    append = _changes_list(list.append)
+    extend = _changes_list(list.extend)
+    insert = _changes_list(list.insert)
+    remove = _changes_list(list.remove)
+    pop = _changes_list(list.pop)
+    clear = _changes_list(list.clear)
+    sort = _changes_list(list.sort)
+    reverse = _changes_list(list.reverse)
+    __setitem__ = _changes_list(list.__setitem__)
+    __delitem__ = _changes_list(list.__delitem__)
+    __iadd__ = _changes_list(list.__iadd__)
+    __imul__ = _changes_list(list.__imul__)
+
+
+def rect_tuple(rect: QRect) -> RectTuple:
+    return rect.left(), rect.top(), rect.width(), rect.height()
+
+
+def _cells_of(rect: QRect) -> list[Cell]:
+    if rect.isNull():
+        return []
+
+    # rects with a width or height of 0 still intersect their neighbours according to Qt, so cover them as well
+    left, right = sorted((rect.left(), rect.right()))
+    top, bottom = sorted((rect.top(), rect.bottom()))
+
+    return list(
+        product(
+            range(left // CELL_SIZE, right // CELL_SIZE + 1),
+            range(top // CELL_SIZE, bottom // CELL_SIZE + 1),
+        )
+    )
+
+
+class SpatialIndex(Generic[T]):
+    """
+    Sorts the objects of a list into the cells of a grid, based on their rects in block coordinates. Finding the
+    objects at a point, or inside a rect, then only needs to look at the objects in the cells touching it, instead of
+    every object in the list.
+
+    Objects report changes to their rect through update and other changes through changed. Objects being added to,
+    removed from or reordered in the list are picked up by sync, which has to be called with the list before querying
+    the index.
+    """
+
+    def __init__(self):
+        self._objects: list[T] = []
+        self._synced_list: Optional[list[T]] = None
+        self._synced_version: Optional[int] = None
+
+        self.version = 0
+        """
+        Goes up with every change to the indexed objects, or to which objects are in the list and in what order. This
+        lets drawing code tell, whether anything changed, without looking at every object.
+        """
+
+        self._order: dict[int, int] = {}
+        """The position of every object in the list, by id of the object."""
+
+        self._cells: dict[Cell, set[int]] = defaultdict(set)
+        self._entries: dict[int, tuple[T, RectTuple, list[Cell]]] = {}
+
+    def sync(self, objects: list[T]):
+        """
+        Makes the index mirror the given list. If it is the same VersionedList as last time and wasn't changed since,
+        this costs nothing. Otherwise, if the objects in the list didn't change, it only costs an identity check of
+        every object.
+        """
+        version = getattr(objects, "version", None)
+
+        if objects is self._synced_list and version is not None and version == self._synced_version:
+            return
+
+        self._synced_list = objects
+        self._synced_version = version
+
+        if len(objects) == len(self._objects) and all(map(is_, objects, self._objects)):
+            return
+
+        current_ids = set(map(id, objects))
+
+        for obj_id in [obj_id for obj_id in self._entries if obj_id not in current_ids]:
+            self._remove(obj_id)
+
+        for obj in objects:
+            if id(obj) not in self._entries:
+                self._insert(obj)
+
+        self.version += 1
+
+        self._objects = list(objects)
+        self._order = {id(obj): position for position, obj in enumerate(self._objects)}
+
+    def update(self, obj: T):
+        """Sorts the object into the cells of its current rect, if it is part of the index and its rect changed."""
+        entry = self._entries.get(id(obj))
+
+        if entry is None:
+            return
+
+        _, indexed_rect, _ = entry
+
+        if rect_tuple(obj.get_rect()) == indexed_rect:
+            return
+
+        self.version += 1
+
+        self._remove(id(obj))
+        self._insert(obj)
+
+    def changed(self, obj: T):
+        """Counts a change to the object, that doesn't have to move it, like a new type, and updates its rect."""
+        if id(obj) not in self._entries:
+            return
+
+        self.version += 1
+
+        self.update(obj)
+
+    def position_of(self, obj: T) -> Optional[int]:
+        """Returns the position of the object in the list, as of the last sync, or None if it is not part of it."""
+        return self._order.get(id(obj))
+
+    def objects_in(self, rect: QRect, end: Optional[int] = None) -> list[T]:
+        """
+        Returns all objects intersecting the given rect, in the order they have in the list.
+
+        :param rect: The rect to check in block coordinates.
+        :param end: If given, only objects before this position in the list are returned.
+        """
+        return self._sorted_hits(
+            {obj_id for cell in _cells_of(rect) for obj_id in self._cells.get(cell, ())},
+            lambda obj: rect.intersects(obj.get_rect()),
+            end,
+        )
+
+    def objects_at(self, x: int, y: int) -> list[T]:
+        """Returns all objects containing the given point, in the order they have in the list."""
+        candidate_ids = self._cells.get((x // CELL_SIZE, y // CELL_SIZE), set())
+
+        return self._sorted_hits(candidate_ids, lambda obj: obj.point_in(x, y), None)
+
+    def _sorted_hits(self, candidate_ids, hit_test, end: Optional[int]) -> list[T]:
+        if end is None:
+            end = len(self._objects)
+
+        positions = sorted(self._order[obj_id] for obj_id in candidate_ids if self._order[obj_id] < end)
+
+        return [self._objects[position] for position in positions if hit_test(self._objects[position])]
+
+    def _insert(self, obj: T):
+        rect = obj.get_rect()
+        cells = _cells_of(rect)
+
+        for cell in cells:
+            self._cells[cell].add(id(obj))
+
+        self._entries[id(obj)] = obj, rect_tuple(rect), cells
+
+        obj.spatial_index = self
+
+    def _remove(self, obj_id: int):
+        obj, _, cells = self._entries.pop(obj_id)
+
+        for cell in cells:
+            self._cells[cell].discard(obj_id)
+
+        if obj.spatial_index is self:
+            obj.spatial_index = None
@@ -1,9 +1,12 @@
+from itertools import product
+
 import pytest
-from PySide6.QtCore import QPoint
+from PySide6.QtCore import QPoint, QRect
 
 from foundry.game.gfx.objects import EnemyItem, Jump, LevelObject
 from foundry.game.level.Level import LEVEL_DEFAULT_HEIGHT
 from foundry.gui.asm import asm_to_bytes
+from foundry.gui.visualization.level.offscreen import render_level
 from smb3parse.data_points import Position
 
 
@@ -108,3 +111,86 @@ def test_to_asm(level):
 
     assert level_bytes + bytearray([0xFF]) == asm_to_bytes(level_asm)
     assert enemy_bytes == asm_to_bytes(enemy_asm)
+
+
+def _linear_object_at(level, x, y):
+    for obj in reversed(level.get_all_objects()):
+        if obj.point_in(x, y):
+            return obj
+
+    return None
+
+
+def test_object_at_after_changes(level):
+    # GIVEN a level, where an object was moved, an enemy removed and another object added
+    level.objects[3].move_by(5, -2)
+    level.objects[3].render()
+
+    level.remove_object(level.enemies[0])
+
+    level.add_object(0, 0x10, Position.from_xy(20, 10), None)
+
+    # WHEN querying the objects at every position of the level
+    # THEN the result is the same, as checking every object one by one
+    for x, y in product(range(level.width), range(level.height)):
+        assert level.object_at(x, y) is _linear_object_at(level, x, y)
+
+
+def test_get_objects_in(level):
+    # GIVEN a level and a rect spanning multiple screens
+    rect = QRect(10, 5, 40, 12)
+
+    # WHEN getting the objects in the rect
+    objects_in_rect = level.get_objects_in(rect)
+
+    # THEN all objects overlapping the rect are returned in the order they are drawn in
+    assert objects_in_rect == [obj for obj in level.get_all_objects() if rect.intersects(obj.get_rect())]
+
+
+def _render_results(level):
+    return [(obj.rendered_blocks, obj.get_rect()) for obj in level.objects]
+
+
+def test_render_cache_matches_full_render(level):
+    # GIVEN a level, that was rendered once, and an object moved afterwards
+    for obj in level.objects:
+        obj.render()
+
+    level.objects[0].x_position += 3
+
+    # WHEN rendering the level with the render cache and without it
+    for obj in level.objects:
+        obj.render()
+
+    cached_results = _render_results(level)
+
+    for obj in level.objects:
+        obj._render()
+
+    # THEN the results are the same
+    assert cached_results == _render_results(level)
+
+
+def test_graphics_change_keeps_objects(level):
+    # GIVEN a level and the objects and enemies in it
+    objects = level.objects.copy()
+    enemies = level.enemies.copy()
+
+    # WHEN changing the graphics set and palettes in the header
+    level.graphic_set += 1
+    level.object_palette_index = (level.object_palette_index + 1) % 8
+    level.enemy_palette_index = (level.enemy_palette_index + 1) % 4
+
+    # THEN the same objects are drawn with the new graphics and palettes
+    assert all(new is old for new, old in zip(level.objects, objects, strict=True))
+    assert all(new is old for new, old in zip(level.enemies, enemies, strict=True))
+
+    assert all(obj.graphics_set is level.object_factory.graphics_set for obj in level.objects)
+    assert all(obj.palette_group is level.object_factory.palette_group for obj in level.objects)
+
+    # AND the level looks the same, as if it was loaded again
+    image = render_level(level)
+
+    level.reload()
+
+    assert image == render_level(level)
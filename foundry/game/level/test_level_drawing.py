@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 from PySide6.QtCore import QPoint, QRect, QSize
+from PySide6.QtGui import QImage
 
 from foundry import data_dir
 from foundry.conftest import compare_images
@@ -11,6 +12,7 @@ from foundry.game.level.LevelRef import LevelRef
 from foundry.gui.ContextMenu import LevelContextMenu
 from foundry.gui.settings import Settings
 from foundry.gui.visualization.level.LevelView import LevelView
+from foundry.gui.visualization.level.offscreen import render_level
 from foundry.gui.visualization.MainView import MainView
 from foundry.gui.visualization.world.WorldView import WorldView
 from scribe.gui.world_view_context_menu import WorldContextMenu
@@ -118,7 +120,7 @@ def test_world(world_info, settings, rom, qtbot):
 
     level_ref.load_level(*world_info[:-1])
 
-    Block._block_cache.clear()
+    Block.image_cache.clear()
 
     # monkeypatch level names, since the level name data is broken atm
     level_ref.level.name = current_test_name()
@@ -142,7 +144,7 @@ def test_level(level_info, settings, rom, qtbot):
     level_ref = LevelRef()
     level_ref.load_level(*level_info)
 
-    Block._block_cache.clear()
+    Block.image_cache.clear()
 
     # monkeypatch level names, since the level name data is broken atm
     level_ref.level.name = current_test_name()
@@ -205,3 +207,32 @@ def test_draw_m3ls(m3l_file_name, level, settings, qtbot):
             str(reference_image_dir / f"{m3l_file_name.stem}.png"),
             level_view.grab(),
         )
+
+
+def test_draw_exposed_rect_only(level, settings, qtbot):
+    ref = LevelRef()
+    ref._internal_level = level
+
+    level_view = LevelView(None, ref, settings, LevelContextMenu(ref))
+    level_view.resize(level_view.sizeHint())
+
+    qtbot.addWidget(level_view)
+
+    # not aligned to the block grid on purpose
+    exposed_rect = QRect(QPoint(20 * Block.WIDTH + 3, 5), QSize(7 * Block.WIDTH, 10 * Block.HEIGHT + 7))
+
+    assert level_view.grab(exposed_rect).toImage() == level_view.grab().copy(exposed_rect).toImage()
+
+
+def test_render_level_like_level_view(level, settings, qtbot):
+    ref = LevelRef()
+    ref._internal_level = level
+
+    level_view = LevelView(None, ref, settings, LevelContextMenu(ref))
+    level_view.resize(level_view.sizeHint())
+
+    qtbot.addWidget(level_view)
+
+    rendered_image = render_level(level, settings=settings).convertToFormat(QImage.Format_RGB32)
+
+    assert rendered_image == level_view.grab().toImage().convertToFormat(QImage.Format_RGB32)
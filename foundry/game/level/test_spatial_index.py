@@ -0,0 +1,64 @@
+from PySide6.QtCore import QRect
+
+from foundry.game.level.spatial_index import SpatialIndex, VersionedList
+
+
+class _Object:
+    def __init__(self, x: int, y: int):
+        self.rect = QRect(x, y, 1, 1)
+        self.spatial_index = None
+
+    def get_rect(self) -> QRect:
+        return self.rect
+
+
+def test_sync_picks_up_changes_to_the_list():
+    first_object, second_object = _Object(0, 0), _Object(40, 0)
+
+    objects = VersionedList([first_object])
+
+    index: SpatialIndex = SpatialIndex()
+    index.sync(objects)
+
+    objects.append(second_object)
+    index.sync(objects)
+
+    assert index.objects_in(QRect(0, 0, 64, 16)) == [first_object, second_object]
+    assert index.position_of(second_object) == 1
+
+
+def test_sync_of_unchanged_list_is_skipped():
+    first_object, second_object = _Object(0, 0), _Object(40, 0)
+
+    objects = VersionedList([first_object])
+
+    index: SpatialIndex = SpatialIndex()
+    index.sync(objects)
+
+    # changing the list without going through it, keeps its version
+    list.append(objects, second_object)
+    index.sync(objects)
+
+    assert index.objects_in(QRect(0, 0, 64, 16)) == [first_object]
+
+
+def test_version_counts_changes_to_the_objects():
+    level_object = _Object(0, 0)
+
+    index: SpatialIndex = SpatialIndex()
+    index.sync(VersionedList([level_object]))
+
+    version = index.version
+
+    index.update(level_object)
+    assert index.version == version
+
+    level_object.rect = QRect(20, 0, 1, 1)
+    index.update(level_object)
+    assert index.version == version + 1
+
+    index.changed(level_object)
+    assert index.version == version + 2
+
+    index.changed(_Object(0, 0))
+    assert index.version == version + 2
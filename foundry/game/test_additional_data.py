@@ -6,7 +6,10 @@ import pytest
 from foundry.game.additional_data import (
     ENEMY_DATA_DELIMITER_COUNT,
     LEVEL_DATA_DELIMITER_COUNT,
+    AdditionalData,
     LevelOrganizer,
+    enemy_bank_space,
+    level_bank_space,
 )
 from foundry.game.level import EMPTY_OBJECT_DATA, EnemyItemAddress, LevelAddress
 from smb3parse import PAGE_A000_ByTileset
@@ -14,6 +17,7 @@ from smb3parse.constants import (
     BASE_OFFSET,
     ENEMY_DATA_BANK_INDEX,
     OFFSET_SIZE,
+    PAGE_A000_OFFSET,
     PLAINS_LEVEL_DATA_BANK_INDEX,
     VANILLA_PRG_BANK_COUNT,
 )
@@ -220,6 +224,83 @@ def test_rearrange_levels_with_larger_data(mock_rom):
         assert mock_rom.read(expected_level_offset, len(level_bytes)) == level_bytes
 
 
+def test_relocate_level_data_in_gap(mock_rom):
+    # GIVEN a LevelOrganizer with a MockROM, where the levels have gaps between them
+    levels = mock_rom.initial_levels()
+    level_organizer = LevelOrganizer(mock_rom, levels)
+
+    # WHEN the first level grows, but still fits in front of the second one
+    level_organizer.relocate_level_data(levels[0], levels[0].object_data_length + 0x40)
+
+    # THEN no level was moved
+    assert [level.level_offset for level in levels] == mock_rom.starting_level_offsets
+    assert not level_organizer.old_level_address_to_new
+
+
+def test_relocate_level_data_moves_only_what_does_not_fit(mock_rom):
+    # GIVEN a LevelOrganizer with a MockROM and a pointer to the second level
+    levels = mock_rom.initial_levels()
+    level_organizer = LevelOrganizer(mock_rom, levels)
+
+    pointer_position = plains_bank_start + 0x10
+    levels[1].level_offset_positions = [pointer_position]
+
+    # WHEN the first level grows past the start of the second one
+    new_size = 200
+    level_organizer.relocate_level_data(levels[0], new_size)
+
+    # THEN only the second level was moved right behind it, since the third one still has room
+    new_second_level_offset = mock_rom.starting_level_offsets[0] + new_size + LEVEL_DATA_DELIMITER_COUNT
+
+    assert [level.level_offset for level in levels] == [
+        mock_rom.starting_level_offsets[0],
+        new_second_level_offset,
+        mock_rom.starting_level_offsets[2],
+    ]
+    assert level_organizer.old_level_address_to_new == {mock_rom.starting_level_offsets[1]: new_second_level_offset}
+
+    assert mock_rom.read(new_second_level_offset, len(mock_rom.level_bytes[1])) == mock_rom.level_bytes[1]
+    assert mock_rom.read(mock_rom.starting_level_offsets[2], len(mock_rom.level_bytes[2])) == mock_rom.level_bytes[2]
+
+    object_set_offset = BASE_OFFSET + PLAINS_LEVEL_DATA_BANK_INDEX * PRG_BANK_SIZE - PAGE_A000_OFFSET
+    assert mock_rom.little_endian(pointer_position) == new_second_level_offset - object_set_offset
+
+    assert level_organizer._found_level_from_address(new_second_level_offset) is levels[1]
+
+
+def test_relocation_updates_cached_free_space(mock_rom):
+    # GIVEN a LevelOrganizer, that keeps the cached free space of the banks up to date
+    levels = mock_rom.initial_levels()
+
+    additional_data = AdditionalData(mock_rom)
+    additional_data.found_levels = levels
+
+    cached_level_bank_space = additional_data.level_bank_space(PLAINS_OBJECT_SET)
+    cached_enemy_bank_space = additional_data.enemy_bank_space()
+
+    level_organizer = LevelOrganizer(mock_rom, levels, additional_data=additional_data)
+
+    # WHEN the first level and its enemy data grow past the start of the second one
+    level_organizer.relocate_level_data(levels[0], 200)
+    level_organizer.relocate_enemy_data(levels[0], 200)
+
+    # THEN the cached free space was resized, instead of being replaced, and matches the moved levels
+    assert additional_data.level_bank_space(PLAINS_OBJECT_SET) is cached_level_bank_space
+    assert additional_data.enemy_bank_space() is cached_enemy_bank_space
+
+    fresh_level_bank_space = level_bank_space(PLAINS_LEVEL_DATA_BANK_INDEX, levels)
+    fresh_enemy_bank_space = enemy_bank_space(levels)
+
+    def free_space(bank_space, addresses):
+        return [bank_space.free_space_after(address) for address in addresses]
+
+    level_addresses = [level.level_offset for level in levels]
+    enemy_addresses = [level.enemy_offset for level in levels]
+
+    assert free_space(cached_level_bank_space, level_addresses) == free_space(fresh_level_bank_space, level_addresses)
+    assert free_space(cached_enemy_bank_space, enemy_addresses) == free_space(fresh_enemy_bank_space, enemy_addresses)
+
+
 def test_separate_levels_by_banks(level_organizer):
     # GIVEN a level organizer and levels of different object sets
     additional_level = _mk_level(0, 0)
@@ -432,6 +513,32 @@ def test_rearrange_enemies_with_larger_data(mock_rom):
         assert mock_rom.read(expected_enemy_offset, len(enemy_bytes)) == enemy_bytes
 
 
+def test_relocate_enemy_data_moves_only_what_does_not_fit(mock_rom):
+    # GIVEN a LevelOrganizer with a MockROM and a pointer to the second enemy data
+    levels = mock_rom.initial_levels()
+    level_organizer = LevelOrganizer(mock_rom, levels)
+
+    pointer_position = plains_bank_start + 0x10
+    levels[1].enemy_offset_positions = [pointer_position]
+
+    # WHEN the first enemy data grows past the start of the second one
+    new_size = 200
+    level_organizer.relocate_enemy_data(levels[0], new_size)
+
+    # THEN only the second enemy data was moved right behind it, since the third one still has room
+    new_second_enemy_offset = mock_rom.starting_enemy_offsets[0] + new_size + ENEMY_DATA_DELIMITER_COUNT
+
+    assert [level.enemy_offset for level in levels] == [
+        mock_rom.starting_enemy_offsets[0],
+        new_second_enemy_offset,
+        mock_rom.starting_enemy_offsets[2],
+    ]
+    assert levels[0].enemy_data_length == new_size
+
+    assert mock_rom.read(new_second_enemy_offset, len(mock_rom.enemy_bytes[1])) == mock_rom.enemy_bytes[1]
+    assert mock_rom.little_endian(pointer_position) == new_second_enemy_offset - BASE_OFFSET
+
+
 def test_sort_levels_by_enemy_address(level_organizer):
     shuffle(level_organizer.levels)
 
@@ -0,0 +1,76 @@
+from foundry.game.edit_journal import (
+    COMPACT_AFTER,
+    EditJournal,
+    JournaledLevel,
+    changed_range,
+    load_journal,
+)
+
+OBJECT_DATA = bytes(range(9)) + bytes([0x00, 0x10, 0x20, 0x01, 0x11, 0x21, 0xFF])
+ENEMY_DATA = bytes([0x01, 0x72, 0x10, 0x10, 0xFF])
+
+
+def test_changed_range():
+    assert changed_range(b"abcdef", b"abcdef") is None
+
+    assert changed_range(b"abcdef", b"abXdef") == (2, 3, b"X")
+    assert changed_range(b"abcdef", b"abcXYZdef") == (3, 3, b"XYZ")
+    assert changed_range(b"abcdef", b"abf") == (2, 5, b"")
+
+    # repeating bytes can't be counted as both, equal in front and in the back
+    assert changed_range(b"aaa", b"aaaa") == (3, 3, b"a")
+
+
+def test_journal_replays_changes(tmp_path):
+    journal_path = tmp_path / "journal"
+    journal = EditJournal(journal_path)
+
+    journal.record(1, (0x1FB92, OBJECT_DATA), (0xC537, ENEMY_DATA))
+
+    changed_object_data = OBJECT_DATA[:-1] + bytes([0x02, 0x12, 0x22, 0xFF])
+    changed_enemy_data = ENEMY_DATA[:-1] + bytes([0x72, 0x20, 0x10, 0xFF])
+
+    journal.record(1, (0x1FB92, changed_object_data), (0xC537, ENEMY_DATA))
+    journal.record(1, (0x1FB92, changed_object_data), (0xC537, changed_enemy_data))
+    journal.close()
+
+    # a snapshot and two small changes
+    assert len(journal_path.read_text().splitlines()) == 3
+
+    assert load_journal(journal_path) == JournaledLevel(1, 0x1FB92, changed_object_data, 0xC537, changed_enemy_data)
+
+
+def test_journal_is_compacted(tmp_path):
+    journal_path = tmp_path / "journal"
+    journal = EditJournal(journal_path)
+
+    object_data = OBJECT_DATA
+
+    for index in range(COMPACT_AFTER + 3):
+        object_data = object_data[:-1] + bytes([0x00, index % 0x100, 0x20, 0xFF])
+
+        journal.record(1, (0x1FB92, object_data), (0xC537, ENEMY_DATA))
+
+    journal.flush()
+
+    # the first snapshot and all the changes were replaced by a new snapshot, after which one more change happened
+    assert len(journal_path.read_text().splitlines()) == 2
+    assert load_journal(journal_path) == JournaledLevel(1, 0x1FB92, object_data, 0xC537, ENEMY_DATA)
+
+    journal.discard()
+    journal.close()
+
+    assert load_journal(journal_path) is None
+
+
+def test_interrupted_change_is_ignored(tmp_path):
+    journal_path = tmp_path / "journal"
+    journal = EditJournal(journal_path)
+
+    journal.record(1, (0x1FB92, OBJECT_DATA), (0xC537, ENEMY_DATA))
+    journal.close()
+
+    with journal_path.open("a") as journal_file:
+        journal_file.write('{"objects": [0, 1, "AA')
+
+    assert load_journal(journal_path) == JournaledLevel(1, 0x1FB92, OBJECT_DATA, 0xC537, ENEMY_DATA)
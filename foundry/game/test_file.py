@@ -3,8 +3,11 @@ import tempfile
 import pytest
 
 from foundry.game.File import ROM
+from smb3parse.objects.object_set import PLAINS_OBJECT_SET
 from smb3parse.util.parser import FoundLevel
 
+LEVEL_1_1_ADDRESS = 0x1FB92
+
 
 # try this test last, because it messes with the singleton ROM
 @pytest.mark.trylast
@@ -26,3 +29,22 @@ def test_load_additional_data_from_rom(rom):
     ROM.path = old_rom_path
 
     assert rom.additional_data
+
+
+def test_tsa_data_is_shared_until_changed(rom):
+    tsa_data = ROM.get_tsa_data(PLAINS_OBJECT_SET)
+
+    assert ROM.get_tsa_data(PLAINS_OBJECT_SET) is tsa_data
+
+    # writing somewhere else keeps the table
+    rom.write(LEVEL_1_1_ADDRESS, rom.int(LEVEL_1_1_ADDRESS) ^ 0xFF)
+
+    assert ROM.get_tsa_data(PLAINS_OBJECT_SET) is tsa_data
+
+    rom.write(rom.tsa_address_for_object_set(PLAINS_OBJECT_SET), tsa_data[0] ^ 0xFF)
+
+    changed_tsa_data = ROM.get_tsa_data(PLAINS_OBJECT_SET)
+
+    assert changed_tsa_data is not tsa_data
+    assert changed_tsa_data[0] == tsa_data[0] ^ 0xFF
+    assert changed_tsa_data[1:] == tsa_data[1:]
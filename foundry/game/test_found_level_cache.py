@@ -0,0 +1,28 @@
+from foundry.game.found_level_cache import load_found_levels, save_found_levels
+from smb3parse.util.parser import FoundLevel
+
+
+def test_found_levels_round_trip(rom, tmp_path):
+    assert load_found_levels(rom, tmp_path) is None
+
+    found_level = FoundLevel([1], [2], 3, 0x1FB92, 0xC537, 1, 7, 8, True, False, False)
+
+    save_found_levels(rom, {found_level.level_offset: found_level}, tmp_path)
+
+    cached_levels = load_found_levels(rom, tmp_path)
+    assert cached_levels is not None
+
+    levels_per_object_set, levels_by_address = cached_levels
+
+    assert levels_per_object_set == {1: [0x1FB92]}
+    assert levels_by_address == {0x1FB92: found_level}
+
+
+def test_changed_rom_is_not_in_cache(rom, tmp_path):
+    found_level = FoundLevel([1], [2], 3, 0x1FB92, 0xC537, 1, 7, 8, True, False, False)
+
+    save_found_levels(rom, {found_level.level_offset: found_level}, tmp_path)
+
+    rom.write(0x1FB92, rom.int(0x1FB92) ^ 0xFF)
+
+    assert load_found_levels(rom, tmp_path) is None
@@ -0,0 +1,70 @@
+import pytest
+
+from foundry.game.free_space import BankSpace, FragmentationReport
+
+
+@pytest.fixture
+def bank_space() -> BankSpace:
+    # blocks at 0x00, 0x10, 0x30 and 0x50 with gaps of 0x8, 0x0, 0x10 and 0x40 behind them
+    return BankSpace({0x00: 0x8, 0x10: 0x20, 0x30: 0x10, 0x50: 0x30}, 0xC0)
+
+
+def test_free_space_after(bank_space):
+    assert bank_space.free_space_after(0x00) == 0x8 + 0x10 + 0x40
+    assert bank_space.free_space_after(0x10) == 0x10 + 0x40
+    assert bank_space.free_space_after(0x30) == 0x10 + 0x40
+    assert bank_space.free_space_after(0x50) == 0x40
+
+    assert bank_space.free_space_at_end() == 0x40
+
+    with pytest.raises(KeyError):
+        bank_space.free_space_after(0x20)
+
+
+def test_find_free(bank_space):
+    assert bank_space.find_free(0x8) == 0x08
+    assert bank_space.find_free(0x9) == 0x40
+    assert bank_space.find_free(0x40) == 0x80
+    assert bank_space.find_free(0x41) is None
+
+
+def test_resize_into_gap(bank_space):
+    assert bank_space.resize(0x00, 0x8 + 0x4) == {}
+
+    assert bank_space.free_space_after(0x00) == 0x4 + 0x10 + 0x40
+
+
+def test_resize_moves_following_blocks(bank_space):
+    # the block at 0x30 has to move, but the gap behind it takes up the rest
+    assert bank_space.resize(0x10, 0x28) == {0x30: 0x38}
+
+    assert 0x30 not in bank_space
+    assert 0x38 in bank_space
+
+    assert bank_space.free_space_after(0x10) == 0x8 + 0x40
+    assert bank_space.find_free(0x9) == 0x80
+
+    # now everything has to move
+    assert bank_space.resize(0x00, 0x20) == {0x10: 0x20, 0x38: 0x48, 0x50: 0x58}
+
+    assert bank_space.free_space_at_end() == 0x38
+
+
+def test_resize_shrinking(bank_space):
+    assert bank_space.resize(0x10, 0x10) == {}
+
+    assert bank_space.find_free(0x10) == 0x20
+
+
+def test_fragmentation(bank_space):
+    assert bank_space.fragmentation() == FragmentationReport(
+        used=0x8 + 0x20 + 0x10 + 0x30, free=0x8 + 0x10 + 0x40, free_blocks=3, largest_free_block=0x40
+    )
+
+
+def test_empty_bank():
+    bank_space = BankSpace({}, 0x100)
+
+    assert bank_space.free_space_at_end() == 0
+    assert bank_space.find_free(1) is None
+    assert bank_space.fragmentation() == FragmentationReport(0, 0, 0, 0)
@@ -0,0 +1,101 @@
+import os
+
+import foundry.game.thumbnail_cache
+from foundry.game.thumbnail_cache import ThumbnailCache, thumbnail_key
+from smb3parse.objects.object_set import PLAINS_OBJECT_SET
+
+LEVEL_1_1 = PLAINS_OBJECT_SET, 0x1FB92, 0xC537
+
+
+def _count_renders(monkeypatch) -> list:
+    rendered_levels = []
+
+    original_get_level_thumbnail = foundry.game.thumbnail_cache.get_level_thumbnail
+
+    def get_level_thumbnail(*level):
+        rendered_levels.append(level)
+
+        return original_get_level_thumbnail(*level)
+
+    monkeypatch.setattr(foundry.game.thumbnail_cache, "get_level_thumbnail", get_level_thumbnail)
+
+    return rendered_levels
+
+
+def test_thumbnail_is_only_rendered_once(rom, tmp_path, monkeypatch, qtbot):
+    rendered_levels = _count_renders(monkeypatch)
+
+    thumbnail = ThumbnailCache(tmp_path).thumbnail(*LEVEL_1_1)
+
+    assert rendered_levels == [LEVEL_1_1]
+
+    # the thumbnail is saved in the background
+    qtbot.waitUntil((tmp_path / f"{thumbnail_key(*LEVEL_1_1)}.png").exists)
+
+    # a new cache, like after a restart, loads the thumbnail from disk
+    assert ThumbnailCache(tmp_path).thumbnail(*LEVEL_1_1) == thumbnail
+    assert rendered_levels == [LEVEL_1_1]
+
+
+def test_changed_level_is_rendered_again(rom, tmp_path, monkeypatch):
+    rendered_levels = _count_renders(monkeypatch)
+
+    thumbnail_cache = ThumbnailCache(tmp_path)
+    thumbnail_cache.thumbnail(*LEVEL_1_1)
+
+    key_before = thumbnail_key(*LEVEL_1_1)
+
+    # move the first enemy of the level
+    enemy_x_address = LEVEL_1_1[2] + 2
+    rom.write(enemy_x_address, rom.int(enemy_x_address) + 1)
+
+    assert thumbnail_key(*LEVEL_1_1) != key_before
+
+    thumbnail_cache.thumbnail(*LEVEL_1_1)
+
+    assert rendered_levels == [LEVEL_1_1, LEVEL_1_1]
+
+
+def test_least_recently_used_thumbnails_are_forgotten(rom, tmp_path, monkeypatch):
+    thumbnail_cache = ThumbnailCache(tmp_path)
+    thumbnail = thumbnail_cache.thumbnail(*LEVEL_1_1)
+
+    # only leave room for one thumbnail in memory
+    monkeypatch.setattr(foundry.game.thumbnail_cache, "THUMBNAIL_MEMORY_BUDGET", len(thumbnail))
+
+    key_before = thumbnail_key(*LEVEL_1_1)
+
+    enemy_x_address = LEVEL_1_1[2] + 2
+    rom.write(enemy_x_address, rom.int(enemy_x_address) + 1)
+
+    thumbnail_cache.thumbnail(*LEVEL_1_1)
+
+    assert list(thumbnail_cache._thumbnails) == [thumbnail_key(*LEVEL_1_1)]
+    assert key_before not in thumbnail_cache._thumbnails
+
+
+def test_pregenerate(rom, tmp_path, monkeypatch, qtbot):
+    rendered_levels = _count_renders(monkeypatch)
+
+    thumbnail_cache = ThumbnailCache(tmp_path)
+    thumbnail_cache.pregenerate([LEVEL_1_1])
+
+    qtbot.waitUntil(lambda: rendered_levels == [LEVEL_1_1])
+
+    thumbnail_cache.thumbnail(*LEVEL_1_1)
+
+    assert rendered_levels == [LEVEL_1_1]
+
+
+def test_least_recently_used_thumbnails_are_removed(rom, tmp_path, monkeypatch, qtbot):
+    old_thumbnail = tmp_path / "old.png"
+    old_thumbnail.write_bytes(bytes(1024 * 1024))
+    os.utime(old_thumbnail, (0, 0))
+
+    monkeypatch.setattr(foundry.game.thumbnail_cache, "THUMBNAIL_CACHE_BUDGET", 1024 * 1024)
+
+    ThumbnailCache(tmp_path).thumbnail(*LEVEL_1_1)
+
+    qtbot.waitUntil(lambda: not old_thumbnail.exists())
+
+    assert (tmp_path / f"{thumbnail_key(*LEVEL_1_1)}.png").exists()
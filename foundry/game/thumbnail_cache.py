@@ -0,0 +1,319 @@
+"""
+Remembers the thumbnails of Levels, that are shown, when hovering over them in the level selector, the World Map or the
+Level viewer. They are kept in memory and on disk, keyed by the data they are drawn from, so that a Level is only drawn
+again, when it actually changed.
+"""
+import base64
+import hashlib
+import logging
+import os
+import queue
+import threading
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from PySide6.QtCore import QBuffer, QIODevice, QObject, QTimer, Signal, SignalInstance
+from PySide6.QtGui import QImage
+
+from foundry import get_level_thumbnail, thumbnails_cache_path
+from foundry.game.File import ROM
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import load_palette_group
+from foundry.game.ObjectSet import ObjectSet
+from smb3parse.levels import HEADER_LENGTH
+from smb3parse.levels.level_data import iter_enemy_records, object_data_size
+from smb3parse.levels.level_header import LevelHeader
+from smb3parse.objects.object_set import MUSHROOM_OBJECT_SET, SPADE_BONUS_OBJECT_SET
+
+THUMBNAIL_CACHE_VERSION = 1
+"""Increase this, whenever the way thumbnails are drawn changes, so that old thumbnails are not used anymore."""
+
+THUMBNAIL_CACHE_BUDGET = 32 * 1024 * 1024
+"""How many bytes the thumbnails on disk may take up, before the least recently used ones are removed."""
+
+THUMBNAIL_MEMORY_BUDGET = 8 * 1024 * 1024
+"""
+How many bytes the thumbnails kept in memory may take up, before the least recently used ones are forgotten. They are
+loaded from disk again, when they are needed.
+"""
+
+LevelAddresses = tuple[int, int, int]
+"""The object set number, layout address and enemy address of a Level."""
+
+
+def thumbnail_key(object_set_number: int, layout_address: int, enemy_address: int) -> str:
+    """
+    Hashes everything, that decides what the thumbnail of a Level looks like. That is the header, object and enemy data
+    of the Level, as well as the palettes, the block definitions and the graphics it is drawn with.
+    """
+    rom = ROM()
+
+    header_bytes = rom.read(layout_address, HEADER_LENGTH)
+    header = LevelHeader(rom, header_bytes, object_set_number)
+
+    object_set = ObjectSet.from_number(object_set_number)
+
+    def is_4byte(definition_index: int) -> bool:
+        return object_set.get_definition_of(definition_index).is_4byte
+
+    content_hash = hashlib.sha256(THUMBNAIL_CACHE_VERSION.to_bytes(4, "little"))
+    content_hash.update(object_set_number.to_bytes(1, "little"))
+    content_hash.update(header_bytes)
+
+    with rom.view(layout_address + HEADER_LENGTH) as object_data:
+        content_hash.update(object_data[: object_data_size(object_data, is_4byte)])
+
+    # these object sets are loaded without any enemies
+    if enemy_address != 0x0 and object_set_number not in (MUSHROOM_OBJECT_SET, SPADE_BONUS_OBJECT_SET):
+        with rom.view(enemy_address) as enemy_data:
+            enemy_data_size = 1 + sum(len(record) for record in iter_enemy_records(enemy_data[1:]))
+
+            content_hash.update(enemy_data[:enemy_data_size])
+
+    for palette_index in (header.object_palette_index, header.enemy_palette_index):
+        for palette in load_palette_group(object_set_number, palette_index).palettes:
+            content_hash.update(palette)
+
+    content_hash.update(ROM.get_tsa_data(object_set_number))
+    content_hash.update(GraphicsSet.from_number(header.graphic_set_index).frame_data(0))
+
+    return content_hash.hexdigest()
+
+
+def _to_png(image: QImage) -> bytes:
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG", quality=100)
+
+    return bytes(buffer.data())
+
+
+class ThumbnailCache(QObject):
+    """
+    Hands out the thumbnails of Levels as base64 encoded PNGs, ready to be put into the tooltips showing them.
+
+    :param cache_dir: Where to save the thumbnails, so that they survive a restart of the editor.
+    """
+
+    _thumbnail_loaded: SignalInstance = Signal(int, str, object, object)
+    """Sent by the worker thread with the generation, key, addresses and PNG data (or None) of a looked up Level."""
+
+    def __init__(self, cache_dir: Path = thumbnails_cache_path):
+        super(ThumbnailCache, self).__init__()
+
+        self.cache_dir = cache_dir
+
+        self._thumbnails: OrderedDict[str, str] = OrderedDict()
+        """The base64 encoded thumbnails by key, from least to most recently used."""
+        self._thumbnails_size = 0
+
+        self._generation = 0
+        """Increased with every call to pregenerate, so that Levels of earlier calls can be dropped."""
+
+        # only used by the GUI thread
+        self._levels_to_look_up: deque[LevelAddresses] = deque()
+        self._levels_to_render: deque[tuple[str, LevelAddresses]] = deque()
+        self._render_timer: Optional[QTimer] = None
+
+        # only used by the worker thread
+        self._disk_tasks: queue.SimpleQueue[Callable[[], object]] = queue.SimpleQueue()
+        self._cache_size: Optional[int] = None
+        self._worker: Optional[threading.Thread] = None
+
+        self._thumbnail_loaded.connect(self._on_thumbnail_loaded)
+
+    def thumbnail(self, object_set_number: int, layout_address: int, enemy_address: int) -> str:
+        """Returns the thumbnail of the Level at the given addresses, drawing it first, if it was not cached yet."""
+        level = object_set_number, layout_address, enemy_address
+
+        key = thumbnail_key(*level)
+
+        if (thumbnail := self._cached_thumbnail(key)) is None:
+            thumbnail = self._render(key, level)
+
+        return thumbnail
+
+    def pregenerate(self, levels: Iterable[LevelAddresses]):
+        """
+        Makes sure, that the thumbnails of the given Levels are cached, so that they are ready, when they are asked for.
+
+        Looking up the Levels reads the ROM and shares caches with the editor, so it happens on the GUI thread, one
+        Level every time the event loop is idle. Only loading the thumbnails from disk happens on a worker thread.
+        Levels without a thumbnail are handed back to the GUI thread to be drawn, the same way.
+
+        Levels of an earlier call, that were not looked at yet, are dropped, since only the current World or Level list
+        can be hovered over.
+        """
+        self._generation += 1
+
+        self._levels_to_look_up = deque(levels)
+        self._levels_to_render.clear()
+
+        self._start_render_timer()
+
+    def _start_render_timer(self):
+        if self._render_timer is None:
+            self._render_timer = QTimer()
+            self._render_timer.timeout.connect(self._work_on_next_level)
+
+        if not self._render_timer.isActive():
+            self._render_timer.start(0)
+
+    def _work_on_next_level(self):
+        assert self._render_timer is not None
+
+        if self._levels_to_render:
+            self._render_next_level()
+        elif self._levels_to_look_up:
+            self._look_up_next_level()
+        else:
+            # the worker restarts the timer, when it finds a Level without a thumbnail
+            self._render_timer.stop()
+
+    def _look_up_next_level(self):
+        level = self._levels_to_look_up.popleft()
+
+        try:
+            key = thumbnail_key(*level)
+        except (ValueError, LookupError):
+            # not actually a Level, hovering over it will not show a thumbnail either
+            return
+
+        if key in self._thumbnails:
+            return
+
+        generation = self._generation
+
+        self._put_disk_task(lambda: self._load_thumbnail(generation, key, level))
+
+    def _render_next_level(self):
+        key, level = self._levels_to_render.popleft()
+
+        try:
+            # the Level might have been edited, since it was looked up
+            if key != thumbnail_key(*level):
+                return
+
+            self._render(key, level)
+        except (ValueError, LookupError):
+            # a broken Level should not keep the others from being drawn, hovering over it shows the error anyway
+            logging.exception("Couldn't draw the thumbnail of the Level at %s", level)
+
+    def _on_thumbnail_loaded(self, generation: int, key: str, level: LevelAddresses, png_data: Optional[bytes]):
+        if png_data is not None:
+            self._remember(key, base64.b64encode(png_data).decode())
+
+        elif generation == self._generation:
+            self._levels_to_render.append((key, level))
+
+            self._start_render_timer()
+
+    def _cached_thumbnail(self, key: str) -> Optional[str]:
+        if key in self._thumbnails:
+            self._thumbnails.move_to_end(key)
+
+            return self._thumbnails[key]
+
+        try:
+            png_data = self._cache_file(key).read_bytes()
+        except OSError:
+            return None
+
+        self._put_disk_task(lambda: self._mark_as_used(key))
+
+        return self._remember(key, base64.b64encode(png_data).decode())
+
+    def _render(self, key: str, level: LevelAddresses) -> str:
+        png_data = _to_png(get_level_thumbnail(*level))
+
+        self._put_disk_task(lambda: self._save_thumbnail(key, png_data))
+
+        return self._remember(key, base64.b64encode(png_data).decode())
+
+    def _remember(self, key: str, thumbnail: str) -> str:
+        """Keeps the thumbnail in memory, forgetting the least recently used ones, if they take up too much space."""
+        if (old_thumbnail := self._thumbnails.pop(key, None)) is not None:
+            self._thumbnails_size -= len(old_thumbnail)
+
+        self._thumbnails[key] = thumbnail
+        self._thumbnails_size += len(thumbnail)
+
+        while self._thumbnails_size > THUMBNAIL_MEMORY_BUDGET and len(self._thumbnails) > 1:
+            _, forgotten_thumbnail = self._thumbnails.popitem(last=False)
+
+            self._thumbnails_size -= len(forgotten_thumbnail)
+
+        return thumbnail
+
+    def _cache_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def _put_disk_task(self, task: Callable[[], object]):
+        self._disk_tasks.put(task)
+
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._work, name="thumbnails", daemon=True)
+            self._worker.start()
+
+    def _work(self):
+        while True:
+            task = self._disk_tasks.get()
+
+            try:
+                task()
+            except OSError:
+                # the thumbnail is just drawn again, the next time it is needed
+                pass
+
+    def _load_thumbnail(self, generation: int, key: str, level: LevelAddresses):
+        if generation != self._generation:
+            return
+
+        try:
+            png_data: Optional[bytes] = self._cache_file(key).read_bytes()
+        except OSError:
+            png_data = None
+        else:
+            self._mark_as_used(key)
+
+        self._thumbnail_loaded.emit(generation, key, level, png_data)
+
+    def _save_thumbnail(self, key: str, png_data: bytes):
+        # written under a different name first, so that a half written thumbnail is never read
+        temporary_file = self._cache_file(key).with_suffix(".tmp")
+        temporary_file.write_bytes(png_data)
+        temporary_file.replace(self._cache_file(key))
+
+        self._add_to_cache_size(len(png_data))
+
+    def _mark_as_used(self, key: str):
+        # the modification time is used to find the least recently used thumbnails, when the cache gets too big
+        os.utime(self._cache_file(key))
+
+    def _add_to_cache_size(self, byte_count: int):
+        if self._cache_size is None:
+            self._cache_size = sum(cache_file.stat().st_size for cache_file in self.cache_dir.glob("*.png"))
+        else:
+            self._cache_size += byte_count
+
+        if self._cache_size > THUMBNAIL_CACHE_BUDGET:
+            self._prune()
+
+    def _prune(self):
+        cache_files = sorted(
+            ((cache_file.stat(), cache_file) for cache_file in self.cache_dir.glob("*.png")),
+            key=lambda stat_and_file: stat_and_file[0].st_mtime,
+        )
+
+        self._cache_size = sum(stat.st_size for stat, _ in cache_files)
+
+        for stat, cache_file in cache_files:
+            if self._cache_size <= THUMBNAIL_CACHE_BUDGET:
+                break
+
+            cache_file.unlink(missing_ok=True)
+            self._cache_size -= stat.st_size
+
+
+THUMBNAILS = ThumbnailCache()
@@ -1,5 +1,3 @@
-import base64
-import json
 import logging
 import tempfile
 from pathlib import Path
@@ -33,7 +31,7 @@ from PySide6.QtWidgets import (
 
 from foundry import (
     ROM_FILE_FILTER,
-    auto_save_level_data_path,
+    auto_save_journal_path,
     auto_save_m3l_path,
     auto_save_rom_path,
     icon,
@@ -41,6 +39,7 @@ from foundry import (
 )
 from foundry.features.instaplay import CantFindFirstTile, InstaPlayer, LevelNotAttached
 from foundry.game.additional_data import LevelOrganizer
+from foundry.game.edit_journal import EditJournal, load_journal
 from foundry.game.File import ROM
 from foundry.game.gfx import restore_all_palettes
 from foundry.game.gfx.objects import EnemyItem, Jump, LevelObject
@@ -108,6 +107,8 @@ class FoundryMainWindow(MainWindow):
         self.setWindowIcon(icon("foundry.ico"))
         self.setStyleSheet(self.settings.value("editor/gui_style"))
 
+        self.journal = EditJournal(auto_save_journal_path)
+
         self.undo_stack = QUndoStack(self)
         self.undo_stack.setObjectName("undo_stack")
 
@@ -404,48 +405,34 @@ class FoundryMainWindow(MainWindow):
 
         self.jump_destination_action.setEnabled(bool(self.level_ref.level and self.level_ref.level.has_next_area))
 
-        self._save_auto_data()
+        self._journal_level_data()
 
     def _on_show_settings(self):
         SettingsDialog(self.settings, self).exec()
 
-    @staticmethod
-    def _save_auto_rom():
-        ROM.save_to_file(auto_save_rom_path, set_new_path=False)
+    def _save_auto_rom(self):
+        self.journal.save_file(auto_save_rom_path, ROM.file_data())
 
-    def _save_auto_data(self):
+    def _journal_level_data(self):
         if not self.level_ref:
             return
 
-        (object_offset, object_bytes), (
-            enemy_offset,
-            enemy_bytes,
-        ) = self.level_ref.level.to_bytes()
-
-        object_set_number = self.level_ref.level.object_set_number
-
-        object_data = base64.b64encode(object_bytes).decode("ascii")
-        enemy_data = base64.b64encode(enemy_bytes).decode("ascii")
-
-        data_dict = {
-            "object_set_number": object_set_number,
-            "object_address": object_offset,
-            "object_data": object_data,
-            "enemy_address": enemy_offset,
-            "enemy_data": enemy_data,
-        }
-
-        Path(auto_save_level_data_path).write_text(json.dumps(data_dict))
+        self.journal.record(self.level_ref.level.object_set_number, *self.level_ref.level.to_bytes())
 
     def _load_auto_save(self):
         # rom already loaded
-        data_dict = json.loads(Path(auto_save_level_data_path).read_text())
+        if (journaled_level := load_journal(auto_save_journal_path)) is None:
+            # the editor crashed, before any level was edited
+            if not self.open_level_selector(None):
+                self._on_new_level(dont_check=True)
 
-        object_address = data_dict["object_address"]
-        object_data = bytearray(base64.b64decode(data_dict["object_data"]))
-        enemy_address = data_dict["enemy_address"]
-        enemy_data = bytearray(base64.b64decode(data_dict["enemy_data"]))
-        object_set_number = data_dict["object_set_number"]
+            return
+
+        object_address = journaled_level.object_address
+        object_data = bytearray(journaled_level.object_data)
+        enemy_address = journaled_level.enemy_address
+        enemy_data = bytearray(journaled_level.enemy_data)
+        object_set_number = journaled_level.object_set_number
 
         # load level from ROM, or from m3l file
         if object_address == enemy_address == 0:
@@ -575,7 +562,10 @@ class FoundryMainWindow(MainWindow):
             if path_to_rom == auto_save_rom_path:
                 self._load_auto_save()
             else:
+                # the journal belongs to the last ROM
+                self.journal.discard()
                 self._save_auto_rom()
+
                 if not self.open_level_selector(None):
                     self._on_new_level(dont_check=True)
 
@@ -653,6 +643,8 @@ class FoundryMainWindow(MainWindow):
         lo.rearrange_levels()
         lo.rearrange_enemies()
 
+        ROM().additional_data.invalidate_free_space()
+
         ROM.save_to_file(ROM.path)
 
     def _check_for_refresh(self):
@@ -671,7 +663,7 @@ class FoundryMainWindow(MainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
-        ROM.additional_data.found_levels.clear()
+        ROM.additional_data.found_levels = []
         ROM.additional_data.needs_refresh = False
 
         ROM.additional_data.managed_level_positions = answer == QMessageBox.StandardButton.Yes
@@ -1158,6 +1150,12 @@ class FoundryMainWindow(MainWindow):
     def closeEvent(self, event: QCloseEvent):
         super(FoundryMainWindow, self).closeEvent(event)
 
+        if not event.isAccepted():
+            # the user chose to keep editing, so the journal is still needed
+            return
+
+        self.journal.discard()
+        self.journal.close()
+
         auto_save_rom_path.unlink(missing_ok=True)
         auto_save_m3l_path.unlink(missing_ok=True)
-        auto_save_level_data_path.unlink(missing_ok=True)
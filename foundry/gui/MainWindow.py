@@ -7,7 +7,6 @@ from PySide6.QtGui import QCloseEvent, Qt, QUndoStack
 from PySide6.QtWidgets import QMainWindow, QMessageBox, QPushButton
 
 from foundry import (
-    Settings,
     check_for_update,
     get_current_version_name,
     icon,
@@ -16,6 +15,7 @@ from foundry import (
 )
 from foundry.game.File import ROM
 from foundry.game.level.LevelRef import LevelRef
+from foundry.gui.settings import Settings
 from foundry.gui.util import center_widget
 
 
@@ -3,19 +3,25 @@ from collections import defaultdict
 from PySide6.QtWidgets import QApplication, QProgressDialog
 
 from foundry.game.File import ROM
-from smb3parse.levels import WORLD_COUNT
-from smb3parse.util.parser import FoundLevel, gen_levels_in_rom
+from foundry.game.found_level_cache import load_found_levels, save_found_levels
+from smb3parse.util.parser import FoundLevel
+from smb3parse.util.parser.parallel import gen_levels_in_rom_parallel
 
 
 class LevelParseProgressDialog(QProgressDialog):
     def __init__(self):
-        super(LevelParseProgressDialog, self).__init__(
-            "Parsing World Maps to find Levels.", "Cancel", 0, WORLD_COUNT - 1
-        )
+        super(LevelParseProgressDialog, self).__init__("Parsing World Maps to find Levels.", "Cancel", 0, 0)
 
         self.levels_per_object_set: dict[int, set[int]] = defaultdict(set)
         self.levels_by_address: dict[int, FoundLevel] = {}
 
+        if (cached_levels := load_found_levels(ROM())) is not None:
+            self.levels_per_object_set, self.levels_by_address = cached_levels
+
+            # stops the dialog from showing up on its own after a while
+            self.reset()
+            return
+
         self.setWindowTitle("Parsing World Maps to find Levels")
         self.setModal(True)
         self.forceShow()
@@ -25,16 +31,20 @@ class LevelParseProgressDialog(QProgressDialog):
         self._get_all_levels()
 
     def _get_all_levels(self):
-        level_gen = gen_levels_in_rom(ROM())
+        level_gen = gen_levels_in_rom_parallel(ROM())
 
         try:
-            world_number, levels_in_world = next(level_gen)
+            levels_parsed, levels_submitted = next(level_gen)
             while True:
-                self.setLabelText(f"Parsing World {world_number}. Found Levels: {levels_in_world}")
-                self.setValue(world_number - 1)
+                self.setLabelText(f"Parsing Levels. Parsed {levels_parsed} of {levels_submitted} found so far.")
+                self.setMaximum(levels_submitted)
+                self.setValue(levels_parsed)
 
                 QApplication.processEvents()
-                world_number, levels_in_world = level_gen.send(self.wasCanceled())
+                levels_parsed, levels_submitted = level_gen.send(self.wasCanceled())
 
         except StopIteration as si:
             self.levels_per_object_set, self.levels_by_address = si.value
+
+            if not self.wasCanceled():
+                save_found_levels(ROM(), self.levels_by_address)
@@ -1,9 +1,9 @@
 from PySide6.QtCore import QPoint
-from PySide6.QtGui import QMouseEvent, Qt
+from PySide6.QtGui import QMouseEvent, QShowEvent, Qt
 from PySide6.QtWidgets import QLabel, QTableWidgetItem, QVBoxLayout, QWidget
 
-from foundry import get_level_thumbnail, pixmap_to_base64
 from foundry.game.File import ROM
+from foundry.game.thumbnail_cache import THUMBNAILS
 from foundry.gui.widgets.table_widget import TableWidget
 from smb3parse.objects.object_set import OBJECT_SET_NAMES
 from smb3parse.util.parser import FoundLevel
@@ -79,6 +79,14 @@ class _FoundLevelTable(TableWidget):
     def level_index(self):
         return self._level_index_for_row(self.currentRow())
 
+    def showEvent(self, event: QShowEvent):
+        # have the thumbnails ready, by the time the levels in the list are hovered over
+        THUMBNAILS.pregenerate(
+            (level.object_set_number, level.level_offset, level.enemy_offset) for level in self._levels
+        )
+
+        return super().showEvent(event)
+
     def mouseMoveEvent(self, event: QMouseEvent):
         return self._set_thumbnail(event)
 
@@ -111,13 +119,9 @@ class _FoundLevelTable(TableWidget):
 
         level = self._levels[level_index]
 
-        image_data = get_level_thumbnail(
-            level.object_set_number,
-            level.level_offset,
-            level.enemy_offset,
-        )
+        image_data = THUMBNAILS.thumbnail(level.object_set_number, level.level_offset, level.enemy_offset)
 
-        self.setToolTip(f"<img src='data:image/png;base64,{pixmap_to_base64(image_data)}'>")
+        self.setToolTip(f"<img src='data:image/png;base64,{image_data}'>")
 
     def _update_content(self):
         self.setRowCount(len(self._levels))
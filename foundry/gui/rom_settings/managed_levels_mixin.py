@@ -132,6 +132,8 @@ class ManagedLevelsMixin(SettingsMixin):
         lo.rearrange_levels()
         lo.rearrange_enemies()
 
+        ROM().additional_data.invalidate_free_space()
+
         ROM.save_to_file(ROM.path)
 
         if self.level and self.level.attached_to_rom:
@@ -158,4 +160,4 @@ class ManagedLevelsMixin(SettingsMixin):
         super().closeEvent(event)
 
         if not self.enabled_checkbox.isChecked():
-            ROM.additional_data.found_levels.clear()
+            ROM.additional_data.found_levels = []
@@ -2,7 +2,7 @@ from functools import partial
 from typing import Callable
 
 import qdarkstyle
-from PySide6.QtCore import QSettings
+from PySide6.QtCore import QSettings, Signal
 
 RESIZE_LEFT_CLICK = "LMB"
 RESIZE_RIGHT_CLICK = "RMB"
@@ -62,15 +62,43 @@ _settings: dict[str, str | int | bool] = {
 _settings.update(SETTINGS)
 
 
+SettingValue = str | int | bool
+
+
+def _convert(value, type_: type | None):
+    if value is None:
+        return value
+    elif type_ is bool and isinstance(value, str):
+        # boolean values loaded from disk are returned as strings for some reason
+        return value == "true"
+    elif type_ is None:
+        return value
+    else:
+        return type_(value)
+
+
 class Settings(QSettings):
+    """
+    The settings of one application, kept in an in-memory snapshot, so that reading them, for example on every paint,
+    doesn't go through the settings store. Changed values are written through to the store and announced with
+    value_changed.
+
+    The default profile is purely in memory. It starts out with the default values and never reads from or writes to
+    the settings store, which makes it fit for drawers, thumbnails, offscreen rendering and tests.
+    """
+
+    value_changed = Signal(str, object)
+    """Emitted with the key and the new value, whenever a setting was set to a different value."""
+
     def __init__(self, organization="mchlnix", application="default"):
         super(Settings, self).__init__(organization, application)
 
-        for key, default_value in _settings.items():
-            if self.value(key) is None or self.is_default:
-                self.setValue(key, default_value)
+        self._snapshot: dict[str, SettingValue] = {}
 
-        self.sync()
+        if self.is_default:
+            self._snapshot.update(_settings)
+        else:
+            self._load_snapshot()
 
         self.update_by_version()
 
@@ -78,24 +106,54 @@ class Settings(QSettings):
     def is_default(self):
         return self.organizationName() == "mchlnix" and self.applicationName() == "default"
 
+    def _load_snapshot(self):
+        missing_defaults = False
+
+        for key, default_value in _settings.items():
+            stored_value = self._value_from_store(key, type(default_value))
+
+            if stored_value is None:
+                super(Settings, self).setValue(key, default_value)
+                missing_defaults = True
+
+                stored_value = default_value
+
+            self._snapshot[key] = stored_value
+
+        if missing_defaults:
+            self.sync()
+
+    def _value_from_store(self, key: str, type_: type | None, default_value=None):
+        return _convert(super(Settings, self).value(key, default_value), type_)
+
     def value(self, key: str, default_value=None, type_=None):
+        if type_ is None and key in self._snapshot:
+            # the common case on every paint, values were already converted, when they were put into the snapshot
+            return self._snapshot[key]
+
         if key in _settings and type_ is None:
             type_ = type(_settings[key])
 
-        returned_value = super(Settings, self).value(key, default_value)
-
-        if returned_value is None:
-            return returned_value
-        elif type_ is bool and isinstance(returned_value, str):
-            # boolean values loaded from disk are returned as strings for some reason
-            return returned_value == "true"
-        elif type_ is None:
-            return returned_value
+        if key in self._snapshot:
+            return _convert(self._snapshot[key], type_)
+        elif self.is_default:
+            return _convert(default_value, type_)
         else:
-            return type_(returned_value)
+            return self._value_from_store(key, type_, default_value)
 
     def setValue(self, key: str, value):
-        return super(Settings, self).setValue(key, value)
+        if key in _settings:
+            value = _convert(value, type(_settings[key]))
+
+        value_changed = key not in self._snapshot or self._snapshot[key] != value
+
+        self._snapshot[key] = value
+
+        if not self.is_default:
+            super(Settings, self).setValue(key, value)
+
+        if value_changed:
+            self.value_changed.emit(key, value)
 
     def sync(self):
         if self.is_default:
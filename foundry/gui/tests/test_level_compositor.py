@@ -0,0 +1,110 @@
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage, QPainter, Qt
+
+from foundry.game.gfx.drawable.Block import Block
+from foundry.gui.settings import Settings
+from foundry.gui.visualization.level.LevelCompositor import LevelCompositor
+from foundry.gui.visualization.level.LevelDrawer import LevelLayer
+
+
+def _paint(compositor: LevelCompositor, level) -> QImage:
+    image = QImage(QSize(*level.size) * compositor.block_length, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(image)
+    compositor.draw(painter, level)
+    painter.end()
+
+    return image
+
+
+def _redrawn_layers(compositor: LevelCompositor, level) -> set[LevelLayer]:
+    misses_before = {layer: stats.misses for layer, stats in compositor.tile_cache.stats("layer").items()}
+
+    _paint(compositor, level)
+
+    return {
+        layer
+        for layer, stats in compositor.tile_cache.stats("layer").items()
+        if stats.misses > misses_before.get(layer, 0)
+    }
+
+
+def test_only_changed_layers_are_redrawn(level):
+    compositor = LevelCompositor()
+    compositor.settings = Settings()
+    compositor.block_length = Block.SIDE_LENGTH
+
+    assert _redrawn_layers(compositor, level) == set(LevelLayer)
+    assert _redrawn_layers(compositor, level) == set()
+
+    level.enemies[0].move_by(1, 0)
+
+    assert _redrawn_layers(compositor, level) == {LevelLayer.ENEMIES, LevelLayer.OVERLAYS}
+
+    level.objects[0].move_by(1, 0)
+
+    assert _redrawn_layers(compositor, level) == {LevelLayer.OBJECTS, LevelLayer.OVERLAYS}
+
+    compositor.settings.setValue("level view/draw_grid", not compositor.settings.value("level view/draw_grid"))
+
+    assert _redrawn_layers(compositor, level) == {LevelLayer.OVERLAYS}
+
+    # other zoom levels are kept, so zooming back out is just as cheap
+    compositor.block_length = 2 * Block.SIDE_LENGTH
+
+    assert _redrawn_layers(compositor, level) == set(LevelLayer)
+
+    compositor.block_length = Block.SIDE_LENGTH
+
+    assert _redrawn_layers(compositor, level) == set()
+
+
+def test_selection_is_drawn_without_redrawing_layers(level):
+    compositor = LevelCompositor()
+    compositor.settings = Settings()
+    compositor.block_length = Block.SIDE_LENGTH
+
+    unselected_image = _paint(compositor, level)
+
+    level.objects[0].selected = True
+    level.enemies[0].selected = True
+
+    assert _redrawn_layers(compositor, level) == set()
+    assert _paint(compositor, level) != unselected_image
+
+    level.objects[0].selected = False
+    level.enemies[0].selected = False
+
+    assert _paint(compositor, level) == unselected_image
+
+
+def test_only_animated_layers_are_redrawn_per_animation_frame(level):
+    compositor = LevelCompositor()
+    compositor.settings = Settings()
+    compositor.block_length = Block.SIDE_LENGTH
+
+    _paint(compositor, level)
+
+    compositor.anim_frame = 1
+
+    assert _redrawn_layers(compositor, level) == {LevelLayer.OBJECTS}
+
+    # without any objects, nothing in the level is animated
+    level.objects.clear()
+    _paint(compositor, level)
+
+    compositor.anim_frame = 2
+
+    assert _redrawn_layers(compositor, level) == set()
+
+
+def test_budget_fits_the_visible_tiles(level):
+    compositor = LevelCompositor()
+    compositor.settings = Settings()
+    compositor.block_length = 8 * Block.SIDE_LENGTH
+
+    _paint(compositor, level)
+
+    assert compositor.tile_cache.byte_size <= compositor.tile_cache.byte_budget
+    assert compositor.tile_cache.stats("layer")[LevelLayer.OBJECTS].evictions == 0
@@ -0,0 +1,47 @@
+import pytest
+from PySide6.QtCore import QSettings
+
+from foundry.gui.settings import SETTINGS, Settings
+
+DRAW_GRID = "level view/draw_grid"
+
+
+@pytest.fixture
+def settings_dir(tmp_path):
+    QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, str(tmp_path))
+
+    yield tmp_path
+
+    QSettings.setPath(QSettings.Format.NativeFormat, QSettings.Scope.UserScope, "")
+
+
+def test_in_memory_profile(settings_dir):
+    settings = Settings()
+
+    assert settings.value(DRAW_GRID) == SETTINGS[DRAW_GRID]
+
+    settings.setValue(DRAW_GRID, not SETTINGS[DRAW_GRID])
+    settings.sync()
+
+    assert settings.value(DRAW_GRID) != SETTINGS[DRAW_GRID]
+
+    # nothing was shared with other instances or written to disk
+    assert Settings().value(DRAW_GRID) == SETTINGS[DRAW_GRID]
+    assert not list(settings_dir.rglob("*"))
+
+
+def test_values_are_written_through(settings_dir):
+    settings = Settings("mchlnix", "test")
+
+    changes = []
+    settings.value_changed.connect(lambda key, value: changes.append((key, value)))
+
+    settings.setValue(DRAW_GRID, "true")
+    settings.setValue(DRAW_GRID, True)
+
+    assert settings.value(DRAW_GRID) is True
+    assert changes == [(DRAW_GRID, True)]
+
+    settings.sync()
+
+    assert Settings("mchlnix", "test").value(DRAW_GRID) is True
@@ -82,9 +82,11 @@ class MainView(QWidget):
         return self.drawer.settings
 
     @settings.setter
-    def settings(self, value):
+    def settings(self, value: Settings):
         self.drawer.settings = value
 
+        value.value_changed.connect(self.update)
+
     def sizeHint(self) -> QSize:
         if not self.level_ref:
             return super(MainView, self).sizeHint()
@@ -322,7 +324,7 @@ class MainView(QWidget):
 
         sel_rect = self.selection_square.get_adjusted_rect(self.block_length, self.block_length)
 
-        touched_objects = [obj for obj in self.level_ref.get_all_objects() if sel_rect.intersects(obj.get_rect())]
+        touched_objects = self.level_ref.level.get_objects_in(sel_rect)
 
         if touched_objects != self.level_ref.selected_objects:
             self._set_selected_objects(
@@ -345,6 +347,9 @@ class MainView(QWidget):
 
         self.drawer.block_length = self.block_length
 
+        # lets the drawer skip everything outside the exposed part of the view
+        painter.setClipRect(event.rect())
+
         self.drawer.draw(painter, self.level_ref.level)
 
         self.selection_square.draw(painter)
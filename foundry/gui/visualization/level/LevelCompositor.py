@@ -0,0 +1,252 @@
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional
+
+from PySide6.QtCore import QPoint, QRect
+from PySide6.QtGui import QImage, QPainter, Qt
+
+from foundry.game.File import ROM
+from foundry.game.gfx.drawable.Block import animated_block_indexes
+from foundry.game.gfx.drawable.image_cache import ImageCache
+from foundry.game.gfx.GraphicsSet import ANIMATION_FRAME_COUNT, GraphicsSet
+from foundry.game.gfx.objects import LevelObject
+from foundry.game.gfx.objects.in_level.level_object import BLANK
+from foundry.game.gfx.Palette import load_palette_group
+from foundry.game.level.Level import Level
+from foundry.gui.visualization.level.LevelDrawer import (
+    DEFAULT_GRAPHICS_BLOCKS,
+    SPECIAL_BACKGROUND_OBJECTS,
+    LevelDrawer,
+    LevelLayer,
+)
+
+TILE_SIZE = 512
+"""The width and height in pixels of the pieces, that the layers are cached in. Only visible tiles get drawn."""
+
+LEVEL_LAYER_CACHE_BUDGET = 96 * 1024 * 1024
+"""
+How many bytes the cached tiles of all layers may take up at least, before the least recently used are evicted. If the
+visible tiles of two zoom levels don't fit, the budget is raised accordingly.
+"""
+
+ANIMATED_LAYERS = (LevelLayer.BACKGROUND, LevelLayer.OBJECTS)
+"""
+The layers, that contain blocks and can therefore look different in every animation frame. Only their tiles, that
+actually contain animated blocks, are cached per animation frame.
+"""
+
+OVERLAY_SETTINGS = (
+    "level view/draw_jump_on_objects",
+    "level view/draw_items_in_blocks",
+    "level view/draw_invisible_items",
+    "level view/draw_expansion",
+    "level view/draw_mario",
+    "level view/draw_jumps",
+    "level view/draw_grid",
+    "level view/draw_grid_coordinates",
+    "level view/draw_autoscroll",
+)
+
+
+class LayerTileKey(NamedTuple):
+    layer: LevelLayer
+    block_length: int
+    anim_frame: Optional[int]
+    """The animation frame the tile was drawn in, or None, if it looks the same in all of them."""
+    tile_x: int
+    tile_y: int
+
+
+def _uses_animated_blocks(level_object: LevelObject) -> bool:
+    animated_blocks = animated_block_indexes(level_object.graphics_set, level_object.tsa_data)
+
+    # special backgrounds are drawn with the first block of the object
+    used_blocks = set(level_object.rendered_blocks).union(level_object.blocks[:1])
+    used_blocks.discard(BLANK)
+
+    # block indexes above 0xFF are offsets into the graphic memory, like in get_block
+    return any((ROM().int(block) if block > 0xFF else block) in animated_blocks for block in used_blocks)
+
+
+@contextmanager
+def _unselected(level: Level) -> Iterator[None]:
+    """Draws the level as if nothing was selected, so that its cached layers don't change, when the selection does."""
+    selected_objects = [level_object for level_object in level.get_all_objects() if level_object.selected]
+
+    for level_object in selected_objects:
+        level_object.selected = False
+
+    try:
+        yield
+    finally:
+        for level_object in selected_objects:
+            level_object.selected = True
+
+
+class LevelCompositor(LevelDrawer):
+    """
+    Draws a level like the LevelDrawer, but keeps every layer as cached images, per zoom level and animation frame.
+
+    Before every paint, the state each layer depends on is compared to the state it was last drawn in. Only the layers,
+    whose state changed, are drawn again. Moving an enemy, for example, only redraws the enemies and the overlays,
+    while toggling the grid only redraws the overlays. Everything else is just copied over from the cache.
+
+    The layers are cached without any selection. Selected objects are drawn on top of their layer on every paint, so
+    that selecting objects doesn't cause any layer to be drawn again.
+    """
+
+    def __init__(self):
+        super(LevelCompositor, self).__init__()
+
+        self.tile_cache = ImageCache[LayerTileKey](LEVEL_LAYER_CACHE_BUDGET, ("layer", "block_length"))
+
+        self._layer_states: dict[LevelLayer, tuple] = {}
+        """The state of the level, that the cached tiles of each layer were drawn in."""
+
+    def invalidate(self):
+        """Forgets all cached layers, so they are drawn again on the next paint."""
+        self.tile_cache.clear()
+        self._layer_states.clear()
+
+    def draw(self, painter: QPainter, level: Level):
+        visible_rect = self._visible_rect(painter, level)
+
+        self._invalidate_changed_layers(level)
+
+        level_rect = level.get_rect(self.block_length)
+
+        x_tiles = range(visible_rect.left() // TILE_SIZE, visible_rect.right() // TILE_SIZE + 1)
+        y_tiles = range(visible_rect.top() // TILE_SIZE, visible_rect.bottom() // TILE_SIZE + 1)
+
+        self._fit_budget(len(x_tiles) * len(y_tiles))
+
+        for layer in LevelLayer:
+            for tile_x in x_tiles:
+                for tile_y in y_tiles:
+                    tile_rect = QRect(tile_x * TILE_SIZE, tile_y * TILE_SIZE, TILE_SIZE, TILE_SIZE).intersected(
+                        level_rect
+                    )
+
+                    painter.drawImage(tile_rect.topLeft(), self._tile(level, layer, tile_x, tile_y, tile_rect))
+
+            self._draw_selection(painter, level, layer, visible_rect)
+
+    def _tile(self, level: Level, layer: LevelLayer, tile_x: int, tile_y: int, tile_rect: QRect) -> QImage:
+        static_key = LayerTileKey(layer, self.block_length, None, tile_x, tile_y)
+
+        if static_key in self.tile_cache:
+            key = static_key
+        else:
+            key = static_key._replace(anim_frame=self.anim_frame)
+
+        if (tile := self.tile_cache.get(key)) is None:
+            tile = self._draw_tile(level, layer, tile_rect)
+
+            if layer not in ANIMATED_LAYERS or not self._tile_is_animated(level, layer, tile_rect):
+                key = static_key
+
+            self.tile_cache.put(key, tile)
+
+        return tile
+
+    def _fit_budget(self, visible_tile_count: int):
+        """
+        Makes room for the visible tiles of every layer in every animation frame they can be cached in, for the
+        current and one other zoom level, so that neither animating, nor zooming back and forth evicts tiles, that are
+        needed again right away.
+        """
+        frames_per_tile = sum(ANIMATION_FRAME_COUNT if layer in ANIMATED_LAYERS else 1 for layer in LevelLayer)
+        visible_bytes = visible_tile_count * frames_per_tile * TILE_SIZE * TILE_SIZE * 4  # ARGB32
+
+        self.tile_cache.byte_budget = max(LEVEL_LAYER_CACHE_BUDGET, 2 * visible_bytes)
+
+    def _draw_tile(self, level: Level, layer: LevelLayer, tile_rect: QRect) -> QImage:
+        tile = QImage(tile_rect.size(), QImage.Format_ARGB32_Premultiplied)
+        tile.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(tile)
+
+        painter.translate(-tile_rect.topLeft())
+        painter.setClipRect(tile_rect)
+
+        with _unselected(level):
+            self._draw_layer(painter, level, layer, tile_rect)
+
+        painter.end()
+
+        return tile
+
+    def _draw_selection(self, painter: QPainter, level: Level, layer: LevelLayer, visible_rect: QRect):
+        """Draws the selected objects of the layer again, on top of its cached tiles, this time as selected."""
+        if layer == LevelLayer.OBJECTS:
+            self._draw_objects(painter, [obj for obj in level.objects if obj.selected], visible_rect)
+
+        elif layer == LevelLayer.ENEMIES:
+            self._draw_objects(painter, [enemy for enemy in level.enemies if enemy.selected], visible_rect)
+
+        elif layer == LevelLayer.OVERLAYS:
+            selected_objects = [obj for obj in level.get_all_objects() if obj.selected]
+
+            self._draw_overlays(painter, level, selected_objects, visible_rect)
+
+    def _tile_is_animated(self, level: Level, layer: LevelLayer, tile_rect: QRect) -> bool:
+        """Whether the freshly drawn tile of the layer contains any blocks, that change between animation frames."""
+        if layer == LevelLayer.BACKGROUND:
+            if not self.settings.value("level view/special_background"):
+                return False
+
+            animated_blocks = animated_block_indexes(
+                GraphicsSet.from_number(level.header.graphic_set_index), ROM.get_tsa_data(level.object_set_number)
+            )
+
+            return not animated_blocks.isdisjoint(DEFAULT_GRAPHICS_BLOCKS.get(level.object_set_number, ()))
+
+        block_rect = QRect(
+            QPoint(tile_rect.left() // self.block_length, tile_rect.top() // self.block_length),
+            QPoint(tile_rect.right() // self.block_length, tile_rect.bottom() // self.block_length),
+        )
+
+        # special backgrounds reach beyond their rect, so they could be in any tile
+        objects_in_tile = [obj for obj in level.get_objects_in(block_rect) if isinstance(obj, LevelObject)]
+        special_backgrounds = [obj for obj in level.objects if obj.name.lower() in SPECIAL_BACKGROUND_OBJECTS]
+
+        return any(map(_uses_animated_blocks, objects_in_tile + special_backgrounds))
+
+    def _invalidate_changed_layers(self, level: Level):
+        for layer, state in self._current_layer_states(level).items():
+            if self._layer_states.get(layer) != state:
+                self.tile_cache.invalidate(layer=layer)
+
+                self._layer_states[layer] = state
+
+    def _current_layer_states(self, level: Level) -> dict[LevelLayer, tuple]:
+        """Returns everything each layer depends on, besides the zoom level, the animation frame and the selection."""
+        palette_group = load_palette_group(level.object_set_number, level.header.object_palette_index)
+
+        # changes to the colors, the graphics or the block definitions
+        graphics_state = (
+            level.object_set_number,
+            bytes(level.header_bytes),
+            tuple(map(bytes, palette_group.palettes)),
+            ROM.write_generation,
+        )
+
+        objects_changes, enemies_changes = level.change_counts()
+
+        jumps_state = tuple((jump.screen_index, bytes(jump.to_bytes())) for jump in level.jumps)
+
+        return {
+            LevelLayer.BACKGROUND: (graphics_state, self.settings.value("level view/special_background")),
+            LevelLayer.OBJECTS: (
+                graphics_state,
+                objects_changes,
+                self.settings.value("level view/block_transparency"),
+            ),
+            LevelLayer.ENEMIES: (level.size, enemies_changes),
+            LevelLayer.OVERLAYS: (
+                graphics_state,
+                objects_changes,
+                enemies_changes,
+                jumps_state,
+                tuple(self.settings.value(setting) for setting in OVERLAY_SETTINGS),
+            ),
+        }
@@ -1,4 +1,6 @@
+from enum import Enum, auto
 from itertools import product
+from typing import Sequence
 
 from PySide6.QtCore import QPoint, QRect
 from PySide6.QtGui import QBrush, QColor, QPainter, QPen, Qt
@@ -9,6 +11,7 @@ from foundry.game.gfx.drawable import load_from_png, make_image_selected, mario_
 from foundry.game.gfx.drawable.Block import Block
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.objects import EnemyItem, LevelObject
+from foundry.game.gfx.objects.in_level.in_level_object import InLevelObject
 from foundry.game.gfx.objects.world_map.sprite import EMPTY_IMAGE
 from foundry.game.gfx.Palette import (
     NESPalette,
@@ -71,6 +74,21 @@ actually render them in the level.
 """
 
 
+OVERLAY_MARGIN = 1
+"""Overlays, like jump arrows or items in blocks, are drawn up to one block next to the object they belong to."""
+
+KOOPA_TRAIL_LENGTH = 9
+"""The trail of the Red Koopa Paratroopa overlay reaches this many blocks below the enemy."""
+
+
+DEFAULT_GRAPHICS_BLOCKS = {
+    DESERT_OBJECT_SET: (86,),
+    DUNGEON_OBJECT_SET: (140, 139, 20, 21, 22, 23),
+    ICE_OBJECT_SET: (0x80,),
+}
+"""The blocks, that the default graphics of these object sets are drawn with, when the special background is enabled."""
+
+
 ENEMY_ITEMS_WITH_OVERLAYS = apply(
     str.lower, ("Invisible door (appears when you hit a P-switch)", "Red Koopa Paratroopa")
 )
@@ -92,6 +110,17 @@ def _block_from_index(block_index: int, level: Level) -> Block:
     return Block(block_index, palette_group, graphics_set, tsa_data)
 
 
+class LevelLayer(Enum):
+    """The parts a level is drawn in, from back to front. Each of them only depends on some aspects of the level."""
+
+    BACKGROUND = auto()
+    """The background color and the default graphics of some object sets, like the floor in dungeons."""
+    OBJECTS = auto()
+    ENEMIES = auto()
+    OVERLAYS = auto()
+    """Everything, that is drawn on top of the level, but isn't part of it, like the grid, or items in blocks."""
+
+
 class LevelDrawer:
     def __init__(self):
         self.block_length = Block.WIDTH
@@ -100,38 +129,71 @@ class LevelDrawer:
         self.screen_pen = QPen(QColor(0xFF, 0x00, 0x00, 0xFF), 1)
         self.coord_pen = QPen(QColor(0xFF, 0x00, 0x00, 0xC0), 1)
 
-        self.settings = Settings("mchlnix", "level drawer")
+        self.settings = Settings()
         self.anim_frame = 0
 
     def draw(self, painter: QPainter, level: Level):
-        self._draw_background(painter, level)
+        """
+        Draws the level with all its objects, enemies and overlays, that are enabled in the settings.
+
+        If the painter has a clip rect set, for example to the exposed rect of a paint event, everything completely
+        outside of it is skipped, so that drawing only costs as much as the visible part of the level.
+        """
+        visible_rect = self._visible_rect(painter, level)
+
+        for layer in LevelLayer:
+            self._draw_layer(painter, level, layer, visible_rect)
+
+    def _draw_layer(self, painter: QPainter, level: Level, layer: LevelLayer, visible_rect: QRect):
+        if layer == LevelLayer.BACKGROUND:
+            self._draw_background(painter, level, visible_rect)
+
+            if self.settings.value("level view/special_background"):
+                self._draw_default_graphics(painter, level, visible_rect)
+
+        elif layer == LevelLayer.OBJECTS:
+            self._draw_objects(painter, level.objects, visible_rect)
+
+        elif layer == LevelLayer.ENEMIES:
+            self._draw_objects(painter, level.enemies, visible_rect)
+
+        elif layer == LevelLayer.OVERLAYS:
+            self._draw_overlays(painter, level, level.get_all_objects(), visible_rect)
+
+            if self.settings.value("level view/draw_expansion"):
+                self._draw_expansions(painter, level, visible_rect)
 
-        if self.settings.value("level view/special_background"):
-            self._draw_default_graphics(painter, level)
+            if self.settings.value("level view/draw_mario"):
+                self._draw_mario(painter, level)
 
-        self._draw_objects(painter, level)
+            if self.settings.value("level view/draw_jumps"):
+                self._draw_jumps(painter, level)
 
-        self._draw_overlays(painter, level)
+            if self.settings.value("level view/draw_grid"):
+                self._draw_grid(painter, level, visible_rect)
 
-        if self.settings.value("level view/draw_expansion"):
-            self._draw_expansions(painter, level)
+            if self.settings.value("level view/draw_grid_coordinates"):
+                self._draw_grid_coordinates(painter, level)
 
-        if self.settings.value("level view/draw_mario"):
-            self._draw_mario(painter, level)
+            if self.settings.value("level view/draw_autoscroll"):
+                self._draw_auto_scroll(painter, level)
 
-        if self.settings.value("level view/draw_jumps"):
-            self._draw_jumps(painter, level)
+    def _visible_rect(self, painter: QPainter, level: Level) -> QRect:
+        level_rect = level.get_rect(self.block_length)
 
-        if self.settings.value("level view/draw_grid"):
-            self._draw_grid(painter, level)
+        if not painter.hasClipping():
+            return level_rect
 
-        if self.settings.value("level view/draw_grid_coordinates"):
-            self._draw_grid_coordinates(painter, level)
+        return painter.clipBoundingRect().toAlignedRect().intersected(level_rect)
 
-        if self.settings.value("level view/draw_autoscroll"):
-            self._draw_auto_scroll(painter, level)
+    def _visible_blocks(self, visible_rect: QRect) -> tuple[range, range]:
+        """Returns the x and y positions of all blocks, that are at least partially inside the visible rect."""
+        x_range = range(visible_rect.left() // self.block_length, visible_rect.right() // self.block_length + 1)
+        y_range = range(visible_rect.top() // self.block_length, visible_rect.bottom() // self.block_length + 1)
 
-    def _draw_background(self, painter: QPainter, level: Level):
+        return x_range, y_range
+
+    def _draw_background(self, painter: QPainter, level: Level, visible_rect: QRect):
         painter.save()
 
         if level.object_set.number == CLOUDY_OBJECT_SET:
@@ -139,38 +201,41 @@ class LevelDrawer:
         else:
             bg_color = bg_color_for_object_set(level.object_set_number, level.header.object_palette_index)
 
-        painter.fillRect(level.get_rect(self.block_length), bg_color)
+        painter.fillRect(visible_rect, bg_color)
 
         painter.restore()
 
-    def _draw_default_graphics(self, painter: QPainter, level: Level):
+    def _draw_default_graphics(self, painter: QPainter, level: Level, visible_rect: QRect):
         painter.save()
 
+        x_range, y_range = self._visible_blocks(visible_rect)
+
         if level.object_set.number == DESERT_OBJECT_SET:
-            self._draw_desert_default_graphics(painter, level)
+            self._draw_desert_default_graphics(painter, level, x_range, y_range)
 
         elif level.object_set.number == DUNGEON_OBJECT_SET:
-            self._draw_dungeon_default_graphics(painter, level)
+            self._draw_dungeon_default_graphics(painter, level, x_range, y_range)
 
         elif level.object_set.number == ICE_OBJECT_SET:
-            self._draw_ice_default_graphics(painter, level)
+            self._draw_ice_default_graphics(painter, level, x_range, y_range)
 
         painter.restore()
 
-    def _draw_dungeon_default_graphics(self, painter: QPainter, level: Level):
+    def _draw_dungeon_default_graphics(self, painter: QPainter, level: Level, x_range: range, y_range: range):
         # draw_background
         bg_block = _block_from_index(140, level)
 
-        for x, y in product(range(level.width), range(level.height)):
+        for x, y in product(x_range, y_range):
             bg_block.graphics_set.anim_frame = self.anim_frame
             bg_block.draw(painter, x * self.block_length, y * self.block_length, self.block_length)
 
         # draw ceiling
         ceiling_block = _block_from_index(139, level)
 
-        for x in range(level.width):
-            ceiling_block.graphics_set.anim_frame = self.anim_frame
-            ceiling_block.draw(painter, x * self.block_length, 0, self.block_length)
+        if 0 in y_range:
+            for x in x_range:
+                ceiling_block.graphics_set.anim_frame = self.anim_frame
+                ceiling_block.draw(painter, x * self.block_length, 0, self.block_length)
 
         # draw floor
         upper_floor_blocks = [
@@ -185,7 +250,10 @@ class LevelDrawer:
         upper_y = (GROUND - 2) * self.block_length
         lower_y = (GROUND - 1) * self.block_length
 
-        for block_x in range(level.width):
+        if GROUND - 2 not in y_range and GROUND - 1 not in y_range:
+            return
+
+        for block_x in x_range:
             pixel_x = block_x * self.block_length
 
             upper_floor_blocks[block_x % 2].draw(painter, pixel_x, upper_y, self.block_length)
@@ -193,25 +261,28 @@ class LevelDrawer:
             lower_floor_blocks[block_x % 2].draw(painter, pixel_x, lower_y, self.block_length)
             lower_floor_blocks[block_x % 2].graphics_set.anim_frame = self.anim_frame
 
-    def _draw_desert_default_graphics(self, painter: QPainter, level: Level):
+    def _draw_desert_default_graphics(self, painter: QPainter, level: Level, x_range: range, y_range: range):
+        if GROUND - 1 not in y_range:
+            return
+
         floor_level = (GROUND - 1) * self.block_length
         floor_block_index = 86
 
         floor_block = _block_from_index(floor_block_index, level)
 
-        for x in range(level.width):
+        for x in x_range:
             floor_block.graphics_set.anim_frame = self.anim_frame
             floor_block.draw(painter, x * self.block_length, floor_level, self.block_length)
 
-    def _draw_ice_default_graphics(self, painter: QPainter, level: Level):
+    def _draw_ice_default_graphics(self, painter: QPainter, level: Level, x_range: range, y_range: range):
         bg_block = _block_from_index(0x80, level)
 
-        for x, y in product(range(level.width), range(level.height)):
+        for x, y in product(x_range, y_range):
             bg_block.graphics_set.anim_frame = self.anim_frame
             bg_block.draw(painter, x * self.block_length, y * self.block_length, self.block_length)
 
-    def _draw_objects(self, painter: QPainter, level: Level):
-        for level_object in level.get_all_objects():
+    def _draw_objects(self, painter: QPainter, level_objects: Sequence[InLevelObject], visible_rect: QRect):
+        for level_object in level_objects:
             if isinstance(level_object, EnemyItem) and level_object.type in OMITTED_ITEMS:
                 continue
 
@@ -220,16 +291,21 @@ class LevelDrawer:
             if level_object.name.lower() in SPECIAL_BACKGROUND_OBJECTS:
                 assert isinstance(level_object, LevelObject)
 
-                width = LEVEL_MAX_LENGTH
-                height = GROUND - level_object.y_position
+                background_rect = QRect(
+                    level_object.x_position * self.block_length,
+                    level_object.y_position * self.block_length,
+                    LEVEL_MAX_LENGTH * self.block_length,
+                    (GROUND - level_object.y_position) * self.block_length,
+                )
 
-                blocks_to_draw = [level_object.blocks[0]] * width * height
+                x_range, y_range = self._visible_blocks(background_rect.intersected(visible_rect))
 
-                for index, block_index in enumerate(blocks_to_draw):
-                    x = level_object.x_position + index % width
-                    y = level_object.y_position + index // width
+                for x, y in product(x_range, y_range):
+                    level_object._draw_block(painter, level_object.blocks[0], x, y, self.block_length, False)
+
+            elif not level_object.get_rect(self.block_length).intersects(visible_rect):
+                continue
 
-                    level_object._draw_block(painter, block_index, x, y, self.block_length, False)
             else:
                 level_object.anim_frame = self.anim_frame
                 level_object.draw(
@@ -246,10 +322,12 @@ class LevelDrawer:
 
                 painter.restore()
 
-    def _draw_overlays(self, painter: QPainter, level: Level):
+    def _draw_overlays(
+        self, painter: QPainter, level: Level, level_objects: Sequence[InLevelObject], visible_rect: QRect
+    ):
         painter.save()
 
-        for level_object in level.get_all_objects():
+        for level_object in level_objects:
             name = level_object.name.lower()
 
             # only handle this specific enemy item for now
@@ -259,6 +337,14 @@ class LevelDrawer:
             pos = level_object.get_rect(self.block_length).topLeft()
             rect = level_object.get_rect(self.block_length)
 
+            overlay_margin = OVERLAY_MARGIN * self.block_length
+            overlay_rect = rect.adjusted(
+                -overlay_margin, -overlay_margin, overlay_margin, KOOPA_TRAIL_LENGTH * self.block_length
+            )
+
+            if not overlay_rect.intersects(visible_rect):
+                continue
+
             # invisible coins, for example, expand and need to have multiple overlays drawn onto them
             # set true by default, since for most overlays it doesn't matter
             fill_object = True
@@ -432,8 +518,11 @@ class LevelDrawer:
         else:
             return False
 
-    def _draw_expansions(self, painter: QPainter, level: Level):
+    def _draw_expansions(self, painter: QPainter, level: Level, visible_rect: QRect):
         for level_object in level.get_all_objects():
+            if not level_object.get_rect(self.block_length).intersects(visible_rect):
+                continue
+
             if self.settings.value("level view/draw_expansion"):
                 painter.save()
 
@@ -467,10 +556,10 @@ class LevelDrawer:
 
             painter.drawRect(jump.get_rect(self.block_length, level.is_vertical))
 
-    def _draw_grid(self, painter: QPainter, level: Level):
+    def _draw_grid(self, painter: QPainter, level: Level, visible_rect: QRect):
         panel_width, panel_height = level.get_rect(self.block_length).size().toTuple()
 
-        self._draw_grid_lines(painter, panel_height, panel_width)
+        self._draw_grid_lines(painter, visible_rect)
         self._draw_screen_lines(painter, panel_height, panel_width, level.is_vertical)
 
     def _draw_grid_coordinates(self, painter: QPainter, level: Level):
@@ -505,16 +594,18 @@ class LevelDrawer:
             for x in range(0, panel_width, self.block_length * LEVEL_SCREEN_WIDTH):
                 painter.drawLine(x, 0, x, panel_height)
 
-    def _draw_grid_lines(self, painter, panel_height, panel_width):
+    def _draw_grid_lines(self, painter: QPainter, visible_rect: QRect):
         painter.setPen(self.grid_pen)
 
+        x_range, y_range = self._visible_blocks(visible_rect)
+
         # draw vertical grid lines
-        for x in range(0, panel_width, self.block_length):
-            painter.drawLine(x, 0, x, panel_height)
+        for x in x_range:
+            painter.drawLine(x * self.block_length, visible_rect.top(), x * self.block_length, visible_rect.bottom())
 
         # draw horizontal grid lines
-        for y in range(0, panel_height, self.block_length):
-            painter.drawLine(0, y, panel_width, y)
+        for y in y_range:
+            painter.drawLine(visible_rect.left(), y * self.block_length, visible_rect.right(), y * self.block_length)
 
     def _draw_auto_scroll(self, painter: QPainter, level: Level):
         for item in level.enemies:
@@ -8,7 +8,7 @@ from PySide6.QtWidgets import QScrollArea, QToolTip, QWidget
 from foundry import ctrl_is_pressed
 from foundry.game import EXPANDS_BOTH, EXPANDS_HORIZ, EXPANDS_VERT
 from foundry.game.File import ROM
-from foundry.game.gfx.drawable.Block import get_tile
+from foundry.game.gfx.GraphicsSet import ANIMATION_FRAME_COUNT
 from foundry.game.gfx.objects import EnemyItem, LevelObject
 from foundry.game.gfx.objects.in_level.in_level_object import InLevelObject
 from foundry.game.level.Level import Level
@@ -24,7 +24,8 @@ from foundry.gui.commands import (
 )
 from foundry.gui.ContextMenu import LevelContextMenu
 from foundry.gui.settings import RESIZE_LEFT_CLICK, RESIZE_RIGHT_CLICK, Settings
-from foundry.gui.visualization.level.LevelDrawer import LevelDrawer
+from foundry.gui.visualization.level.LevelCompositor import LevelCompositor
+from foundry.gui.visualization.level.offscreen import render_level
 from foundry.gui.visualization.MainView import (
     MODE_DRAG,
     MODE_FREE,
@@ -46,13 +47,14 @@ class LevelView(MainView):
         settings: Settings,
         context_menu: Optional[LevelContextMenu],
     ):
-        self.drawer = LevelDrawer()
+        self.drawer = LevelCompositor()
         self.redraw_timer: Optional[QTimer] = None
 
         super(LevelView, self).__init__(parent, level, settings, context_menu)
 
         level.palette_changed.connect(self.update_anim_timer)
         level.level_changed.connect(self.update_anim_timer)
+        level.level_changed.connect(self.drawer.invalidate)
         self.update_anim_timer()
 
         self.mouse_mode = MODE_FREE
@@ -88,8 +90,7 @@ class LevelView(MainView):
 
     def next_anim_step(self):
         self.drawer.anim_frame += 1
-        self.drawer.anim_frame %= 4
-        get_tile.cache_clear()
+        self.drawer.anim_frame %= ANIMATION_FRAME_COUNT
 
         self.repaint()
 
@@ -100,7 +101,6 @@ class LevelView(MainView):
         if self.redraw_timer is not None:
             self.redraw_timer.stop()
             self.drawer.anim_frame = 0
-            get_tile.cache_clear()
 
         if self.settings.value("level view/block_animation"):
             self.redraw_timer = QTimer(self)
@@ -119,6 +119,12 @@ class LevelView(MainView):
 
         return QSize(w, h)
 
+    def make_screenshot(self):
+        if not isinstance(self.level_ref.level, Level):
+            return super(LevelView, self).make_screenshot()
+
+        return render_level(self.level_ref.level, self.zoom, self.settings, self.drawer.anim_frame)
+
     def mouseMoveEvent(self, event: QMouseEvent):
         if self.mouse_mode == MODE_DRAG:
             self.setCursor(Qt.CursorShape.ClosedHandCursor)
@@ -474,8 +480,10 @@ class LevelView(MainView):
             return is_safe, reason, additional_info
 
         if ROM.additional_data.managed_level_positions:
-            free_space_in_bank = ROM.additional_data.free_space_for_object_set(self.level_ref.level.object_set_number)
-            free_space_for_enemies = ROM.additional_data.free_space_for_enemies()
+            free_space_in_bank = ROM.additional_data.free_space_for_object_set(
+                self.level_ref.level.object_set_number, self.level_ref.level.header_offset
+            )
+            free_space_for_enemies = ROM.additional_data.free_space_for_enemies(self.level_ref.level.enemy_offset)
 
             additional_level_data = (
                 self.level_ref.level.current_object_size() - self.level_ref.level.object_size_on_disk
@@ -0,0 +1,105 @@
+"""
+Renders Levels into images, without going through any widgets. This also works with the offscreen Qt platform, so that
+thumbnails, exports and tests can get a picture of a Level, without building the UI.
+"""
+from typing import Collection, Optional
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage, QPainter
+
+from foundry.game.gfx.drawable.Block import Block
+from foundry.game.level.Level import Level
+from foundry.game.level.LevelRef import LevelRef
+from foundry.gui.settings import SETTINGS, Settings
+from foundry.gui.visualization.level.LevelDrawer import LevelDrawer
+
+LEVEL_LAYERS = {
+    "special_background": "level view/special_background",
+    "expansion": "level view/draw_expansion",
+    "mario": "level view/draw_mario",
+    "jumps": "level view/draw_jumps",
+    "jumps_on_objects": "level view/draw_jump_on_objects",
+    "items_in_blocks": "level view/draw_items_in_blocks",
+    "invisible_items": "level view/draw_invisible_items",
+    "grid": "level view/draw_grid",
+    "grid_coordinates": "level view/draw_grid_coordinates",
+    "autoscroll": "level view/draw_autoscroll",
+}
+"""The optional things drawn on top of a Level, by name, and the setting, that turns them on and off."""
+
+DEFAULT_LEVEL_LAYERS = frozenset(name for name, setting in LEVEL_LAYERS.items() if SETTINGS[setting])
+
+
+def layer_settings(layers: Collection[str] = DEFAULT_LEVEL_LAYERS, transparent: bool = True) -> Settings:
+    """
+    Returns settings, that turn on exactly the given layers.
+
+    :param layers: The names of the layers to draw, as listed in LEVEL_LAYERS.
+    :param transparent: Whether blocks should be drawn with transparency.
+    :raises ValueError: If an unknown layer name was given.
+    """
+    unknown_layers = set(layers).difference(LEVEL_LAYERS)
+
+    if unknown_layers:
+        raise ValueError(f"Unknown layers {sorted(unknown_layers)}, expected some of {list(LEVEL_LAYERS)}.")
+
+    settings = Settings()
+
+    for name, setting in LEVEL_LAYERS.items():
+        settings.setValue(setting, name in layers)
+
+    settings.setValue("level view/block_transparency", transparent)
+
+    return settings
+
+
+def render_level(level: Level, zoom: float = 1, settings: Optional[Settings] = None, anim_frame: int = 0) -> QImage:
+    """
+    Draws the whole Level into an image, the same way the LevelView would.
+
+    :param level: The Level to draw.
+    :param zoom: The zoom level, 1 means a block is 16x16 pixels big.
+    :param settings: Which layers to draw. Defaults to the layers, that are on in a fresh installation.
+    :param anim_frame: Which animation frame to draw the blocks in.
+    """
+    if settings is None:
+        settings = layer_settings()
+
+    drawer = LevelDrawer()
+
+    drawer.settings = settings
+    drawer.block_length = int(Block.SIDE_LENGTH * zoom)
+    drawer.anim_frame = anim_frame
+
+    width, height = level.size
+
+    image = QImage(QSize(width, height) * drawer.block_length, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(image)
+    drawer.draw(painter, level)
+    painter.end()
+
+    return image
+
+
+def render_level_at(
+    object_set_number: int,
+    layout_address: int,
+    enemy_address: int,
+    zoom: float = 1,
+    layers: Collection[str] = DEFAULT_LEVEL_LAYERS,
+    transparent: bool = True,
+) -> QImage:
+    """
+    Loads the Level at the given addresses out of the ROM and draws it into an image. See render_level.
+
+    :raises ValueError: If the addresses belong to a World Map, instead of a Level.
+    """
+    level_ref = LevelRef()
+    level_ref.load_level("", layout_address, enemy_address, object_set_number)
+
+    if not isinstance(level_ref.level, Level):
+        raise ValueError(f"Only Levels can be rendered, got {level_ref.level}.")
+
+    return render_level(level_ref.level, zoom, layer_settings(layers, transparent))
@@ -34,7 +34,7 @@ class WorldDrawer:
         self.grid_pen = QPen(QColor(0x80, 0x80, 0x80, 0x80), 1)
         self.screen_pen = QPen(QColor(0xFF, 0x00, 0x00, 0xFF), 1)
 
-        self.settings = Settings("mchlnix", "world drawer")
+        self.settings = Settings()
 
         self.anim_frame = 0
 
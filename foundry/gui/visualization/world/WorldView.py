@@ -8,19 +8,21 @@ from PySide6.QtGui import (
     QPainter,
     QPixmap,
     QShortcut,
+    QShowEvent,
     Qt,
     QUndoStack,
 )
 from PySide6.QtWidgets import QToolTip, QWidget
 
-from foundry import get_level_thumbnail, pixmap_to_base64
 from foundry.game.gfx import get_block
-from foundry.game.gfx.drawable.Block import get_tile, get_worldmap_tile
+from foundry.game.gfx.drawable.Block import Block, get_worldmap_tile
+from foundry.game.gfx.GraphicsSet import ANIMATION_FRAME_COUNT
 from foundry.game.gfx.objects import LevelObject, MapTile
 from foundry.game.gfx.objects.world_map.map_object import MapObject
 from foundry.game.gfx.Palette import load_palette_group
 from foundry.game.level.LevelRef import LevelRef
 from foundry.game.level.WorldMap import WorldMap
+from foundry.game.thumbnail_cache import THUMBNAILS
 from foundry.gui.settings import Settings
 from foundry.gui.visualization.MainView import (
     MODE_DRAG,
@@ -102,10 +104,7 @@ class WorldView(MainView):
 
     def next_anim_step(self):
         self.drawer.anim_frame += 1
-        self.drawer.anim_frame %= 4
-
-        # to get the tiles for the next animation step
-        get_tile.cache_clear()
+        self.drawer.anim_frame %= ANIMATION_FRAME_COUNT
 
         self.repaint()
 
@@ -117,9 +116,6 @@ class WorldView(MainView):
             self.redraw_timer.stop()
             self.drawer.anim_frame = 0
 
-            # to get the tiles for the next animation step
-            get_tile.cache_clear()
-
         if self.world.data.frame_tick_count and self.settings.value("world view/animated tiles"):
             self.redraw_timer = QTimer(self)
             self.redraw_timer.setInterval(1000 / 60 * self.world.data.frame_tick_count)
@@ -139,9 +135,11 @@ class WorldView(MainView):
         return self.drawer.settings
 
     @settings.setter
-    def settings(self, value):
+    def settings(self, value: Settings):
         self.drawer.settings = value
 
+        value.value_changed.connect(self.update)
+
     @property
     def undo_stack(self) -> QUndoStack:
         return cast(QUndoStack, self.window().findChild(QUndoStack, "undo_stack"))
@@ -158,6 +156,7 @@ class WorldView(MainView):
             map_tile.change_type(map_tile.block.index)
 
         get_block.cache_clear()
+        Block.image_cache.clear()
         self.update()
 
     def set_mouse_mode(self, new_mode: int, event: Optional[QMouseEvent]):
@@ -201,6 +200,17 @@ class WorldView(MainView):
         self._tile_to_put = tile_id
         self.set_mouse_mode(MODE_PUT_TILE, None)
 
+    def showEvent(self, event: QShowEvent):
+        if self.settings.value("world view/show level previews"):
+            # have the thumbnails ready, by the time the levels of this world are hovered over
+            THUMBNAILS.pregenerate(
+                (level_pointer.data.object_set, level_pointer.data.level_address, level_pointer.data.enemy_address)
+                for level_pointer in self.world.level_pointers
+                if level_pointer.data.object_set not in (MUSHROOM_OBJECT_SET, SPADE_BONUS_OBJECT_SET)
+            )
+
+        return super(WorldView, self).showEvent(event)
+
     def mouseMoveEvent(self, event: QMouseEvent):
         should_display_level = self.mouse_mode == MODE_FREE and self.settings.value("world view/show level previews")
 
@@ -254,7 +264,7 @@ class WorldView(MainView):
 
             object_set_name = OBJECT_SET_NAMES[level_pointer.data.object_set]
 
-            image_data = get_level_thumbnail(
+            image_data = THUMBNAILS.thumbnail(
                 level_pointer.data.object_set,
                 level_pointer.data.level_address,
                 level_pointer.data.enemy_address,
@@ -265,7 +275,7 @@ class WorldView(MainView):
                 f"<u>Type:</u> {object_set_name} "
                 f"<u>Objects:</u> {level_pointer.data.level_address:#x} "
                 f"<u>Enemies:</u> {level_pointer.data.enemy_address:#x}<br/>"
-                f"<img src='data:image/png;base64,{pixmap_to_base64(image_data)}'>"
+                f"<img src='data:image/png;base64,{image_data}'>"
             )
 
             return True
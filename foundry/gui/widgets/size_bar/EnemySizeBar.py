@@ -40,7 +40,7 @@ class EnemySizeBar(LevelSizeBar):
             enemy_size = float("INF")
 
         elif ROM().additional_data.managed_level_positions:
-            free_space_in_bank = ROM().additional_data.free_space_for_enemies()
+            free_space_in_bank = ROM().additional_data.free_space_for_enemies(self.level_ref.level.enemy_offset)
             enemy_size += free_space_in_bank
 
         return enemy_size
@@ -66,7 +66,9 @@ class LevelSizeBar(QWidget):
             level_size = float("INF")
 
         elif ROM().additional_data.managed_level_positions:
-            free_space_in_bank = ROM().additional_data.free_space_for_object_set(self.level_ref.level.object_set_number)
+            free_space_in_bank = ROM().additional_data.free_space_for_object_set(
+                self.level_ref.level.object_set_number, self.level_ref.level.header_offset
+            )
             level_size += free_space_in_bank
 
         return level_size
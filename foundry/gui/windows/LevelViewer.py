@@ -20,8 +20,8 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from foundry import get_level_thumbnail, pixmap_to_base64
 from foundry.game.File import ROM
+from foundry.game.thumbnail_cache import THUMBNAILS
 from foundry.gui.windows.CustomChildWindow import CustomChildWindow
 from smb3parse.constants import BASE_OFFSET, PAGE_A000_ByTileset
 from smb3parse.data_points import WorldMapData
@@ -374,17 +374,13 @@ class LevelBlockView(ByteView):
             self.setToolTip(None)
             return
 
-        image_data = get_level_thumbnail(
-            block.level[0],
-            block.level[1],
-            0x0,
-        )
+        image_data = THUMBNAILS.thumbnail(block.level[0], block.level[1], 0x0)
 
         self.setToolTip(
             f"<b>{block.name}</b><br/>"
             f"<u>Type:</u> {OBJECT_SET_NAMES[block.level[0]]} "
             f"<u>Objects:</u> {block.level[1]:#x} "
-            f"<img src='data:image/png;base64,{pixmap_to_base64(image_data)}'>"
+            f"<img src='data:image/png;base64,{image_data}'>"
         )
 
     def _paint_block(self, painter: QPainter, pos: QPoint, block: _Block):
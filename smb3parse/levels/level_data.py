@@ -0,0 +1,86 @@
+"""
+Walks the object and enemy data of a Level in place.
+
+The data of a Level is usually read out of a view into the ROM, that reaches to the end of it. Slicing off every record
+after reading it would copy the rest of the ROM, for every single object, so instead the data is walked with a cursor
+and only the bytes of the records themselves are handed out.
+"""
+from typing import Callable, Iterator
+
+from smb3parse.constants import ENEMY_SIZE
+from smb3parse.objects.level_object import object_definition_index
+
+LEVEL_DATA_END = 0xFF
+"""Marks the end of the object data, as well as the end of the enemy data."""
+
+OBJECT_SIZE = 3  # byte
+FOUR_BYTE_OBJECT_SIZE = OBJECT_SIZE + 1
+
+JUMP_DOMAIN = 0b111
+"""Objects in this domain are Jumps, which are always 3 bytes long."""
+
+IsFourByte = Callable[[int], bool]
+"""Whether the object with the given object definition index is 4 bytes long."""
+
+
+def object_size(record_start: bytes | bytearray | memoryview, is_4byte: IsFourByte) -> int:
+    """
+    Returns how many bytes the object starting with the given bytes takes up.
+
+    :param record_start: At least the first 3 bytes of the object.
+    :param is_4byte: Looks up the object definition of the object.
+    """
+    domain = record_start[0] >> 5
+
+    if domain == JUMP_DOMAIN:
+        return OBJECT_SIZE
+
+    if is_4byte(object_definition_index(domain, record_start[2])):
+        return FOUR_BYTE_OBJECT_SIZE
+
+    return OBJECT_SIZE
+
+
+def iter_object_records(data: bytes | bytearray | memoryview, is_4byte: IsFourByte) -> Iterator[memoryview]:
+    """
+    Yields the bytes of every object and Jump in the given object data, up to the end marker, or the end of the data.
+
+    The yielded records are views into the given data and are only valid as long as it is. Copy them, if they need to
+    outlive it.
+
+    :param data: The object data of a Level, starting right after the Level header.
+    :param is_4byte: Looks up, whether an object is 4 bytes long, from its object definition index.
+    """
+    data = memoryview(data)
+
+    position = 0
+
+    while position + OBJECT_SIZE <= len(data) and data[position] != LEVEL_DATA_END:
+        size = object_size(data[position : position + OBJECT_SIZE], is_4byte)
+
+        yield data[position : position + size]
+
+        position += size
+
+
+def object_data_size(data: bytes | bytearray | memoryview, is_4byte: IsFourByte) -> int:
+    """Returns the size of the given object data in bytes, without the end marker."""
+    return sum(len(record) for record in iter_object_records(data, is_4byte))
+
+
+def iter_enemy_records(data: bytes | bytearray | memoryview) -> Iterator[memoryview]:
+    """
+    Yields the bytes of every enemy in the given enemy data, up to the end marker, or the end of the data.
+
+    The yielded records are views into the given data and are only valid as long as it is. Copy them, if they need to
+    outlive it.
+
+    :param data: The enemy data of a Level, without the byte in front of the first enemy.
+    """
+    data = memoryview(data)
+
+    for position in range(0, len(data) - ENEMY_SIZE + 1, ENEMY_SIZE):
+        if data[position] == LEVEL_DATA_END:
+            return
+
+        yield data[position : position + ENEMY_SIZE]
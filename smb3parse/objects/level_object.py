@@ -23,6 +23,9 @@ from smb3parse.util import lrange
 
 ENEMY_OBJECT_DEFINITION = 12
 
+DOMAIN_DEFINITION_OFFSET = 0x1F
+"""Every domain has this many object definitions, 16 fixed size objects and 15 groups of 16 resizable objects."""
+
 object_set_to_definition = {
     WORLD_MAP_OBJECT_SET: 0,
     PLAINS_OBJECT_SET: 1,
@@ -44,6 +47,24 @@ object_set_to_definition = {
 }
 
 
+def object_definition_index(domain: int, obj_id: int) -> int:
+    """
+    Returns the index of the definition of the given object, in the list of object definitions of its object set.
+
+    >>> object_definition_index(0, 0x0A)
+    10
+
+    >>> object_definition_index(1, 0xA5)
+    56
+    """
+    domain_offset = domain * DOMAIN_DEFINITION_OFFSET
+
+    if obj_id <= 0x0F:
+        return obj_id + domain_offset
+
+    return (obj_id >> 4) + domain_offset + 16 - 1
+
+
 def _obj_range(object_set: int, start: int) -> list[int]:
     """
     Expands a given obj_id start value to all possible object ids, that object could have.
@@ -0,0 +1,53 @@
+from smb3parse.levels.level_data import (
+    iter_enemy_records,
+    iter_object_records,
+    object_data_size,
+)
+
+
+def _is_4byte(definition_index: int) -> bool:
+    # pretend, that only the first group of resizable objects in domain 0 is 4 bytes long
+    return definition_index == 0x10
+
+
+def test_object_records():
+    # GIVEN object data with a 3 byte object, a 4 byte object, a Jump and some data after the end marker
+    three_byte_object = bytes([0x1A, 0x05, 0x00])
+    four_byte_object = bytes([0x10, 0x08, 0x1F, 0x03])
+    jump = bytes([0xE1, 0x10, 0x00])
+
+    data = three_byte_object + four_byte_object + jump + bytes([0xFF, 0x00, 0x01, 0x02])
+
+    # WHEN the data is walked
+    records = [bytes(record) for record in iter_object_records(memoryview(data), _is_4byte)]
+
+    # THEN every object is yielded with its correct length and nothing after the end marker is
+    assert records == [three_byte_object, four_byte_object, jump]
+    assert object_data_size(data, _is_4byte) == 10
+
+
+def test_object_records_without_end_marker():
+    # GIVEN object data, that ends without an end marker and in the middle of an object
+    data = bytes([0x1A, 0x05, 0x00, 0x1A, 0x06])
+
+    # WHEN the data is walked
+    records = [bytes(record) for record in iter_object_records(data, _is_4byte)]
+
+    # THEN only the complete object is yielded
+    assert records == [data[:3]]
+
+
+def test_empty_object_data():
+    assert not list(iter_object_records(bytes([0xFF]), _is_4byte))
+    assert not list(iter_object_records(bytes(), _is_4byte))
+
+
+def test_enemy_records():
+    # GIVEN enemy data with two enemies and some data after the end marker
+    data = bytes([0x72, 0x10, 0x14, 0x6E, 0x20, 0x15, 0xFF, 0x72, 0x00, 0x00])
+
+    # WHEN the data is walked
+    records = [bytes(record) for record in iter_enemy_records(data)]
+
+    # THEN both enemies are yielded and nothing after the end marker is
+    assert records == [data[0:3], data[3:6]]
@@ -0,0 +1,55 @@
+from smb3parse.util.parser.constants import MEM_Screen_Start_AddressL
+from smb3parse.util.parser.memory import MEMORY_SIZE, NESMemory
+
+
+def test_observers(rom):
+    memory = NESMemory(bytearray(MEMORY_SIZE), rom)
+
+    reads = []
+    writes = []
+
+    memory.add_read_observer(range(0x6000, 0x6100), lambda address, value: reads.append((address, value)))
+    memory.add_write_observer(range(0x60F0, 0x6110), lambda address, value: writes.append((address, value)))
+
+    memory[0x5FFF] = 1
+    memory[0x60F0] = 2
+    memory[0x6105] = 3
+
+    assert writes == [(0x60F0, 2), (0x6105, 3)]
+
+    assert memory[0x60F0] == 2
+    assert memory[0x6105] == 3
+
+    assert reads == [(0x60F0, 2)]
+
+
+def test_ignored_addresses(rom):
+    memory = NESMemory(bytearray(MEMORY_SIZE), rom)
+
+    value_before = memory[MEM_Screen_Start_AddressL]
+
+    memory[MEM_Screen_Start_AddressL] = value_before ^ 0xFF
+
+    assert memory[MEM_Screen_Start_AddressL] == value_before
+
+
+def test_slices_are_lists(rom):
+    memory = NESMemory(bytearray(MEMORY_SIZE), rom)
+
+    memory[0x100] = 0x12
+    memory[0x101] = 0x34
+
+    assert memory[0x100:0x102] == [0x12, 0x34]
+
+
+def test_bank_switch_restores_written_window(rom):
+    memory = NESMemory(bytearray(MEMORY_SIZE), rom)
+
+    memory.load_a000_page(3)
+    original_value = memory[0xA010]
+
+    memory[0xA010] = original_value ^ 0xFF
+    memory.load_a000_page(3)
+
+    assert memory.mapped_bank(0xA010) == 3
+    assert memory[0xA010] == original_value
@@ -1,6 +1,19 @@
 import json
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 
-from smb3parse.util.parser import FoundLevel
+import pytest
+
+import smb3parse.util.parser.parallel
+from smb3parse.objects.object_set import PLAINS_OBJECT_SET
+from smb3parse.util.parser import FoundLevel, gen_levels_in_rom
+from smb3parse.util.parser.cpu import Backend, NesCPU
+from smb3parse.util.parser.parallel import gen_levels_in_rom_parallel
+
+LEVEL_1_1_OBJECT_ADDRESS = 0x1FB92
+LEVEL_1_1_ENEMY_ADDRESS = 0xC537
+
+MAX_STEPS = 1_000_000
 
 
 def test_found_level_json():
@@ -11,3 +24,84 @@ def test_found_level_json():
     recovered_found_level = FoundLevel.from_dict(json.loads(as_json))
 
     assert recovered_found_level == found_level
+
+
+def test_warm_start_matches_cold_start(rom):
+    cold_cpu = NesCPU(rom)
+    cold_level = cold_cpu.load_from_address(
+        PLAINS_OBJECT_SET, LEVEL_1_1_OBJECT_ADDRESS, LEVEL_1_1_ENEMY_ADDRESS, MAX_STEPS
+    )
+
+    warm_start = NesCPU.warm_start_snapshot(rom, MAX_STEPS)
+
+    warm_cpu = NesCPU(rom, snapshot=warm_start)
+    warm_level = warm_cpu.load_from_address(
+        PLAINS_OBJECT_SET, LEVEL_1_1_OBJECT_ADDRESS, LEVEL_1_1_ENEMY_ADDRESS, MAX_STEPS
+    )
+
+    assert warm_level == cold_level
+    assert warm_cpu.step_count == cold_cpu.step_count
+
+
+def test_backends_give_identical_results(rom):
+    step_cpu = NesCPU(rom, backend=Backend.STEP)
+    step_level = step_cpu.load_from_address(
+        PLAINS_OBJECT_SET, LEVEL_1_1_OBJECT_ADDRESS, LEVEL_1_1_ENEMY_ADDRESS, MAX_STEPS
+    )
+
+    block_cpu = NesCPU(rom, backend=Backend.CACHED_BLOCKS)
+    block_level = block_cpu.load_from_address(
+        PLAINS_OBJECT_SET, LEVEL_1_1_OBJECT_ADDRESS, LEVEL_1_1_ENEMY_ADDRESS, MAX_STEPS
+    )
+
+    assert block_level == step_level
+    assert block_cpu.step_count == step_cpu.step_count
+    assert block_cpu.processorCycles == step_cpu.processorCycles
+    assert block_cpu.memory[0:0x10000] == step_cpu.memory[0:0x10000]
+
+
+def _run_to_completion(level_gen):
+    try:
+        while True:
+            next(level_gen)
+    except StopIteration as si:
+        return si.value
+
+
+def test_parallel_search_finds_the_same_levels(rom):
+    sequentially_found_levels = _run_to_completion(gen_levels_in_rom(rom))
+
+    assert _run_to_completion(gen_levels_in_rom_parallel(rom, max_workers=2)) == sequentially_found_levels
+
+
+def test_parallel_search_can_be_stopped(rom):
+    level_gen = gen_levels_in_rom_parallel(rom, max_workers=2)
+
+    next(level_gen)
+
+    with pytest.raises(StopIteration) as stop_iteration:
+        level_gen.send(True)
+
+    assert stop_iteration.value.value == ({}, {})
+
+
+class _BrokenExecutor:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def submit(self, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("A worker process died."))
+
+        return future
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+def test_parallel_search_falls_back_to_sequential_search(rom, monkeypatch):
+    sequentially_found_levels = _run_to_completion(gen_levels_in_rom(rom))
+
+    monkeypatch.setattr(smb3parse.util.parser.parallel, "ProcessPoolExecutor", _BrokenExecutor)
+
+    assert _run_to_completion(gen_levels_in_rom_parallel(rom)) == sequentially_found_levels
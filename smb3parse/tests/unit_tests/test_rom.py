@@ -1,3 +1,5 @@
+import pytest
+
 from smb3parse.util.rom import INESHeader, Rom
 
 
@@ -33,6 +35,23 @@ def test_int():
         assert rom.int(offset) == number
 
 
+def test_view():
+    rom_bytes = bytearray(b"\x00\x01\x02\x03\x04\x05\x06\x00\xff\xff\xff\xff\xff\xff\xff\xff")
+    header = INESHeader.from_buffer_copy(rom_bytes)
+
+    rom = Rom(rom_bytes, header)
+
+    with rom.view(2, 3) as window:
+        assert window.readonly
+        assert window == rom.read(2, 3)
+
+    with rom.view(8) as window:
+        assert len(window) == len(rom_bytes) - 8
+
+    with pytest.raises(IndexError):
+        rom.view(8, len(rom_bytes))
+
+
 def test_header(rom):
     assert rom._header.magic == b"NES\x1A"
     assert rom._header.prg_units == 0x10
@@ -15,9 +15,9 @@ and PRG_031.
 Since this cannot happen twice, without exceeding the size of the Rom, we have to keep track of which addresses have
 already been normalized.
 
-This is done using these types and a type checker, as well as only having 3 methods in the Rom class dealing with
-raw Rom data. _read, _write and _find. Any other method using these must normalize their addresses and not give them
-out.
+This is done using these types and a type checker, as well as only having 4 methods in the Rom class dealing with
+raw Rom data. _read, _view, _write and _find. Any other method using these must normalize their addresses and not give
+them out.
 """
 
 
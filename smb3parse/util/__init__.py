@@ -16,7 +16,7 @@ STY_RAM = 0x84  # STY $ll
 hex_int = partial(int, base=16)
 
 
-def little_endian(two_bytes: bytearray) -> int:
+def little_endian(two_bytes: bytes | bytearray | memoryview) -> int:
     """
     Takes a byte array of length 2 and returns the integer it represents in little endian.
     """
@@ -2,7 +2,8 @@ import pathlib
 import time
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Generator
+from functools import partial
+from typing import Callable, Generator, Optional
 
 from smb3parse.constants import OFFSET_SIZE
 from smb3parse.data_points import LevelPointerData
@@ -11,7 +12,8 @@ from smb3parse.levels.level_header import LevelHeader
 from smb3parse.levels.world_map import WorldMap
 from smb3parse.objects.object_set import MUSHROOM_OBJECT_SET, SPADE_BONUS_OBJECT_SET
 from smb3parse.util import hex_int
-from smb3parse.util.parser.cpu import NesCPU
+from smb3parse.util.parser.blocks import BlockCache
+from smb3parse.util.parser.cpu import HOOKED_ADDRESSES, Backend, CPUSnapshot, NesCPU
 from smb3parse.util.rom import Rom
 
 _DEFAULT_LEVEL_PARSING_MAX_STEPS = 1_000_000
@@ -94,9 +96,165 @@ class FoundLevelRecord:
         )
 
 
+def level_records_of_world(world: WorldMap) -> list[FoundLevelRecord]:
+    """Returns records of all the Levels, that can be entered from the given World Map directly."""
+    found_level_records: list[FoundLevelRecord] = [
+        (FoundLevelRecord.from_level_pointer(lp, True, False, False)) for lp in world.level_pointers
+    ]
+
+    # add airship
+    found_level_records.append(
+        FoundLevelRecord(
+            world.data.airship_level_address,
+            world.data.airship_level_offset_address,
+            world.data.airship_enemy_address,
+            world.data.airship_enemy_offset_address,
+            world.data.airship_level_object_set,
+            False,
+            False,
+            True,
+        )
+    )
+
+    # add generic exit
+    found_level_records.append(
+        FoundLevelRecord(
+            world.data.generic_exit_level_address,
+            world.data.generic_exit_level_offset_address,
+            world.data.generic_exit_enemy_address,
+            world.data.generic_exit_enemy_offset_address,
+            world.data.generic_exit_object_set,
+            False,
+            False,
+            True,
+        )
+    )
+
+    # add big ? level
+    found_level_records.append(
+        FoundLevelRecord(
+            world.data.big_q_block_level_address,
+            world.data.big_q_block_level_offset_address,
+            world.data.big_q_block_enemy_address,
+            world.data.big_q_block_enemy_offset_address,
+            world.data.big_q_block_object_set,
+            False,
+            False,
+            True,
+        )
+    )
+
+    # add coin ship level
+    found_level_records.append(
+        FoundLevelRecord(
+            world.data.coin_ship_level_address,
+            world.data.coin_ship_level_offset_address,
+            world.data.coin_ship_enemy_address,
+            world.data.coin_ship_enemy_offset_address,
+            world.data.coin_ship_level_object_set,
+            False,
+            False,
+            True,
+        )
+    )
+
+    # add special/white toad house level
+    found_level_records.append(
+        FoundLevelRecord(
+            world.data.toad_warp_level_address,
+            world.data.toad_warp_level_offset_address,
+            0x0,  # enemy item data is used directly, not as an offset
+            world.data.toad_warp_item_address,
+            MUSHROOM_OBJECT_SET,
+            False,
+            False,
+            True,
+        ),
+    )
+
+    return found_level_records
+
+
+@dataclass(frozen=True)
+class LevelParseResult:
+    """The parts of an emulated Level load, that are needed to find and measure Levels in the ROM."""
+
+    object_data_length: int
+    enemy_data_length: int
+    has_jump: bool
+
+
+LevelParser = Callable[[FoundLevelRecord], LevelParseResult]
+
+
+def parse_level(
+    rom: Rom,
+    record: FoundLevelRecord,
+    max_steps=_DEFAULT_LEVEL_PARSING_MAX_STEPS,
+    warm_start: Optional[CPUSnapshot] = None,
+    block_cache: Optional[BlockCache] = None,
+) -> LevelParseResult:
+    """
+    Emulates loading the Level of the given record, using the cached blocks backend of the NesCPU.
+
+    :param warm_start: A snapshot from NesCPU.warm_start_snapshot, to skip the instructions shared by all Levels.
+    :param block_cache: Decoded blocks, that are shared between the Levels of the same ROM.
+    :raises ValueError: If loading the Level took more than max_steps instructions.
+    """
+    cpu = NesCPU(rom, snapshot=warm_start, backend=Backend.CACHED_BLOCKS, block_cache=block_cache)
+
+    parsed_level = cpu.load_from_address(record.object_set, record.level_address, record.enemy_address, max_steps)
+
+    return LevelParseResult(parsed_level.object_data_length, parsed_level.enemy_data_length, parsed_level.has_jump())
+
+
+def jump_record(rom: Rom, record: FoundLevelRecord) -> Optional[FoundLevelRecord]:
+    """
+    Returns a record of the Jump Destination of the Level in the given record, or None, if the Level header doesn't
+    point to one.
+    """
+    header_of_old_level = LevelHeader(
+        rom,
+        rom.read(record.level_address, HEADER_LENGTH),
+        record.object_set,
+    )
+
+    object_set_number = header_of_old_level.jump_object_set_number
+
+    if 0 in [header_of_old_level.jump_level_offset, object_set_number]:
+        return None
+
+    return FoundLevelRecord(
+        header_of_old_level.jump_level_address,
+        record.level_address,
+        header_of_old_level.jump_enemy_address,
+        record.level_address + OFFSET_SIZE,
+        object_set_number,
+        found_in_world=False,
+        found_as_jump=True,
+    )
+
+
 def gen_levels_in_rom(
-    rom: Rom, max_steps=_DEFAULT_LEVEL_PARSING_MAX_STEPS
+    rom: Rom, max_steps=_DEFAULT_LEVEL_PARSING_MAX_STEPS, level_parser: Optional[LevelParser] = None
 ) -> Generator[tuple[int, int], bool, tuple[dict, dict[int, FoundLevel]]]:
+    """
+    Finds all Levels reachable from the World Maps, by emulating loading them and following their Jump Destinations.
+
+    Yields the current world number and the amount of Levels found in it so far, before every Level is parsed. Sending
+    True back stops the search.
+
+    :param rom: The ROM to search.
+    :param max_steps: How many instructions the emulation of a single Level load may take.
+    :param level_parser: Used to parse each Level. Defaults to emulating the Level load using parse_level.
+    """
+    if level_parser is None:
+        warm_start = NesCPU.warm_start_snapshot(rom, max_steps)
+
+        block_cache = BlockCache(HOOKED_ADDRESSES)
+
+        level_parser = partial(parse_level, rom, max_steps=max_steps, warm_start=warm_start, block_cache=block_cache)
+
     levels_by_address: dict[int, FoundLevel] = {}
 
     start = time.time()
@@ -106,79 +264,7 @@ def gen_levels_in_rom(
 
         world = WorldMap.from_world_number(rom, world_num + 1)
 
-        found_level_records: list[FoundLevelRecord] = [
-            (FoundLevelRecord.from_level_pointer(lp, True, False, False)) for lp in world.level_pointers
-        ]
-
-        # add airship
-        found_level_records.append(
-            FoundLevelRecord(
-                world.data.airship_level_address,
-                world.data.airship_level_offset_address,
-                world.data.airship_enemy_address,
-                world.data.airship_enemy_offset_address,
-                world.data.airship_level_object_set,
-                False,
-                False,
-                True,
-            )
-        )
-
-        # add generic exit
-        found_level_records.append(
-            FoundLevelRecord(
-                world.data.generic_exit_level_address,
-                world.data.generic_exit_level_offset_address,
-                world.data.generic_exit_enemy_address,
-                world.data.generic_exit_enemy_offset_address,
-                world.data.generic_exit_object_set,
-                False,
-                False,
-                True,
-            )
-        )
-
-        # add big ? level
-        found_level_records.append(
-            FoundLevelRecord(
-                world.data.big_q_block_level_address,
-                world.data.big_q_block_level_offset_address,
-                world.data.big_q_block_enemy_address,
-                world.data.big_q_block_enemy_offset_address,
-                world.data.big_q_block_object_set,
-                False,
-                False,
-                True,
-            )
-        )
-
-        # add coin ship level
-        found_level_records.append(
-            FoundLevelRecord(
-                world.data.coin_ship_level_address,
-                world.data.coin_ship_level_offset_address,
-                world.data.coin_ship_enemy_address,
-                world.data.coin_ship_enemy_offset_address,
-                world.data.coin_ship_level_object_set,
-                False,
-                False,
-                True,
-            )
-        )
-
-        # add special/white toad house level
-        found_level_records.append(
-            FoundLevelRecord(
-                world.data.toad_warp_level_address,
-                world.data.toad_warp_level_offset_address,
-                0x0,  # enemy item data is used directly, not as an offset
-                world.data.toad_warp_item_address,
-                MUSHROOM_OBJECT_SET,
-                False,
-                False,
-                True,
-            ),
-        )
+        found_level_records = level_records_of_world(world)
 
         should_stop = False
         for record in found_level_records:
@@ -219,9 +305,7 @@ def gen_levels_in_rom(
                     break
 
                 try:
-                    parsed_level = NesCPU(rom).load_from_address(
-                        record.object_set, record.level_address, record.enemy_address, max_steps
-                    )
+                    parsed_level = level_parser(record)
                 except ValueError as ve:
                     print(ve)
                     break
@@ -242,34 +326,19 @@ def gen_levels_in_rom(
 
                 levels_by_address[record.level_address] = found_level
 
-                if not parsed_level.has_jump():
+                if not parsed_level.has_jump:
                     break
 
-                header_of_old_level = LevelHeader(
-                    rom,
-                    rom.read(record.level_address, HEADER_LENGTH),
-                    record.object_set,
-                )
-
-                level_address_position = record.level_address
-                level_address = header_of_old_level.jump_level_address
+                new_record = jump_record(rom, record)
 
-                enemy_address_position = record.level_address + OFFSET_SIZE
-                enemy_address = header_of_old_level.jump_enemy_address
-
-                object_set_number = header_of_old_level.jump_object_set_number
-
-                new_record = FoundLevelRecord(
-                    level_address,
-                    level_address_position,
-                    enemy_address,
-                    enemy_address_position,
-                    object_set_number,
-                )
-
-                if 0 in [header_of_old_level.jump_level_offset, object_set_number]:
+                if new_record is None:
                     break
 
+                level_address = new_record.level_address
+                level_address_position = new_record.level_address_offset
+                enemy_address_position = new_record.enemy_address_offset
+                object_set_number = new_record.object_set
+
                 if level_address in levels_by_address:
                     found_level = levels_by_address[level_address]
                     assert level_address_position not in found_level.level_offset_positions
@@ -278,9 +347,6 @@ def gen_levels_in_rom(
                     found_level.found_as_jump = True
                     break
 
-                new_record.found_in_world = False
-                new_record.found_as_jump = True
-
                 record = new_record
 
                 print("    ", hex(level_address), object_set_number)
@@ -321,9 +387,9 @@ def gen_levels_in_rom(
         if not line:
             continue
 
-        world_no, *_, level_address, _, object_set_no, _ = line.split(",")
+        world_no, *_, level_address_str, _, object_set_no, _ = line.split(",")
 
-        level_address = hex_int(level_address) - 9
+        level_address = hex_int(level_address_str) - 9
         object_set_num = hex_int(object_set_no)
 
         if int(world_no) in [0, 9]:
@@ -0,0 +1,104 @@
+"""
+Pre-decoded basic blocks of 6502 code, so that the emulation doesn't have to fetch and dispatch every opcode again,
+every time an instruction is run.
+"""
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+from smb3parse.util.rom import PRG_BANK_SIZE
+
+if TYPE_CHECKING:
+    from smb3parse.util.parser.cpu import NesCPU
+
+_LENGTH_BY_ADDRESSING_MODE = {
+    "acc": 1,
+    "imp": 1,
+    "imm": 2,
+    "inx": 2,
+    "iny": 2,
+    "rel": 2,
+    "zpg": 2,
+    "zpx": 2,
+    "zpy": 2,
+    "abs": 3,
+    "abx": 3,
+    "aby": 3,
+    "ind": 3,
+}
+
+_CONTROL_FLOW_MNEMONICS = {"BRK", "JMP", "JSR", "RTI", "RTS"}
+
+BANK_SWITCH_OPCODE = 0xA9
+"""Patched by the NesCPU to switch PRG banks, so nothing after it may be decoded in advance."""
+
+MAX_BLOCK_LENGTH = 64
+
+DecodedInstruction = tuple[Callable, int, int]
+"""The instruction handler, its base cycle count and whether it can take extra cycles."""
+
+
+@dataclass(frozen=True)
+class DecodedBlock:
+    instructions: tuple[DecodedInstruction, ...]
+
+
+class BlockCache:
+    """
+    Keeps the basic blocks decoded from the PRG banks of one ROM.
+
+    A block is keyed by its start address and the PRG bank mapped at that address. Blocks end after control flow
+    instructions and the bank switching instruction, at the end of a PRG bank and before any of the stop addresses, so
+    that the CPU can handle those addresses between blocks.
+
+    Code in RAM, or in PRG windows, that were written to, is never cached.
+    """
+
+    def __init__(self, stop_addresses: frozenset[int]):
+        self.stop_addresses = stop_addresses
+
+        self._blocks: dict[tuple[int, int], Optional[DecodedBlock]] = {}
+
+    def block_at(self, cpu: "NesCPU", pc: int) -> Optional[DecodedBlock]:
+        bank = cpu.memory.mapped_bank(pc)
+
+        if bank is None:
+            return None
+
+        key = pc, bank
+
+        if key not in self._blocks:
+            self._blocks[key] = self._decode(cpu, pc)
+
+        return self._blocks[key]
+
+    def _decode(self, cpu: "NesCPU", pc: int) -> Optional[DecodedBlock]:
+        bank_end = pc - pc % PRG_BANK_SIZE + PRG_BANK_SIZE
+
+        instructions: list[DecodedInstruction] = []
+
+        while len(instructions) < MAX_BLOCK_LENGTH:
+            opcode = cpu.memory[pc : pc + 1][0]
+            mnemonic, addressing_mode = cpu.disassemble[opcode]
+
+            if mnemonic == "???":
+                # let the single step emulation deal with it
+                break
+
+            instruction_end = pc + _LENGTH_BY_ADDRESSING_MODE[addressing_mode]
+
+            is_control_flow = addressing_mode == "rel" or mnemonic in _CONTROL_FLOW_MNEMONICS
+
+            if instruction_end > bank_end:
+                break
+
+            instructions.append((cpu.instruct[opcode], cpu.cycletime[opcode], cpu.extracycles[opcode]))
+
+            pc = instruction_end
+
+            if is_control_flow or opcode == BANK_SWITCH_OPCODE or pc == bank_end or pc in self.stop_addresses:
+                break
+
+        if not instructions:
+            return None
+
+        return DecodedBlock(tuple(instructions))
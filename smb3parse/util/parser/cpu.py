@@ -1,4 +1,9 @@
 """First draft of a parser, emulating the 6502 processor of the NES and letting the ROM generate the level."""
+from copy import deepcopy
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
 from py65.devices import mpu6502
 from py65.disassembler import Disassembler
 
@@ -31,8 +36,9 @@ from smb3parse.util.parser.constants import (
     ROM_Level_Load_Entry,
     ROM_LevelLoad_By_TileSet,
 )
+from smb3parse.util.parser.blocks import BlockCache
 from smb3parse.util.parser.level import ParsedLevel
-from smb3parse.util.parser.memory import NESMemory
+from smb3parse.util.parser.memory import MEMORY_SIZE, MemorySnapshot, NESMemory
 from smb3parse.util.parser.object import ParsedEnemy, ParsedObject
 from smb3parse.util.rom import Rom
 
@@ -44,16 +50,72 @@ RED = "\033[91m"
 CLEAR = "\033[0m"
 
 
-class NesCPU(mpu6502.MPU):
-    def __init__(self, rom: Rom, should_log=False):
-        super(NesCPU, self).__init__()
+LEVEL_SPECIFIC_ADDRESSES = [
+    range(MEM_LevelStartA, MEM_LevelStartB + 1),
+    range(MEM_EnemiesStartA, MEM_EnemiesStartB + 1),
+    range(MEM_PAGE_C000, MEM_PAGE_A000 + 1),
+    range(MEM_Level_TileSet, MEM_Level_TileSet + 1),
+    range(0xA000, 0xE000),  # the object set specific PRG banks
+]
+"""Memory, that load_from_address sets up differently for every Level."""
+
+
+@dataclass(frozen=True)
+class CPUSnapshot:
+    start_pc: int
+    registers: tuple[int, int, int, int, int, int]
+    """PC, A, X, Y, SP and P."""
+    processor_cycles: int
+    step_count: int
+
+    a000_bank: int
+    c000_bank: int
+
+    objects: list[ParsedObject]
+    memory: MemorySnapshot
+
+
+class _LevelSpecificAccess(Exception):
+    pass
+
+
+class Backend(Enum):
+    STEP = "step"
+    """Let py65 fetch, decode and run one instruction at a time."""
+    CACHED_BLOCKS = "cached_blocks"
+    """
+    Run whole basic blocks, that were decoded once and cached. Opcode fetches don't notify read observers, operand
+    accesses still do.
+    """
 
-        self.memory = NESMemory([0x0] * 0x10000, rom)
-        self.memory[MEM_Random_Pool_Start] = 0x88  # as in the ROM
-        self.memory[MEM_Reset_Latch] = 0x5A  # prevents crash in LoadLevel_LittleCloudSolidRun
+
+HOOKED_ADDRESSES = frozenset([0x98EE, ROM_EndObjectParsing])
+"""Addresses, at which NesCPU.step does more than running the instruction."""
+
+
+class NesCPU(mpu6502.MPU):
+    def __init__(
+        self,
+        rom: Rom,
+        should_log=False,
+        snapshot: Optional[CPUSnapshot] = None,
+        backend: Backend = Backend.STEP,
+        block_cache: Optional[BlockCache] = None,
+    ):
+        memory = NESMemory(bytearray(MEMORY_SIZE), rom, snapshot.memory if snapshot is not None else None)
+
+        super(NesCPU, self).__init__(memory)
+
+        if snapshot is None:
+            self.memory[MEM_Random_Pool_Start] = 0x88  # as in the ROM
+            self.memory[MEM_Reset_Latch] = 0x5A  # prevents crash in LoadLevel_LittleCloudSolidRun
 
         self.rom = rom
         self.should_log = should_log
+
+        self.backend = backend
+        self.block_cache = block_cache or BlockCache(HOOKED_ADDRESSES)
+        """Can be shared between CPUs emulating the same, unchanged ROM."""
         self.dis_asm = Disassembler(self)
 
         self.step_count = 0
@@ -63,6 +125,9 @@ class NesCPU(mpu6502.MPU):
         self.did_start_object_parsing = False
         self.objects: list[ParsedObject] = []
 
+        self._resume_pc: Optional[int] = None
+        """If the CPU was restored from a snapshot, then loading a Level starting from here doesn't reset it."""
+
         # instructions
         self.old_inst_0xa9 = NesCPU.inst_0xa9
 
@@ -71,6 +136,77 @@ class NesCPU(mpu6502.MPU):
         if self.instruct[0xA9] != NesCPU.new_inst_0xa9:
             self.instruct[0xA9] = NesCPU.new_inst_0xa9
 
+        if snapshot is not None:
+            self.restore(snapshot)
+
+    def snapshot(self) -> CPUSnapshot:
+        return CPUSnapshot(
+            self.start_pc,
+            (self.pc, self.a, self.x, self.y, self.sp, self.p),
+            self.processorCycles,
+            self.step_count,
+            self.a000_bank,
+            self.c000_bank,
+            deepcopy(self.objects),
+            self.memory.snapshot(),
+        )
+
+    def restore(self, snapshot: CPUSnapshot):
+        """
+        Puts the CPU back into the state of the snapshot. If a Level is loaded from the same start address afterwards,
+        the CPU continues where the snapshot was taken, instead of resetting.
+        """
+        self.start_pc = self._resume_pc = snapshot.start_pc
+        self.pc, self.a, self.x, self.y, self.sp, self.p = snapshot.registers
+        self.processorCycles = snapshot.processor_cycles
+        self.step_count = snapshot.step_count
+
+        self.a000_bank = snapshot.a000_bank
+        self.c000_bank = snapshot.c000_bank
+
+        self.objects = deepcopy(snapshot.objects)
+
+        self.memory.restore(snapshot.memory)
+
+    @staticmethod
+    def warm_start_snapshot(rom: Rom, max_steps: int = -1) -> CPUSnapshot:
+        """
+        Returns a snapshot of the CPU, which already ran all the instructions of load_from_address, that are the same
+        for every Level. That is everything before the first access to memory, that load_from_address sets up for the
+        specific Level it loads.
+
+        Restoring this snapshot and calling load_from_address, skips those instructions, with the same results.
+        """
+        probe = NesCPU(rom)
+        probe.start_pc = ROM_LevelLoad_By_TileSet
+        probe.reset()
+
+        def stop_at_access(*_):
+            raise _LevelSpecificAccess()
+
+        for address_range in LEVEL_SPECIFIC_ADDRESSES:
+            probe.memory.add_read_observer(address_range, stop_at_access)
+            probe.memory.add_write_observer(address_range, stop_at_access)
+
+        shared_steps = 0
+
+        try:
+            while shared_steps != max_steps:
+                probe.step()
+                shared_steps += 1
+        except _LevelSpecificAccess:
+            pass
+
+        # the probe was interrupted in the middle of an instruction, so redo the shared steps on a clean CPU
+        cpu = NesCPU(rom)
+        cpu.start_pc = ROM_LevelLoad_By_TileSet
+        cpu.reset()
+
+        for _ in range(shared_steps):
+            cpu.step()
+
+        return cpu.snapshot()
+
     def load_from_world_map(self, world: int, pos: Position, max_steps=-1) -> ParsedLevel:
         self.start_pc = ROM_Level_Load_Entry
 
@@ -122,7 +258,11 @@ class NesCPU(mpu6502.MPU):
             self._screen_memory_watcher,
         )
 
-        self.reset()
+        if self._resume_pc != self.start_pc:
+            self.reset()
+
+        self._resume_pc = None
+
         self.run_until(ROM_EndObjectParsing, max_steps)
         self._maybe_finish_parsing_last_object()
 
@@ -147,12 +287,39 @@ class NesCPU(mpu6502.MPU):
         self.objects[-1].tiles_in_level.append((address, value))
 
     def run_until(self, address: int, max_steps: int = -1):
+        if self.backend == Backend.CACHED_BLOCKS and not self.should_log:
+            self._run_blocks_until(address, max_steps)
+            return
+
         while self.pc != address:
             self.step()
 
             if self.step_count > max_steps:
                 raise ValueError(f"Overstepped max steps value of {max_steps}.")
 
+    def _run_blocks_until(self, address: int, max_steps: int):
+        if address not in self.block_cache.stop_addresses:
+            self.block_cache = BlockCache(self.block_cache.stop_addresses | {address})
+
+        stop_addresses = self.block_cache.stop_addresses
+
+        while self.pc != address:
+            if self.pc in stop_addresses or (block := self.block_cache.block_at(self, self.pc)) is None:
+                self.step()
+            else:
+                for handler, cycles, extra_cycles in block.instructions:
+                    self.pc = (self.pc + 1) & 0xFFFF
+                    self.excycles = 0
+                    self.addcycles = extra_cycles
+                    handler(self)
+                    self.pc &= 0xFFFF
+                    self.processorCycles += cycles + self.excycles
+
+                self.step_count += len(block.instructions)
+
+            if self.step_count > max_steps:
+                raise ValueError(f"Overstepped max steps value of {max_steps}.")
+
     def step(self):
         self.step_count += 1
 
@@ -1,4 +1,5 @@
-from typing import Callable
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
 
 from smb3parse.constants import BASE_OFFSET
 from smb3parse.util.parser.constants import (
@@ -7,16 +8,84 @@ from smb3parse.util.parser.constants import (
 )
 from smb3parse.util.rom import PRG_BANK_SIZE, Rom
 
+MEMORY_SIZE = 0x10000
 
-class NESMemory(list):
-    def __init__(self, backing_list: list, rom: Rom):
-        super(NESMemory, self).__init__(backing_list)
+PAGE_SIZE = 0x100
+PAGE_COUNT = MEMORY_SIZE // PAGE_SIZE
+
+PRG_WINDOW_START = 0x8000
+"""Everything from here to the end of memory is mapped to PRG banks of the ROM."""
+PRG_WINDOW_COUNT = (MEMORY_SIZE - PRG_WINDOW_START) // PRG_BANK_SIZE
+
+IGNORED_WRITE_ADDRESSES = (MEM_Screen_Start_AddressL, MEM_Screen_Start_AddressH)
+"""
+Writes to these addresses seem to access the Mapper, but would actually overwrite a pointer to the screen memory, so
+they are ignored.
+"""
+
+Observer = tuple[range, Callable]
+PageObservers = Optional[tuple[Observer, ...]]
+"""
+The observers, whose address range overlaps a memory page. None means, that no special handling is needed for any
+address on the page and the memory can be accessed directly.
+"""
+
+
+def _pages_of(address_range: range) -> range:
+    if not address_range:
+        return range(0)
+
+    first_address, last_address = sorted([address_range[0], address_range[-1]])
+
+    return range(max(first_address // PAGE_SIZE, 0), min(last_address // PAGE_SIZE + 1, PAGE_COUNT))
+
+
+@dataclass(frozen=True)
+class MemorySnapshot:
+    data: bytes
+    mapped_banks: tuple[Optional[int], ...]
+    dirty_windows: tuple[bool, ...]
+
+
+class NESMemory:
+    """
+    The 64 KB of memory, that the 6502 CPU of the NES sees.
+
+    The memory is stored in a flat bytearray. Observers can be registered for address ranges, which get called,
+    whenever one of those addresses is read from or written to. To keep unobserved accesses fast, every 256 byte page
+    of memory has an entry in a dispatch table, containing only the observers relevant for that page. Addresses on
+    pages without observers are accessed directly.
+
+    The 8 KB windows from $8000 to $FFFF hold PRG banks of the ROM. Which bank is mapped into which window is kept
+    track of, as well as if a window was written to since. Switching a window to the bank it already holds is
+    therefore free, unless the window is dirty.
+    """
+
+    def __init__(self, backing_list: Iterable[int], rom: Rom, snapshot: Optional[MemorySnapshot] = None):
+        self._data = bytearray(backing_list)
+
+        if len(self._data) != MEMORY_SIZE:
+            raise ValueError(f"NES memory needs to be {MEMORY_SIZE:#x} bytes big, was {len(self._data):#x}.")
 
         self.rom = rom
 
         self._read_observers: dict[range, Callable] = {}
         self._write_observers: dict[range, Callable] = {}
 
+        self._read_pages: list[PageObservers] = [None] * PAGE_COUNT
+        self._write_pages: list[PageObservers] = [None] * PAGE_COUNT
+
+        self._mapped_banks: list[Optional[int]] = [None] * PRG_WINDOW_COUNT
+        self._dirty_windows: list[bool] = [False] * PRG_WINDOW_COUNT
+
+        # writes to the PRG windows need to mark them as dirty, so they get reloaded on the next bank switch
+        for page in range(PRG_WINDOW_START // PAGE_SIZE, PAGE_COUNT):
+            self._write_pages[page] = ()
+
+        if snapshot is not None:
+            self.restore(snapshot)
+            return
+
         last_prg_index = rom.prg_banks - 1
 
         # load second to last PRG (PRG_30 in the vanilla rom) into 0x8000 - 0x9FFF
@@ -25,6 +94,16 @@ class NESMemory(list):
         # load last PRG (PRG_31 in the vanilla rom) into 0xE000 - 0xFFFF
         self._load_bank(last_prg_index, 0xE000)
 
+    def snapshot(self) -> MemorySnapshot:
+        """Captures the contents of the memory and which banks are mapped, but not the observers."""
+        return MemorySnapshot(bytes(self._data), tuple(self._mapped_banks), tuple(self._dirty_windows))
+
+    def restore(self, snapshot: MemorySnapshot):
+        """Sets the contents of the memory and the mapped banks to the snapshot. Observers are kept as they are."""
+        self._data[:] = snapshot.data
+        self._mapped_banks = list(snapshot.mapped_banks)
+        self._dirty_windows = list(snapshot.dirty_windows)
+
     def load_a000_page(self, prg_index: int):
         self._load_bank(prg_index, 0xA000)
 
@@ -32,36 +111,105 @@ class NESMemory(list):
         self._load_bank(prg_index, 0xC000)
 
     def _load_bank(self, prg_index: int, offset: int):
+        window = (offset - PRG_WINDOW_START) // PRG_BANK_SIZE
+
+        if self._mapped_banks[window] == prg_index and not self._dirty_windows[window]:
+            return
+
         prg_bank_position = BASE_OFFSET + prg_index * PRG_BANK_SIZE
 
-        self[offset : offset + PRG_BANK_SIZE] = self.rom.read(prg_bank_position, PRG_BANK_SIZE)
+        try:
+            prg_bank = self.rom.view(prg_bank_position, PRG_BANK_SIZE)
+        except IndexError as ie:
+            raise ValueError(f"Tried to load PRG bank {prg_index}, which lies outside of the ROM.") from ie
+
+        with prg_bank:
+            self._data[offset : offset + PRG_BANK_SIZE] = prg_bank
+
+        self._mapped_banks[window] = prg_index
+        self._dirty_windows[window] = False
+
+    def mapped_bank(self, offset: int) -> Optional[int]:
+        """
+        Returns the index of the PRG bank, that is currently mapped into the window containing the given offset. Returns
+        None, if the offset is not in a PRG window, or the window was written to since the bank was mapped.
+        """
+        if offset < PRG_WINDOW_START:
+            return None
+
+        window = (offset - PRG_WINDOW_START) // PRG_BANK_SIZE
+
+        if self._dirty_windows[window]:
+            return None
+
+        return self._mapped_banks[window]
 
     def add_read_observer(self, address_range: range, callback: Callable):
         self._read_observers[address_range] = callback
 
+        self._update_pages(self._read_pages, self._read_observers, address_range)
+
     def add_write_observer(self, address_range: range, callback: Callable):
         self._write_observers[address_range] = callback
 
+        self._update_pages(self._write_pages, self._write_observers, address_range)
+
+    @staticmethod
+    def _update_pages(pages: list[PageObservers], observers: dict[range, Callable], address_range: range):
+        for page in _pages_of(address_range):
+            pages[page] = tuple(
+                (observed_range, callback)
+                for observed_range, callback in observers.items()
+                if page in _pages_of(observed_range)
+            )
+
+    def __len__(self):
+        return MEMORY_SIZE
+
     def __getitem__(self, address):
+        try:
+            observers = self._read_pages[address >> 8]
+        except TypeError:
+            # slices give back the plain memory, without notifying any observers
+            return list(self._data[address])
+
         if address == 0x10:
             return_value = 0b1000_0000
         else:
-            return_value = super(NESMemory, self).__getitem__(address)
+            return_value = self._data[address]
 
-        for address_range, callback in self._read_observers.items():
-            if address in address_range:
-                callback(address, return_value)
+        if observers is not None:
+            for address_range, callback in observers:
+                if address in address_range:
+                    callback(address, return_value)
 
         return return_value
 
     def __setitem__(self, address, value):
-        for address_range, callback in self._write_observers.items():
+        try:
+            observers = self._write_pages[address >> 8]
+        except TypeError:
+            self._data[address] = bytes(value)
+            self._mark_dirty(range(*address.indices(MEMORY_SIZE)))
+            return
+
+        if observers is None:
+            self._data[address] = value
+            return
+
+        for address_range, callback in observers:
             if address in address_range:
                 callback(address, value)
 
-        if address in [MEM_Screen_Start_AddressL, MEM_Screen_Start_AddressH]:
-            # ignore these addresses, since they seem to access the Mapper, but actually overwrite a pointer to the
-            # screen memory
+        if address in IGNORED_WRITE_ADDRESSES:
             return
 
-        return super(NESMemory, self).__setitem__(address, value)
+        self._data[address] = value
+
+        if address >= PRG_WINDOW_START:
+            self._dirty_windows[(address - PRG_WINDOW_START) // PRG_BANK_SIZE] = True
+
+    def _mark_dirty(self, addresses: range):
+        for address in addresses:
+            if address >= PRG_WINDOW_START:
+                self._dirty_windows[(address - PRG_WINDOW_START) // PRG_BANK_SIZE] = True
@@ -0,0 +1,178 @@
+"""
+Finds the Levels in a ROM like gen_levels_in_rom, but emulates the Level loads in a pool of processes.
+
+Emulating a single Level load takes tens of thousands of interpreted 6502 instructions, but the Level loads don't
+depend on each other. So all Levels reachable from the World Maps and their Jump Destinations are emulated in parallel
+first. Afterwards gen_levels_in_rom is run over the collected results, so that the found Levels are de-duplicated and
+attributed exactly as they would be, when searching the ROM one Level after another.
+"""
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Generator, Optional
+
+from smb3parse.levels import WORLD_COUNT
+from smb3parse.levels.world_map import WorldMap
+from smb3parse.objects.object_set import SPADE_BONUS_OBJECT_SET
+from smb3parse.util.parser import (
+    _DEFAULT_LEVEL_PARSING_MAX_STEPS,
+    FoundLevel,
+    FoundLevelRecord,
+    LevelParseResult,
+    gen_levels_in_rom,
+    jump_record,
+    level_records_of_world,
+    parse_level,
+)
+from smb3parse.util.parser.blocks import BlockCache
+from smb3parse.util.parser.cpu import HOOKED_ADDRESSES, CPUSnapshot, NesCPU
+from smb3parse.util.rom import Rom
+
+_worker_rom: Optional[Rom] = None
+_worker_warm_start: Optional[CPUSnapshot] = None
+_worker_block_cache = BlockCache(HOOKED_ADDRESSES)
+
+RecordKey = tuple[int, int, int]
+ParseOutcome = LevelParseResult | ValueError
+
+
+def _init_worker(rom_data: bytes, max_steps: int):
+    global _worker_rom, _worker_warm_start
+
+    _worker_rom = Rom(bytearray(rom_data))
+    _worker_warm_start = NesCPU.warm_start_snapshot(_worker_rom, max_steps)
+
+
+def _parse_level_in_worker(record: FoundLevelRecord, max_steps: int) -> LevelParseResult:
+    assert _worker_rom is not None
+
+    return parse_level(_worker_rom, record, max_steps, _worker_warm_start, _worker_block_cache)
+
+
+def _record_key(record: FoundLevelRecord) -> RecordKey:
+    return record.object_set, record.level_address, record.enemy_address
+
+
+def gen_levels_in_rom_parallel(
+    rom: Rom, max_steps=_DEFAULT_LEVEL_PARSING_MAX_STEPS, max_workers: Optional[int] = None
+) -> Generator[tuple[int, int], bool, tuple[dict, dict[int, FoundLevel]]]:
+    """
+    Finds all Levels reachable from the World Maps, the same way gen_levels_in_rom does.
+
+    Yields the amount of Level loads, that finished, and the amount of Level loads submitted so far, every time one
+    finishes. The latter grows, when Jump Destinations are found. Sending True back stops the search and cancels all
+    Level loads, that haven't started yet.
+
+    If a worker process dies, the Levels, that weren't loaded yet, are loaded one after another in this process instead.
+
+    :param rom: The ROM to search.
+    :param max_steps: How many instructions the emulation of a single Level load may take.
+    :param max_workers: How many processes to use. Defaults to the amount of processors of the machine.
+    """
+    with rom.view(0) as rom_data:
+        rom_bytes = bytes(rom_data)
+
+    executor = ProcessPoolExecutor(
+        max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(rom_bytes, max_steps),
+    )
+
+    parse_outcomes: dict[RecordKey, ParseOutcome] = {}
+
+    pending: dict[Future, FoundLevelRecord] = {}
+    submitted_level_addresses: set[int] = set()
+
+    levels_parsed = 0
+
+    def submit(record: FoundLevelRecord):
+        if record.object_set == SPADE_BONUS_OBJECT_SET or record.level_address in submitted_level_addresses:
+            return
+
+        submitted_level_addresses.add(record.level_address)
+
+        pending[executor.submit(_parse_level_in_worker, record, max_steps)] = record
+
+    pool_is_broken = False
+
+    try:
+        for world_num in range(WORLD_COUNT - 1):
+            world = WorldMap.from_world_number(rom, world_num + 1)
+
+            for record in level_records_of_world(world):
+                submit(record)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                record = pending.pop(future)
+
+                try:
+                    outcome: ParseOutcome = future.result()
+                except ValueError as ve:
+                    outcome = ve
+
+                parse_outcomes[_record_key(record)] = outcome
+
+                if isinstance(outcome, LevelParseResult) and outcome.has_jump:
+                    next_record = jump_record(rom, record)
+
+                    if next_record is not None:
+                        submit(next_record)
+
+                levels_parsed += 1
+
+                # submitted before reporting, so that the progress only reaches the end, when everything is parsed
+                should_stop = yield levels_parsed, len(submitted_level_addresses)
+
+                if should_stop:
+                    return defaultdict(list), {}
+
+    except BrokenProcessPool:
+        pool_is_broken = True
+
+    finally:
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+    def level_parser(record_to_parse: FoundLevelRecord) -> LevelParseResult:
+        nonlocal levels_parsed
+
+        known_outcome = parse_outcomes.get(_record_key(record_to_parse))
+
+        if known_outcome is None:
+            # the same Level was found with different enemy data, than the one, that was emulated in parallel, or the
+            # worker processes died, before getting to it
+            submitted_level_addresses.add(record_to_parse.level_address)
+            levels_parsed += 1
+
+            return parse_level(rom, record_to_parse, max_steps)
+
+        if isinstance(known_outcome, ValueError):
+            raise known_outcome
+
+        return known_outcome
+
+    # de-duplicates the known outcomes, so their progress isn't reported again, unless Levels are still left to load
+    replay = gen_levels_in_rom(rom, max_steps, level_parser)
+
+    try:
+        next(replay)
+
+        while True:
+            should_stop = False
+
+            if pool_is_broken:
+                # the Level about to be replayed might not have been submitted yet
+                should_stop = yield levels_parsed, len(submitted_level_addresses) + 1
+
+            if should_stop:
+                replay.close()
+
+                return defaultdict(list), {}
+
+            replay.send(False)
+    except StopIteration as si:
+        return si.value
@@ -72,6 +72,9 @@ class Rom:
         return NormalizedAddress(offset + no_bytes_added_to_rom)
 
     def tsa_data_for_object_set(self, object_set: int) -> bytearray:
+        return self.read(self.tsa_address_for_object_set(object_set), TSA_TABLE_SIZE)
+
+    def tsa_address_for_object_set(self, object_set: int) -> int:
         # TSA_OS_LIST offset value assumes vanilla ROM size, so normalize it
 
         tsa_index = self.int(TSA_OS_LIST + object_set)
@@ -86,12 +89,10 @@ class Rom:
             tsa_index = WORLD_MAP_TSA_INDEX
 
         # INES header size + (bank with tsa data * sizeof(bank))
-        tsa_start = BASE_OFFSET + tsa_index * PRG_BANK_SIZE
-
-        return self.read(tsa_start, TSA_TABLE_SIZE)
+        return BASE_OFFSET + tsa_index * PRG_BANK_SIZE
 
     def little_endian(self, offset: AnyAddress) -> int:
-        return little_endian(self.read(offset, 2))
+        return little_endian(self.view(offset, 2))
 
     def write_little_endian(self, offset: AnyAddress, integer: int):
         right_byte = (integer & 0xFF00) >> 8
@@ -107,6 +108,33 @@ class Rom:
     def _read(self, offset: NormalizedAddress, length: int) -> bytearray:
         return self._data[offset : offset + length]
 
+    def view(self, offset: AnyAddress, length: int | None = None) -> memoryview:
+        """
+        Returns a read-only window into the Rom data, without copying it.
+
+        The offset is normalized once for the whole window. If no length is given, the window reaches until the end of
+        the Rom data. Since the Rom data can't be resized, while a window into it exists, windows should not be kept
+        around longer than necessary.
+
+        :param offset: Where the window should start.
+        :param length: How many bytes the window should span.
+        :raises IndexError: If the window would reach outside the Rom data.
+        """
+        offset = self.prg_normalize(offset)
+
+        return self._view(offset, length)
+
+    def _view(self, offset: NormalizedAddress, length: int | None) -> memoryview:
+        end = len(self._data) if length is None else offset + length
+
+        if not 0 <= offset <= end <= len(self._data):
+            raise IndexError(
+                f"Window {offset:#x} - {end:#x} lies outside of the Rom data of size {len(self._data):#x}."
+            )
+
+        with memoryview(self._data) as data:
+            return data.toreadonly()[offset:end]
+
     def read_until(self, offset: AnyAddress, delimiter: bytes | int):
         if isinstance(delimiter, int):
             delimiter = bytes([delimiter])
@@ -171,6 +199,4 @@ class Rom:
         Path(path).open("wb").write(self._data)
 
     def int(self, offset: AnyAddress) -> int:
-        read_bytes = self.read(offset, 1)
-
-        return read_bytes[0]
+        return self._data[self.prg_normalize(offset)]